@@ -1,9 +1,8 @@
 # from config import BinanceConnection, load_binance_config
-from helper.helper import load_binance_config
-from service.connection import BinanceConnection
+from service.session import SocketSessionManager
+from rich import print_json
 import logging
 import asyncio
-import uuid
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -13,25 +12,27 @@ logging.basicConfig(
 )
 logger = logging.getLogger("ACCOUNT_DETAIL")
 
+async def account_status(interval: int = 4):
+    # satu pool koneksi bisa dipakai bersama untuk request lain maupun subscription
+    session = SocketSessionManager(folder_config='configuration')
+    session.every(
+        interval=interval,
+        method="account.status",
+        callback=lambda response: print_json(data=response),
+        signed=True
+    )
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await session.close()
+
 def running():
     try:
-        configs = load_binance_config(config_folder='configuration')
-        payload = {
-            "id": str(uuid.uuid4()),
-            "method": "account.status",
-            "params": {
-                "apiKey": configs['api_key'],
-            }
-        }
-        config = BinanceConnection(
-            payload=payload,
-            interval=4
-        )
-        asyncio.run(config.run())
+        asyncio.run(account_status(interval=4))
     except KeyboardInterrupt:
         logger.info("Stopped by user")
     except Exception as e:
         logger.error(f"Fatal error: {e}")
 
 if __name__ == '__main__':
-    running()
\ No newline at end of file
+    running()
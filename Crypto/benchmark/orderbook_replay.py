@@ -0,0 +1,88 @@
+from service.decoder import get_decoder, to_event
+from service.orderbook import OrderBook
+import numpy as np
+import random
+import json
+import time
+import sys
+
+def synthetic_messages(count: int = 50000, levels: int = 1000, changes: int = 40, symbol: str = 'BTCUSDT', seed: int = 7) -> tuple:
+    """
+    Membuat snapshot + frame combined stream diff depth yang mirip pair ramai:
+    sebagian besar perubahan terjadi dekat best level ( jarak eksponensial dari mid ).
+
+    Returns:
+        tuple: (snapshot dict, list frame JSON string)
+    """
+    rng = random.Random(seed)
+    tick, mid = 0.01, 60000.0
+    snapshot = {
+        "lastUpdateId": 1000,
+        "bids": [[f"{mid - tick * (i + 1):.2f}", f"{rng.uniform(0.001, 5):.5f}"] for i in range(levels)],
+        "asks": [[f"{mid + tick * (i + 1):.2f}", f"{rng.uniform(0.001, 5):.5f}"] for i in range(levels)],
+    }
+    frames, update_id = [], 1001
+    for _ in range(count):
+        bids, asks = [], []
+        for _ in range(changes):
+            distance = int(rng.expovariate(1 / 20)) + 1
+            quantity = "0.00000" if rng.random() < 0.3 else f"{rng.uniform(0.001, 5):.5f}"
+            if rng.random() < 0.5:
+                bids.append([f"{mid - tick * distance:.2f}", quantity])
+            else:
+                asks.append([f"{mid + tick * distance:.2f}", quantity])
+        first, update_id = update_id, update_id + rng.randint(1, 5)
+        frames.append(json.dumps({
+            "stream": f"{symbol.lower()}@depth@100ms",
+            "data": {"e": "depthUpdate", "E": 0, "s": symbol, "U": first, "u": update_id - 1, "b": bids, "a": asks}
+        }))
+    return snapshot, frames
+
+def load_recording(path: str) -> tuple:
+    """File JSON lines: baris pertama snapshot REST /depth, sisanya frame mentah combined stream."""
+    with open(path) as file:
+        snapshot = json.loads(file.readline())
+        frames = [line.rstrip('\n') for line in file if line.strip()]
+    return snapshot, frames
+
+def replay(snapshot: dict, frames: list, symbol: str = None, decoder: str = None) -> dict:
+    """
+    Memutar ulang frame ke OrderBook di satu core dan mengukur throughput serta latency
+    per frame ( decode + parse + apply ).
+
+    Returns:
+        dict: Hasil benchmark
+    """
+    decode = get_decoder(decoder)
+    symbol = symbol or to_event(decode(frames[0])['data']).symbol
+    book = OrderBook(symbol)
+    book.load_snapshot(snapshot)
+    latencies = np.empty(len(frames), dtype=np.int64)
+    levels = 0
+    started = time.perf_counter()
+    for position, frame in enumerate(frames):
+        begin = time.perf_counter_ns()
+        event = to_event(decode(frame)['data'])
+        book.apply(event)
+        book.microprice
+        latencies[position] = time.perf_counter_ns() - begin
+        levels += len(event.bids) + len(event.asks)
+    elapsed = time.perf_counter() - started
+    return {
+        "symbol": symbol,
+        "frames": len(frames),
+        "levels": levels,
+        "seconds": round(elapsed, 4),
+        "frames_per_second": round(len(frames) / elapsed),
+        "levels_per_second": round(levels / elapsed),
+        "p50_us": round(float(np.percentile(latencies, 50)) / 1000, 2),
+        "p99_us": round(float(np.percentile(latencies, 99)) / 1000, 2),
+        "max_us": round(float(latencies.max()) / 1000, 2),
+        "book_levels": [len(book.bids), len(book.asks)],
+        "spread": book.spread,
+    }
+
+if __name__ == '__main__':
+    # python -m benchmark.orderbook_replay [rekaman.jsonl]
+    snapshot, frames = load_recording(sys.argv[1]) if len(sys.argv) > 1 else synthetic_messages()
+    print(json.dumps(replay(snapshot, frames), indent=2))
@@ -0,0 +1,102 @@
+import subprocess
+import platform
+import logging
+import json
+import time
+import os
+
+# dipakai benchmark Crypto ( benchmark/suite.py ) dan Forex_idx ( benchmark/load_universe.py ),
+# sehingga format file hasil dan aturan regresi kedua suite selalu sama
+RESULT_DIR = 'benchmark/results'
+REGRESSION_THRESHOLD = 0.10
+
+def git_version() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+def latest_result(out_dir: str = RESULT_DIR, suite: str = 'crypto') -> dict:
+    """Hasil tersimpan paling baru untuk suite ini, None jika belum ada."""
+    if not os.path.isdir(out_dir):
+        return None
+    files = sorted(file for file in os.listdir(out_dir) if file.startswith(suite + '-') and file.endswith('.json'))
+    if not files:
+        return None
+    with open(os.path.join(out_dir, files[-1])) as file:
+        return json.load(file)
+
+def compare(current: dict, previous: dict, threshold: float = REGRESSION_THRESHOLD) -> list:
+    """
+    Membandingkan semua metric *_per_second dengan hasil sebelumnya.
+
+    Returns:
+        list: (benchmark, metric, sebelum, sesudah, perubahan) yang turun lebih dari threshold
+    """
+    regressions = []
+    for name, result in current["results"].items():
+        before = previous["results"].get(name, {})
+        for key, value in result.items():
+            if key.endswith('_per_second') and before.get(key):
+                change = value / before[key] - 1
+                if change < -threshold:
+                    regressions.append((name, key, before[key], value, round(change, 3)))
+    return regressions
+
+def save_results(results: dict, out_dir: str = RESULT_DIR, suite: str = 'crypto') -> tuple:
+    """
+    Simpan hasil ke JSON ( satu file per run, nama urut waktu ) beserta versi git dan mesin.
+
+    Returns:
+        tuple: (path file, dict yang disimpan)
+    """
+    document = {
+        "suite": suite,
+        "version": git_version(),
+        "created": time.strftime('%Y-%m-%dT%H:%M:%S'),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "results": results,
+    }
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, f"{suite}-{time.strftime('%Y%m%d-%H%M%S')}-{document['version']}.json")
+    with open(path + '.tmp', 'w') as file:
+        json.dump(document, file, indent=2)
+    os.replace(path + '.tmp', path)
+    return path, document
+
+def run_benchmarks(benchmarks: dict, names: list = None, out_dir: str = RESULT_DIR, suite: str = 'crypto') -> dict:
+    """
+    Menjalankan benchmark ( default semua ), menyimpan JSON dan menandai regresi
+    terhadap hasil sebelumnya. Log INFO dimatikan selama pengukuran supaya yang diukur
+    hanya jalur data, bukan formatting log.
+
+    Args:
+        benchmarks (dict): Nama -> fungsi benchmark yang mengembalikan dict metric
+        names (list): Benchmark yang dijalankan, default semua
+        out_dir (str): Folder hasil JSON
+        suite (str): Prefix file hasil, regresi hanya dibandingkan dengan suite yang sama
+
+    Returns:
+        dict: Dokumen hasil yang disimpan
+    """
+    previous = latest_result(out_dir, suite)
+    results = {}
+    logging.disable(logging.INFO)
+    try:
+        for name in names or benchmarks:
+            started = time.perf_counter()
+            results[name] = benchmarks[name]()
+            print(f"[⏱️] {name} ({time.perf_counter() - started:.1f} detik): {json.dumps(results[name])}")
+    finally:
+        logging.disable(logging.NOTSET)
+    path, document = save_results(results, out_dir, suite)
+    print(f"[✅] Hasil disimpan di {path}")
+    if previous:
+        regressions = compare(document, previous)
+        for name, key, before, after, change in regressions:
+            print(f"[⚠️] Regresi {name}.{key}: {before} -> {after} ({change:+.1%}) dibanding {previous['version']}")
+        if not regressions:
+            print(f"[✅] Tidak ada regresi dibanding {previous['version']}")
+    return document
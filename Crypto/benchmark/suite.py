@@ -0,0 +1,278 @@
+from service.connection import BinanceConnectionSocket
+from service.decoder import get_decoder
+from service.mock_exchange import MockExchange
+from service.recorder import Recorder
+from helper.helper import write_history_klines, check_noise_data
+from helper.kline_store import get_store, KLINE_DTYPE
+from helper.gaps import scan_store, gap_windows
+from helper.planner import interval_to_ms, plan_missing_windows
+from benchmark.orderbook_replay import synthetic_messages, replay
+from benchmark.report import run_benchmarks, RESULT_DIR
+import numpy as np
+import tempfile
+import asyncio
+import shutil
+import json
+import time
+import sys
+import os
+
+START_TIME = 1_704_067_200_000 # 2024-01-01 00:00 UTC
+
+def synthetic_records(start_time: int, count: int, interval: str = '1m', seed: int = 7) -> np.ndarray:
+    """Klines sintetis ( random walk ) langsung dalam KLINE_DTYPE."""
+    rng = np.random.default_rng(seed)
+    step = interval_to_ms(interval)
+    records = np.empty(count, dtype=KLINE_DTYPE)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, count)))
+    open = np.concatenate(([close[0]], close[:-1]))
+    spread = np.abs(rng.normal(0, 0.0005, count)) * close
+    volume = rng.uniform(1, 100, count)
+    records['open_time'] = start_time + np.arange(count, dtype=np.int64) * step
+    records['close_time'] = records['open_time'] + step - 1
+    records['open'], records['close'] = open, close
+    records['high'] = np.maximum(open, close) + spread
+    records['low'] = np.minimum(open, close) - spread
+    records['volume'] = volume
+    records['quote_asset_volume'] = volume * close
+    records['num_trades'] = (volume * 3).astype(np.int64)
+    records['taker_buy_base_volume'] = volume / 2
+    records['taker_buy_quote_volume'] = volume * close / 2
+    return records
+
+def synthetic_klines(start_time: int, count: int, interval: str = '1m', seed: int = 7) -> list:
+    """Response /klines tiruan ( list of list, harga sebagai string seperti Binance )."""
+    return [
+        [
+            int(row['open_time']), f"{row['open']:.8f}", f"{row['high']:.8f}", f"{row['low']:.8f}", f"{row['close']:.8f}",
+            f"{row['volume']:.8f}", int(row['close_time']), f"{row['quote_asset_volume']:.8f}", int(row['num_trades']),
+            f"{row['taker_buy_base_volume']:.8f}", f"{row['taker_buy_quote_volume']:.8f}", "0"
+        ]
+        for row in synthetic_records(start_time, count, interval, seed)
+    ]
+
+def build_store(dir: str, symbols: int, days: int, gap_rate: float = 0.0005, interval: str = '1m', seed: int = 7) -> list:
+    """
+    Mengisi KlineStore dengan klines sintetis berlubang: setiap candle punya peluang
+    gap_rate menjadi awal gap sepanjang 1-500 candle.
+
+    Returns:
+        list: Nama symbol yang dibuat
+    """
+    rng = np.random.default_rng(seed)
+    store = get_store(dir)
+    count = days * 86_400_000 // interval_to_ms(interval)
+    names = [f"BENCH{number}USDT" for number in range(symbols)]
+    for position, symbol in enumerate(names):
+        records = synthetic_records(START_TIME, count, interval, seed + position)
+        keep = np.ones(count, dtype=bool)
+        for start in np.flatnonzero(rng.random(count) < gap_rate):
+            keep[start:start + rng.integers(1, 500)] = False
+        store.append(symbol, records[keep])
+    return names
+
+def _latency(samples: list) -> dict:
+    samples = np.asarray(samples) * 1000
+    return {
+        "p50_ms": round(float(np.percentile(samples, 50)), 3),
+        "p99_ms": round(float(np.percentile(samples, 99)), 3),
+        "max_ms": round(float(samples.max()), 3),
+    }
+
+def bench_write_history_klines(rows: int = 200_000, chunk: int = 1000, symbols: int = 4) -> dict:
+    """
+    Throughput append write_history_klines dengan potongan seukuran response /klines,
+    bergiliran antar symbol seperti worker backfill, lalu kirim ulang semua potongan
+    ( kasus resume: semua row sudah ada dan harus dilewati ).
+    """
+    dir = tempfile.mkdtemp(prefix='bench_write_')
+    try:
+        data = synthetic_klines(START_TIME, rows // symbols)
+        chunks = [data[start:start + chunk] for start in range(0, len(data), chunk)]
+        jobs = [(f"BENCH{number}USDT", part) for part in chunks for number in range(symbols)]
+
+        timings, started = [], time.perf_counter()
+        for symbol, part in jobs:
+            begin = time.perf_counter()
+            write_history_klines(dir, symbol, part)
+            timings.append(time.perf_counter() - begin)
+        elapsed = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for symbol, part in jobs:
+            write_history_klines(dir, symbol, part)
+        duplicate_elapsed = time.perf_counter() - started
+        written = sum(len(part) for _, part in jobs) # chunk terakhir bisa lebih pendek
+        return {
+            "rows": written,
+            "calls": len(jobs),
+            "seconds": round(elapsed, 4),
+            "rows_per_second": round(written / elapsed),
+            "calls_per_second": round(len(jobs) / elapsed),
+            **_latency(timings),
+            "duplicate_rows_per_second": round(written / duplicate_elapsed),
+        }
+    finally:
+        shutil.rmtree(dir, ignore_errors=True)
+
+def bench_check_noise_data(symbols: int = 4, days: int = 180, repeat: int = 3) -> dict:
+    """Kecepatan scan gap check_noise_data ( read store + find_gaps + ringkasan ) per symbol."""
+    dir = tempfile.mkdtemp(prefix='bench_noise_')
+    try:
+        names = build_store(dir, symbols, days)
+        rows = sum(get_store(dir).index(symbol)['rows'] for symbol in names)
+        timings, gaps = [], 0
+        for _ in range(repeat):
+            for symbol in names:
+                begin = time.perf_counter()
+                result = check_noise_data(dir, symbol)
+                timings.append(time.perf_counter() - begin)
+                gaps = len(result)
+        elapsed = sum(timings)
+        return {
+            "symbols": symbols,
+            "rows": rows,
+            "gaps_last_symbol": gaps,
+            "seconds": round(elapsed, 4),
+            "rows_per_second": round(rows * repeat / elapsed),
+            **_latency(timings),
+        }
+    finally:
+        shutil.rmtree(dir, ignore_errors=True)
+
+def kline_frames(count: int, symbols: int = 50, interval: str = '1m') -> list:
+    """Frame combined stream kline seperti yang dikirim Binance, beberapa symbol bergiliran."""
+    frames = []
+    step = interval_to_ms(interval)
+    for i in range(count):
+        symbol = f"BENCH{i % symbols}USDT"
+        open_time = START_TIME + (i // symbols) * step
+        frames.append(json.dumps({
+            "stream": f"{symbol.lower()}@kline_{interval}",
+            "data": {"e": "kline", "E": open_time + step, "s": symbol, "k": {
+                "t": open_time, "T": open_time + step - 1, "s": symbol, "i": interval, "f": i, "L": i + 10,
+                "o": "100.0", "c": "100.5", "h": "101.0", "l": "99.5", "v": "12.5", "n": 10, "x": True,
+                "q": "1250.0", "V": "6.0", "Q": "600.0", "B": "0"
+            }}
+        }))
+    return frames
+
+async def _socket_dispatch(frames: list, timeout: float) -> dict:
+    dir = tempfile.mkdtemp(prefix='bench_socket_')
+    try:
+        recorder = Recorder(os.path.join(dir, 'stream.bin'))
+        for frame in frames:
+            recorder.frame('wss://stream.binance.com:9443/stream', frame)
+        recorder.close()
+
+        exchange = MockExchange(os.path.join(dir, 'stream.bin'), speed=0)
+        await exchange.start()
+        done = asyncio.Event()
+        marks = {"count": 0, "first": 0.0, "last": 0.0}
+
+        def on_data(data, extra_data):
+            if 'stream' not in data: # ack SUBSCRIBE
+                return
+            if not marks["count"]:
+                marks["first"] = time.perf_counter()
+            marks["count"] += 1
+            if marks["count"] == len(frames):
+                marks["last"] = time.perf_counter()
+                done.set()
+
+        socket = BinanceConnectionSocket(
+            on_data=on_data,
+            extra_data=None,
+            payload={"method": "SUBSCRIBE", "params": ["bench@kline_1m"], "id": 1},
+            url=exchange.ws_url + '/stream',
+            use_log=False,
+        )
+        socket.recorder = None # jangan ikut merekam walau RECORD_PATH di-set
+        task = asyncio.create_task(socket.call_request())
+        try:
+            await asyncio.wait_for(done.wait(), timeout)
+        finally:
+            task.cancel()
+            await exchange.close()
+        elapsed = marks["last"] - marks["first"]
+        decode = socket.decode.stats.summary()
+        return {
+            "messages": marks["count"],
+            "seconds": round(elapsed, 4),
+            "messages_per_second": round((marks["count"] - 1) / elapsed) if elapsed else 0,
+            "decode_mean_us": decode["mean_us"],
+            "decode_max_us": decode["max_us"],
+        }
+    finally:
+        shutil.rmtree(dir, ignore_errors=True)
+
+def bench_socket_dispatch(messages: int = 20_000, timeout: float = 120) -> dict:
+    """
+    Rate decode + dispatch BinanceConnectionSocket: frame rekaman diputar secepatnya oleh
+    MockExchange lokal lewat websocket, dihitung dari pesan pertama sampai terakhir di on_data.
+    Rate decode + dispatch tanpa jaringan ikut dicatat sebagai batas atas.
+    """
+    frames = kline_frames(messages)
+    decode = get_decoder()
+    count, started = 0, time.perf_counter()
+    for frame in frames:
+        data = decode(frame)
+        count += data is not None
+    offline = time.perf_counter() - started
+    result = asyncio.run(_socket_dispatch(frames, timeout))
+    result["offline_messages_per_second"] = round(count / offline)
+    return result
+
+def bench_backfill_planning(symbols: int = 20, days: int = 90, margin_days: int = 30) -> dict:
+    """
+    Planning backfill end-to-end di atas store berlubang: plan_missing_windows per symbol
+    ( jalur resume backfill_klines, termasuk head/tail yang belum ada ) dan scan_store +
+    gap_windows ( jalur gap index ).
+    """
+    dir = tempfile.mkdtemp(prefix='bench_plan_')
+    try:
+        names = build_store(dir, symbols, days)
+        start_time = START_TIME - margin_days * 86_400_000
+        end_time = START_TIME + (days + margin_days) * 86_400_000 - 1
+
+        started = time.perf_counter()
+        planned = {symbol: plan_missing_windows(dir, symbol, start_time, end_time) for symbol in names}
+        plan_elapsed = time.perf_counter() - started
+
+        started = time.perf_counter()
+        gaps = scan_store(dir, processes=1, out='')
+        windows = gap_windows(gaps)
+        scan_elapsed = time.perf_counter() - started
+        return {
+            "symbols": symbols,
+            "rows": sum(get_store(dir).index(symbol)['rows'] for symbol in names),
+            "planned_windows": sum(len(items) for items in planned.values()),
+            "gaps": len(gaps),
+            "gap_windows": sum(len(items) for items in windows.values()),
+            "plan_seconds": round(plan_elapsed, 4),
+            "plan_symbols_per_second": round(symbols / plan_elapsed),
+            "scan_seconds": round(scan_elapsed, 4),
+            "scan_symbols_per_second": round(symbols / scan_elapsed),
+        }
+    finally:
+        shutil.rmtree(dir, ignore_errors=True)
+
+def bench_orderbook_replay(frames: int = 20_000) -> dict:
+    """Replay diff depth sintetis ke OrderBook ( lihat benchmark/orderbook_replay.py )."""
+    return replay(*synthetic_messages(count=frames))
+
+BENCHMARKS = {
+    "write_history_klines": bench_write_history_klines,
+    "check_noise_data": bench_check_noise_data,
+    "socket_dispatch": bench_socket_dispatch,
+    "backfill_planning": bench_backfill_planning,
+    "orderbook_replay": bench_orderbook_replay,
+}
+
+def run_suite(names: list = None, out_dir: str = RESULT_DIR) -> dict:
+    """Menjalankan benchmark Crypto ( default semua ) lewat run_benchmarks."""
+    return run_benchmarks(BENCHMARKS, names, out_dir, suite='crypto')
+
+if __name__ == '__main__':
+    # python -m benchmark.suite [write_history_klines check_noise_data socket_dispatch backfill_planning orderbook_replay]
+    run_suite(sys.argv[1:] or None)
@@ -0,0 +1,187 @@
+from helper.kline_store import get_store
+from helper.planner import interval_to_ms
+import numpy as np
+import pandas as pd
+import itertools
+import logging
+import json
+import time
+import os
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+
+def load_kline_matrix(symbols: list, start_time: int = None, end_time: int = None, interval: str = '1m', dir: str = 'log/data/raw', fields: tuple = ('open', 'high', 'low', 'close', 'volume')) -> dict:
+    """
+    Membaca klines beberapa symbol dari KlineStore menjadi matrix (waktu x symbol) yang sejajar.
+    Candle yang tidak ada diisi NaN.
+
+    Returns:
+        dict: 'time' (T,), 'symbols' (N,) dan setiap field (T, N)
+    """
+    store = get_store(dir)
+    step = interval_to_ms(interval)
+    records = {symbol: store.read(symbol, start_time, end_time) for symbol in symbols}
+    times = [data['open_time'] for data in records.values() if len(data)]
+    if not times:
+        raise ValueError("Tidak ada data klines untuk symbol yang diminta")
+    first = min(int(t[0]) for t in times) if start_time is None else start_time
+    last = max(int(t[-1]) for t in times) if end_time is None else end_time
+    grid = np.arange(first // step * step, last + 1, step, dtype=np.int64)
+
+    market = {"time": grid, "symbols": list(symbols)}
+    for field in fields:
+        market[field] = np.full((len(grid), len(symbols)), np.nan)
+    for column, symbol in enumerate(symbols):
+        data = records[symbol]
+        rows = (data['open_time'] - grid[0]) // step
+        valid = (rows >= 0) & (rows < len(grid))
+        for field in fields:
+            market[field][rows[valid], column] = data[field][valid]
+    return market
+
+def load_idx_matrix(tickers: list = None, packed_dir: str = '../Forex_idx/data/packed', start_date: int = None) -> dict:
+    """
+    Membaca data harian IDX hasil pack_universe ( Forex_idx ) menjadi matrix (tanggal x ticker).
+    File dibaca langsung lewat path karena Forex_idx adalah project terpisah.
+    """
+    with open(os.path.join(packed_dir, 'index.json')) as file:
+        index = json.load(file)['tickers']
+    tickers = tickers or list(index)
+    columns = {name: np.load(os.path.join(packed_dir, name + '.npy'), mmap_mode='r') for name in ('Date', 'OpenPrice', 'High', 'Low', 'Close', 'Volume')}
+    spans = [index[ticker] for ticker in tickers]
+    dates = np.unique(np.concatenate([columns['Date'][start:start + length] for start, length in spans]))
+    if start_date is not None:
+        dates = dates[dates >= start_date]
+
+    market = {"time": dates, "symbols": tickers}
+    fields = {'open': 'OpenPrice', 'high': 'High', 'low': 'Low', 'close': 'Close', 'volume': 'Volume'}
+    for field in fields:
+        market[field] = np.full((len(dates), len(tickers)), np.nan)
+    for column, (start, length) in enumerate(spans):
+        ticker_dates = columns['Date'][start:start + length]
+        rows = np.searchsorted(dates, ticker_dates)
+        valid = (rows < len(dates)) & (dates[np.minimum(rows, len(dates) - 1)] == ticker_dates)
+        for field, source in fields.items():
+            market[field][rows[valid], column] = columns[source][start:start + length][valid]
+    # OpenPrice 0 berarti tidak ada transaksi, anggap tidak ada harga
+    market['open'][market['open'] <= 0] = np.nan
+    market['close'][market['close'] <= 0] = np.nan
+    return market
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Rata-rata bergulir per column via cumsum, NaN jika window belum penuh atau berisi NaN."""
+    missing = np.isnan(values)
+    cumsum = np.cumsum(np.where(missing, 0.0, values), axis=0)
+    gaps = np.cumsum(missing, axis=0)
+    result = np.full(values.shape, np.nan)
+    result[window - 1:] = cumsum[window - 1:]
+    result[window:] -= cumsum[:-window]
+    result[window - 1:] /= window
+    window_gaps = gaps.copy()
+    window_gaps[window:] -= gaps[:-window]
+    result[window_gaps > 0] = np.nan
+    return result
+
+def sma_cross(market: dict, fast: int, slow: int, allow_short: bool = False) -> np.ndarray:
+    """Posisi 1 saat SMA fast > SMA slow, -1 ( atau 0 ) saat di bawah."""
+    close = market['close']
+    fast_ma, slow_ma = rolling_mean(close, fast), rolling_mean(close, slow)
+    position = np.where(fast_ma > slow_ma, 1.0, -1.0 if allow_short else 0.0)
+    position[np.isnan(slow_ma) | np.isnan(close)] = 0.0
+    return position
+
+def momentum(market: dict, lookback: int, threshold: float = 0.0) -> np.ndarray:
+    """Posisi 1 saat return lookback bar lebih besar dari threshold."""
+    close = market['close']
+    change = np.full(close.shape, np.nan)
+    change[lookback:] = close[lookback:] / close[:-lookback] - 1.0
+    return np.where(change > threshold, 1.0, 0.0)
+
+def backtest(market: dict, position: np.ndarray, fee: float = 0.001, slippage: float = 0.0005, bars_per_year: int = 525600) -> dict:
+    """
+    Menghitung PnL vektor untuk posisi (T, N). Posisi pada bar t dieksekusi di close bar t,
+    sehingga return yang didapat adalah return bar t+1 ( tanpa lookahead ).
+
+    Args:
+        market (dict): Hasil load_kline_matrix / load_idx_matrix
+        position (np.ndarray): Target posisi per bar per symbol ( -1 .. 1 )
+        fee (float): Fee per sisi transaksi
+        slippage (float): Slippage per sisi transaksi
+        bars_per_year (int): Untuk annualisasi Sharpe ( 525600 untuk 1m, 242 untuk harian IDX )
+
+    Returns:
+        dict: Metrics portfolio equal-weight dan per symbol
+    """
+    close = market['close']
+    returns = np.zeros(close.shape)
+    returns[1:] = close[1:] / close[:-1] - 1.0
+    returns = np.nan_to_num(returns, nan=0.0, posinf=0.0, neginf=0.0)
+
+    held = np.zeros(position.shape)
+    held[1:] = position[:-1]
+    turnover = np.abs(np.diff(position, axis=0, prepend=0.0))
+    pnl = held * returns - turnover * (fee + slippage)
+
+    portfolio = pnl.mean(axis=1)
+    equity = np.cumsum(portfolio)
+    drawdown = equity - np.maximum.accumulate(equity)
+    std = portfolio.std()
+    per_symbol = pnl.sum(axis=0)
+    return {
+        "total_return": float(equity[-1]) if len(equity) else 0.0,
+        "sharpe": float(portfolio.mean() / std * np.sqrt(bars_per_year)) if std > 0 else 0.0,
+        "max_drawdown": float(drawdown.min()) if len(drawdown) else 0.0,
+        "turnover": float(turnover.sum() / position.shape[1]),
+        "trades": int(np.count_nonzero(turnover)),
+        "per_symbol": dict(zip(market['symbols'], per_symbol.tolist())),
+    }
+
+def sweep(market: dict, strategy, grid: dict, **kwargs) -> pd.DataFrame:
+    """
+    Menjalankan backtest untuk semua kombinasi parameter di grid.
+
+    Args:
+        market (dict): Data matrix
+        strategy (callable): Fungsi strategy(market, **params) -> posisi (T, N)
+        grid (dict): Nama parameter -> list nilai
+        **kwargs: Diteruskan ke backtest ( fee, slippage, bars_per_year )
+
+    Returns:
+        pd.DataFrame: Satu baris per kombinasi parameter, diurutkan berdasarkan sharpe
+    """
+    names = list(grid)
+    combos = list(itertools.product(*grid.values()))
+    bars, symbols = market['close'].shape
+    started = time.perf_counter()
+    rows = []
+    for values in combos:
+        params = dict(zip(names, values))
+        result = backtest(market, strategy(market, **params), **kwargs)
+        result.pop('per_symbol')
+        rows.append({**params, **result})
+    elapsed = time.perf_counter() - started
+    throughput = bars * symbols * len(combos) / elapsed if elapsed > 0 else float('inf')
+    logging.info(f"[⚡] {len(combos)} parameter, {bars} bar x {symbols} symbol dalam {elapsed:.2f} detik ({throughput:,.0f} bar-symbol/detik)")
+    return pd.DataFrame(rows).sort_values('sharpe', ascending=False).reset_index(drop=True)
+
+def optimize(market: dict, strategy, space: dict, n_trials: int = 100, **kwargs):
+    """
+    Pencarian parameter dengan optuna. space: nama parameter -> (min, max) integer.
+
+    Returns:
+        optuna.Study: Study hasil optimasi ( best_params / best_value )
+    """
+    import optuna
+    def objective(trial):
+        params = {name: trial.suggest_int(name, low, high) for name, (low, high) in space.items()}
+        return backtest(market, strategy(market, **params), **kwargs)['sharpe']
+    study = optuna.create_study(direction='maximize')
+    study.optimize(objective, n_trials=n_trials)
+    return study
+
+if __name__ == '__main__':
+    market = load_idx_matrix(packed_dir='../Forex_idx/data/packed')
+    result = sweep(market, sma_cross, {"fast": [5, 10, 20], "slow": [20, 50, 100]}, fee=0.0015, slippage=0.001, bars_per_year=242)
+    print(result.head(10))
@@ -0,0 +1,170 @@
+from service.connection import BinanceConnectionApi
+from service.http_client import IPBanned
+from service.limiter import WeightLimiter, get_limiter
+from helper.helper import write_history_klines
+from helper.kline_store import get_store
+from helper.backfill_state import BackfillState, DONE, EMPTY, FAILED
+from helper.planner import plan_windows, plan_missing_windows, next_cursor
+import pandas as pd
+import logging
+import asyncio
+import time
+import os
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+
+KLINE_WEIGHT = 2 # weight endpoint /klines
+
+class RequestRejected(Exception):
+    """Binance menolak request ( error client, misal symbol tidak valid ), tidak perlu diulang."""
+
+def _rejected(response) -> bool:
+    # kode -1000 s/d -1099 masalah server / jaringan, kode di bawahnya kesalahan request
+    return isinstance(response, dict) and isinstance(response.get('code'), int) and response['code'] <= -1100
+
+async def backfill_klines(
+            symbols: list,
+            start_time: int,
+            end_time: int,
+            interval: str = '1m',
+            limit: int = 1000,
+            max_in_flight: int = 8,
+            dir: str = 'log/data/raw',
+            limiter: WeightLimiter = None,
+            resume: bool = True,
+            windows: dict = None,
+            job: str = None,
+            state_path: str = os.environ.get('BACKFILL_STATE', 'log/backfill.sqlite3')
+        ):
+    """
+    Download history klines untuk banyak symbol secara concurrent.
+
+    Job (symbol, window) dimasukkan ke queue yang dibatasi, lalu diproses oleh
+    `max_in_flight` worker yang berbagi satu WeightLimiter, sehingga budget weight
+    terpakai penuh tanpa melebihi limit Binance. HTTP 418 ( IP ban ) menghentikan semua
+    worker tanpa menghitung percobaan gagal, window yang belum selesai tetap pending.
+
+    Args:
+        symbols (list): Daftar symbol, contoh ['BTCUSDT', 'ETHUSDT']
+        start_time (int): Timestamp awal dalam ms
+        end_time (int): Timestamp akhir dalam ms
+        interval (str): Interval kline Binance
+        limit (int): Jumlah candle per request ( max 1000 )
+        max_in_flight (int): Jumlah request yang berjalan bersamaan
+        dir (str): Folder KlineStore tujuan write_history_klines
+        limiter (WeightLimiter): Limiter, default limiter bersama process ( get_limiter )
+        resume (bool): Hanya download range yang belum ada di disk
+        windows (dict): Window siap pakai per symbol ( misal dari gap_windows ), planning dilewati
+        job (str): Nama job checkpoint. Jika diisi, window dan cursor per symbol disimpan di
+            state_path sehingga run berikutnya dengan nama yang sama melanjutkan tepat dari
+            cursor terakhir ( range waktu job asli dipakai ) tanpa planning ulang
+        state_path (str): Lokasi database checkpoint ( SQLite )
+
+    Returns:
+        dict: Ringkasan jumlah request, candle, error dan durasi
+    """
+    limiter = limiter or get_limiter()
+    queue = asyncio.Queue(maxsize=max_in_flight * 2)
+    locks = {symbol: asyncio.Lock() for symbol in symbols}
+    stats = {"requests": 0, "rows": 0, "errors": 0}
+    banned = asyncio.Event() # HTTP 418: job diparkir, sisa window tetap pending untuk run berikutnya
+    started = time.monotonic()
+    state = BackfillState(state_path) if job else None
+    if state:
+        spec = state.open_job(job, interval, start_time, end_time, limit)
+        start_time, end_time = spec['start_time'], spec['end_time']
+
+    async def plan(symbol: str) -> list:
+        if windows is not None:
+            return windows.get(symbol, [])
+        if resume:
+            return await asyncio.to_thread(plan_missing_windows, dir, symbol, start_time, end_time, interval, limit)
+        return plan_windows(start_time, end_time, interval, limit)
+
+    async def producer():
+        plans = []
+        for symbol in symbols:
+            if state is None:
+                plans.append((symbol, [(start, end, start) for start, end in await plan(symbol)]))
+                continue
+            if not state.planned(job, symbol):
+                state.add_plan(job, symbol, await plan(symbol))
+            plans.append((symbol, state.pending(job, symbol))) # (start, end, cursor) dari checkpoint
+        # round robin antar symbol: semua symbol maju bersamaan sehingga write tidak antri di satu file
+        for index in range(max((len(planned) for _, planned in plans), default=0)):
+            if banned.is_set():
+                break
+            for symbol, planned in plans:
+                if index < len(planned):
+                    await queue.put((symbol, *planned[index]))
+        for _ in range(max_in_flight):
+            await queue.put(None)
+
+    async def worker():
+        client = BinanceConnectionApi(sub_url='/klines')
+        while True:
+            item = await queue.get()
+            if item is None:
+                queue.task_done()
+                return
+            symbol, window_start, window_end, cursor = item
+            if banned.is_set():
+                queue.task_done()
+                continue
+            status = DONE
+            try:
+                while cursor <= window_end:
+                    await limiter.acquire(KLINE_WEIGHT)
+                    response = await client.get(payload={
+                        "symbol": symbol,
+                        "interval": interval,
+                        "startTime": cursor,
+                        "endTime": window_end,
+                        "limit": limit
+                    })
+                    stats["requests"] += 1
+                    if _rejected(response):
+                        raise RequestRejected(f"{response.get('code')} {response.get('msg')}")
+                    if not isinstance(response, list):
+                        raise ValueError(f"Response tidak valid dari Binance: {response}")
+                    if not response: # symbol belum listing / tidak ada trade pada window ini
+                        status = EMPTY if cursor == window_start else DONE
+                        break
+                    async with locks[symbol]:
+                        await asyncio.to_thread(write_history_klines, dir, symbol, response)
+                    stats["rows"] += len(response)
+                    logging.info(f"[{symbol}] {pd.to_datetime(cursor, unit='ms')} - {pd.to_datetime(window_end, unit='ms')} : {len(response)} candle")
+                    cursor = next_cursor(response) # lanjut dari close_time terakhir jika response terpotong
+                    if state:
+                        state.advance(job, symbol, window_start, cursor, len(response)) # checkpoint setelah data tersimpan
+                    if len(response) < limit:
+                        break
+                if state:
+                    state.finish(job, symbol, window_start, status)
+            except IPBanned as e:
+                stats["errors"] += 1
+                stats["banned"] = e.retry_after
+                banned.set()
+                logging.error(f"⛔ [{symbol}] {e}, backfill dihentikan ( checkpoint tetap pending )")
+            except Exception as e:
+                stats["errors"] += 1
+                if state and state.fail(job, symbol, window_start, terminal=isinstance(e, RequestRejected)) == FAILED:
+                    stats["failed"] = stats.get("failed", 0) + 1
+                    logging.error(f"⛔ [{symbol}] Window {window_start} ditinggalkan: {e}")
+                else:
+                    logging.error(f"⛔ [{symbol}] Gagal mengambil window {window_start}: {e}")
+            finally:
+                queue.task_done()
+
+    await asyncio.gather(producer(), *[worker() for _ in range(max_in_flight)])
+    store = get_store(dir)
+    for symbol in symbols:
+        await asyncio.to_thread(store.compact, symbol) # rapikan partisi yang menerima data lama
+    if state:
+        stats["finished"] = state.complete_job(job)
+        state.close()
+    stats["elapsed"] = round(time.monotonic() - started, 2)
+    logging.info(f"[✅] Backfill selesai: {stats}")
+    return stats
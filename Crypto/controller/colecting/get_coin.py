@@ -1,17 +1,65 @@
 from service.connection import BinanceConnectionApi
+from service.http_client import close_clients
+from service.limiter import get_limiter
 from helper.helper import write_coin
+from helper.listing_index import ListingIndex
 import pandas as pd
-import time
+import logging
 import asyncio
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
 
-async def get_coin(year: int  = 2, limit: int = 400, delay: float = 15.0, quoteAsset: str = 'USDT'):
+EXCHANGE_INFO_WEIGHT = 20
+KLINE_WEIGHT = 2
+
+async def discover_listing(symbols: list, index: ListingIndex, max_in_flight: int = 8) -> dict:
+    """
+    Mengambil timestamp listing hanya untuk symbol yang belum ada di index, secara concurrent
+    di bawah limiter bersama. Symbol tanpa kline ditandai kosong di index ( lihat empty_ttl ).
+
+    Args:
+        symbols (list): Daftar symbol
+        index (ListingIndex): Index listing lokal
+        max_in_flight (int): Jumlah request yang berjalan bersamaan
+
+    Returns:
+        dict: Symbol -> open_time candle harian pertama ( ms ) yang baru ditemukan
+    """
+    limiter = get_limiter()
+    semaphore = asyncio.Semaphore(max_in_flight)
+    client = BinanceConnectionApi(sub_url='/klines')
+    found, empty = {}, []
+
+    async def lookup(symbol: str):
+        async with semaphore:
+            await limiter.acquire(KLINE_WEIGHT)
+            klines = await client.get(payload={
+                "symbol": symbol,
+                "interval": "1d",
+                "limit": 1,
+                "startTime": 0
+            })
+        if isinstance(klines, list) and klines: # candle harian pertama = hari listing
+            found[symbol] = int(klines[0][0])
+        elif isinstance(klines, list): # belum ada kline, dicatat supaya tidak dicek setiap run
+            empty.append(symbol)
+
+    await asyncio.gather(*[lookup(symbol) for symbol in index.missing(symbols)])
+    index.update(found)
+    index.mark_empty(empty)
+    index.save()
+    return found
+
+async def get_coin(year: int  = 2, limit: int = 400, max_in_flight: int = 8, quoteAsset: str = 'USDT'):
     timestamp_n_years_ago = int((pd.Timestamp.utcnow() - pd.Timedelta(days=365*year)).timestamp() * 1000)
     exchageRequest = BinanceConnectionApi(
         sub_url="/exchangeInfo"
     )
+    await get_limiter().acquire(EXCHANGE_INFO_WEIGHT)
     exchangeInfo = await exchageRequest.get()
-    data_coin = []
-    _index = 0
+    symbols = []
     for item in exchangeInfo["symbols"]:
         if (
             item["status"] == "TRADING" and
@@ -22,32 +70,37 @@ async def get_coin(year: int  = 2, limit: int = 400, delay: float = 15.0, quoteA
                 any("SPOT" in s for s in item.get("permissionSets", []))
             )
         ):
-            _index = _index + 1
-            if len(data_coin) >= limit: # sudah limit maka stop loop
-                break
-
-            time.sleep(delay)
-            klinesRequest = BinanceConnectionApi(
-                sub_url="/klines",
-                payload={
-                    "symbol": item['symbol'],
-                    "interval": "1M",
-                    "limit": 1,
-                    "startTime": timestamp_n_years_ago
-                }
-            )
-            klines = await klinesRequest.get()
-            if isinstance(klines, list) and klines: # get list
-                years_coin_listing = pd.to_datetime(int(klines[0][0]), unit="ms") # tahun coin listing
-                now_years = pd.Timestamp.utcnow().tz_localize(None) # tahun sekarang
-                if (now_years.year - years_coin_listing.year) == year: # tahun coin - tahun sekarang = year(parameter)
-                    data_coin.append(item['symbol']) # add coin symbol to Array
-                    print(F"COIN 2 YEARS AGO, [{_index}]: {item['symbol']}")
+            symbols.append(item['symbol'])
+
+    index = ListingIndex('log/data/listing.json')
+    cached = sum(symbol in index for symbol in symbols) # listing yang sudah ada sebelum discovery
+    found = await discover_listing(symbols, index, max_in_flight=max_in_flight)
+    logging.info(f"[🔍] {len(found)} symbol baru ditemukan, {cached} dari cache")
+
+    data_coin = []
+    now_years = pd.Timestamp.utcnow().tz_localize(None) # tahun sekarang
+    for _index, symbol in enumerate(symbols, start=1):
+        if len(data_coin) >= limit: # sudah limit maka stop loop
+            break
+        listing = index.get(symbol)
+        if listing is None:
+            continue
+        # sama seperti candle 1M dengan startTime n tahun lalu: candle pertama = max(listing, n tahun lalu)
+        years_coin_listing = pd.to_datetime(max(listing, timestamp_n_years_ago), unit="ms") # tahun coin listing
+        if (now_years.year - years_coin_listing.year) == year: # tahun coin - tahun sekarang = year(parameter)
+            data_coin.append(symbol) # add coin symbol to Array
+            print(F"COIN 2 YEARS AGO, [{_index}]: {symbol}")
 
     return write_coin('log/data', 'raw', data_coin)
 
+async def main():
+    try:
+        return await get_coin(max_in_flight=8)
+    finally:
+        await close_clients()
+
 if __name__ == '__main__':
     try:
-        asyncio.run(get_coin(delay=5.0))
+        asyncio.run(main())
     except KeyboardInterrupt:
-        print("Berhenti memanggil API.")
\ No newline at end of file
+        print("Berhenti memanggil API.")
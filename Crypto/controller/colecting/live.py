@@ -0,0 +1,64 @@
+from service.stream import BinanceStreamSocket, kline_streams
+from helper.indicators import IndicatorEngine
+from helper.rollup import enable_rollups
+from service.metrics import get_registry
+import pandas as pd
+import os
+import logging
+import asyncio
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+
+async def report(stream: BinanceStreamSocket, interval: int = 30, inference = None):
+    while True:
+        await asyncio.sleep(interval)
+        logging.info(f"[📡] Stream stats: {stream.stats()}")
+        if inference:
+            logging.info(f"[🧠] Inference stats: {inference.stats()}")
+
+async def live_klines_coin(filecoin: str, interval: str = '1m', model_path: str = os.environ.get('MODEL_PATH'), feature_dir: str = os.environ.get('FEATURE_DIR'), metrics_port: int = int(os.environ.get('METRICS_PORT', 0))):
+    list_coin = pd.read_csv('log/'+filecoin)
+    symbols = list_coin['symbol'].tolist()
+    if interval == '1m': # rollup 5m..1d hanya dibangun dari store 1m
+        enable_rollups('log/data/raw')
+    indicators = IndicatorEngine(store_dir='log/data/raw', interval=interval)
+    for symbol in symbols:
+        indicators.seed(symbol) # hangatkan indikator dari klines yang sudah tersimpan
+
+    inference = None
+    if model_path:
+        from controller.forecast.inference import InferenceService # torch hanya di-load jika ada model
+        inference = InferenceService(model_path=model_path, feature_dir=feature_dir, store_dir='log/data/raw', interval=interval)
+        for symbol in symbols:
+            inference.seed(symbol)
+
+    async def on_batch(events: list):
+        await indicators.on_batch(events)
+        if inference:
+            await inference.on_batch(events)
+
+    stream = BinanceStreamSocket(
+        streams=kline_streams(symbols, interval),
+        on_batch=on_batch,
+        store_dir='log/data/raw'
+    )
+    tasks = [asyncio.create_task(report(stream, inference=inference))]
+    if inference:
+        tasks.append(asyncio.create_task(inference.run()))
+    if metrics_port: # /metrics untuk Prometheus, /metrics.json untuk dashboard sederhana
+        tasks.append(asyncio.create_task(get_registry().serve(port=metrics_port)))
+    try:
+        await stream.run()
+    finally:
+        for task in tasks:
+            task.cancel()
+
+if __name__ == '__main__':
+    try:
+        asyncio.run(live_klines_coin(filecoin='resource.csv'))
+    except KeyboardInterrupt:
+        logging.info("Stopped by user")
+    except Exception as e:
+        logging.error(f"Fatal error: {e}")
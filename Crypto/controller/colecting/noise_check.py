@@ -1,24 +1,41 @@
-from helper.helper import check_noise_data
+from controller.colecting.backfill import backfill_klines
+from service.http_client import close_clients
+from helper.gaps import scan_store, gap_windows
 import logging
-import os
-import pandas as pd
+import asyncio
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
-def check_noise(dir: str):
-    os.makedirs(dir, exist_ok=True)
-    files = [f for f in os.listdir(dir) if f.endswith('.csv')]
+async def repair_gaps(windows: dict, start_time: int, end_time: int, interval: str, dir: str) -> dict:
+    try:
+        return await backfill_klines(
+            symbols=list(windows),
+            start_time=start_time,
+            end_time=end_time,
+            interval=interval,
+            dir=dir,
+            windows=windows
+        )
+    finally:
+        await close_clients()
+
+def check_noise(dir: str, interval: str = '1m', repair: bool = False, processes: int = None):
+    gaps = scan_store(dir=dir, interval=interval, processes=processes, out='log/data/gaps.npy')
+    for symbol in sorted(set(gaps['symbol'].tolist())):
+        symbol_gaps = gaps[gaps['symbol'] == symbol]
+        logging.info(f"[⚠️][{symbol}] Total gap: {len(symbol_gaps)}, candle hilang: {int(symbol_gaps['missing'].sum())}")
 
-    for file in files:
-        filename_only = os.path.splitext(file)[0]
-        check_noise_data(dir='log/data/raw', filename=filename_only)
+    if repair and len(gaps):
+        windows = gap_windows(gaps, interval=interval)
+        asyncio.run(repair_gaps(windows, int(gaps['start'].min()), int(gaps['end'].max()), interval, dir))
+    return gaps
 
 if __name__ == '__main__':
     try:
-        check_noise(dir='log/data/raw')
+        check_noise(dir='log/data/raw', repair=False)
     except KeyboardInterrupt:
         logging.info("Stopped by user")
     except Exception as e:
-        logging.error(f"Fatal error: {e}")
\ No newline at end of file
+        logging.error(f"Fatal error: {e}")
@@ -1,20 +1,28 @@
-from service.connection import BinanceConnectionApi
-from helper.helper import write_coin_potential
+from service.stream import BinanceStreamSocket, MINI_TICKER_STREAM
+from helper.screener import MarketScreener
 import pandas as pd
-import json
+import logging
 import asyncio
 
-async def get_potential_coin(dir_coin: str):
+async def write_potential(screener: MarketScreener, interval: int = 60, top: int = 20):
+    while True:
+        await asyncio.sleep(interval)
+        screener.write('log/data', 'resource', top)
+        logging.info(f"[📈] Potential: {[row['symbol'] for row in screener.top('gainers', 5)]}")
+
+async def get_potential_coin(dir_coin: str, top: int = 20, write_interval: int = 60):
+    """
+    Screener yang terus terupdate dari stream mini ticker semua market, top gainers
+    ditulis ke log/data/resource.csv setiap write_interval detik.
+    """
     df = pd.read_csv(dir_coin)
-    tickerRequest = BinanceConnectionApi(
-        sub_url="/ticker/24hr",
-        payload={
-            "symbols": json.dumps(df['symbol'].tolist(), separators=(',', ':')).replace('[', '%5B').replace(']', '%5D').replace('"', '%22') # parameter hasil convert
-        }
-    )
-    ticker = await tickerRequest.get()
-    return write_coin_potential('log/data', 'resource', ticker)
+    screener = MarketScreener(quote_asset=None, symbols=df['symbol'].tolist())
+    stream = BinanceStreamSocket(streams=[MINI_TICKER_STREAM], on_batch=screener.on_batch)
+    writer = asyncio.create_task(write_potential(screener, write_interval, top))
+    try:
+        await stream.run()
+    finally:
+        writer.cancel()
 
 if __name__ == '__main__':
     asyncio.run(get_potential_coin(dir_coin='log/data/raw.csv'))
-    
\ No newline at end of file
@@ -0,0 +1,210 @@
+from torch.utils.data import Dataset, DataLoader
+from helper.kline_store import get_store
+import numpy as np
+import hashlib
+import logging
+import shutil
+import torch
+import json
+import os
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+
+FEATURES = ('log_return', 'range', 'body', 'log_volume', 'volume_change')
+FEATURE_VERSION = 1 # naikkan jika rumus fitur berubah supaya cache lama tidak dipakai
+META_FILE = 'meta.json'
+IDX_FIELDS = {'open': 'OpenPrice', 'high': 'High', 'low': 'Low', 'close': 'Close', 'volume': 'Volume'}
+
+def compute_features(open, high, low, close, volume) -> tuple:
+    """
+    Fitur per bar dari OHLCV satu symbol ( belum dinormalisasi ).
+
+    Returns:
+        tuple: (features float64 (T, len(FEATURES)), log_return float64 (T,) untuk target)
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_close = np.log(close)
+        log_return = np.diff(log_close, prepend=log_close[:1])
+        log_volume = np.log1p(volume)
+        columns = [
+            log_return,
+            np.log(high / low),
+            np.log(close / open),
+            log_volume,
+            np.diff(log_volume, prepend=log_volume[:1]),
+        ]
+    features = np.nan_to_num(np.column_stack(columns), nan=0.0, posinf=0.0, neginf=0.0)
+    return features, features[:, 0].copy()
+
+def kline_source(dir: str = 'log/data/raw', symbols: list = None):
+    """Sumber OHLCV dari KlineStore. Version = index tiap symbol ( berubah setiap ada append )."""
+    store = get_store(dir)
+    symbols = symbols or store.symbols()
+    version = {symbol: store.index(symbol) for symbol in symbols}
+    def load(symbol):
+        records = store.read(symbol)
+        return [records[field] for field in ('open', 'high', 'low', 'close', 'volume')]
+    return symbols, version, load
+
+def idx_source(packed_dir: str = '../Forex_idx/data/packed', tickers: list = None):
+    """Sumber OHLCV harian IDX hasil pack_universe ( Forex_idx ), dibaca langsung lewat path."""
+    with open(os.path.join(packed_dir, 'index.json')) as file:
+        index = json.load(file)['tickers']
+    tickers = tickers or list(index)
+    columns = {field: np.load(os.path.join(packed_dir, name + '.npy'), mmap_mode='r') for field, name in IDX_FIELDS.items()}
+    version = {
+        "tickers": {ticker: index[ticker] for ticker in tickers},
+        "mtime": {name: os.path.getmtime(os.path.join(packed_dir, name + '.npy')) for name in IDX_FIELDS.values()},
+    }
+    def load(ticker):
+        start, length = index[ticker]
+        return [np.asarray(columns[field][start:start + length], dtype=np.float64) for field in IDX_FIELDS]
+    return tickers, version, load
+
+def build_features(source: str = 'kline', dir: str = 'log/data/raw', symbols: list = None, fit_fraction: float = 0.8, cache_root: str = 'log/data/features') -> str:
+    """
+    Menghitung fitur ternormalisasi untuk semua symbol lalu menyimpannya sebagai satu file
+    float32 (rows, len(FEATURES)) yang bisa dibuka memmap. Symbol diproses satu per satu
+    sehingga memory hanya sebesar data satu symbol.
+
+    Hasil di-cache di {cache_root}/{key}, key = hash versi data sumber + konfigurasi fitur.
+    Jika data sumber belum berubah, folder cache langsung dipakai ulang.
+
+    Args:
+        source (str): 'kline' ( KlineStore Crypto ) atau 'idx' ( packed Forex_idx )
+        dir (str): Folder KlineStore atau folder packed
+        symbols (list): Symbol / emiten yang dipakai, default semua
+        fit_fraction (float): Bagian awal data tiap symbol untuk menghitung mean/std normalisasi
+        cache_root (str): Folder cache fitur
+
+    Returns:
+        str: Folder cache berisi features.f32, target.f32 dan meta.json
+    """
+    symbols, version, load = {'kline': kline_source, 'idx': idx_source}[source](dir, symbols)
+    config = {"source": source, "dir": os.path.abspath(dir), "features": FEATURES, "feature_version": FEATURE_VERSION, "fit_fraction": fit_fraction}
+    key = hashlib.sha1(json.dumps({"config": config, "version": version}, sort_keys=True, default=str).encode()).hexdigest()[:16]
+    out_dir = os.path.join(cache_root, key)
+    if os.path.exists(os.path.join(out_dir, META_FILE)):
+        logging.info(f"[♻️] Cache fitur {key} masih sesuai dengan data sumber")
+        return out_dir
+
+    tmp_dir = out_dir + '.tmp'
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    index, stats, offset = {}, {}, 0
+    with open(os.path.join(tmp_dir, 'features.f32'), 'wb') as features_file, open(os.path.join(tmp_dir, 'target.f32'), 'wb') as target_file:
+        for symbol in symbols:
+            features, target = compute_features(*load(symbol))
+            if len(features) < 2:
+                continue
+            fit = features[:max(int(len(features) * fit_fraction), 2)]
+            mean, std = fit.mean(axis=0), fit.std(axis=0)
+            std[std == 0] = 1.0
+            features_file.write(((features - mean) / std).astype(np.float32).tobytes())
+            target_file.write(target.astype(np.float32).tobytes())
+            index[symbol] = [offset, len(features)]
+            stats[symbol] = {"mean": mean.tolist(), "std": std.tolist()}
+            offset += len(features)
+
+    with open(os.path.join(tmp_dir, META_FILE), 'w') as file:
+        json.dump({"key": key, "config": config, "rows": offset, "features": FEATURES, "symbols": index, "stats": stats}, file)
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.replace(tmp_dir, out_dir)
+    logging.info(f"[✅] Fitur {len(index)} symbol ({offset} row) disimpan di {out_dir}")
+    return out_dir
+
+class WindowDataset(Dataset):
+    """
+    Dataset window (lookback, fitur) -> jumlah log return horizon bar berikutnya.
+
+    Window tidak pernah dibuat di memory: hanya jumlah window kumulatif per symbol yang
+    disimpan, index global dipetakan ke (symbol, row) dengan searchsorted lalu diiris
+    langsung dari memmap. Memmap dibuka ulang di setiap worker DataLoader ( tidak ikut
+    di-pickle ), sehingga semua worker berbagi page cache OS yang sama.
+
+    Args:
+        cache_dir (str): Hasil build_features
+        lookback (int): Panjang window input
+        horizon (int): Jumlah bar ke depan untuk target
+        stride (int): Jarak antar window
+        split (str): None ( semua ), 'train' ( bagian fit_fraction ) atau 'valid' ( sisanya )
+        symbols (list): Batasi ke symbol tertentu
+    """
+    def __init__(self, cache_dir: str, lookback: int = 60, horizon: int = 1, stride: int = 1, split: str = None, symbols: list = None):
+        with open(os.path.join(cache_dir, META_FILE)) as file:
+            meta = json.load(file)
+        self.cache_dir = cache_dir
+        self.rows = meta['rows']
+        self.width = len(meta['features'])
+        self.lookback, self.horizon, self.stride = lookback, horizon, stride
+        fit_fraction = meta['config']['fit_fraction']
+
+        self.symbols, first_rows, counts = [], [], []
+        for symbol, (offset, length) in meta['symbols'].items():
+            if symbols and symbol not in symbols:
+                continue
+            # row = bar terakhir window input, target memakai row+1 .. row+horizon
+            low, high = lookback - 1, length - horizon
+            boundary = max(int(length * fit_fraction), 2)
+            if split == 'train':
+                high = min(high, boundary - horizon)
+            elif split == 'valid':
+                low = max(low, boundary)
+            if high <= low:
+                continue
+            self.symbols.append(symbol)
+            first_rows.append(offset + low)
+            counts.append((high - low - 1) // stride + 1)
+        self.first_rows = np.asarray(first_rows, dtype=np.int64)
+        self.ends = np.cumsum(counts, dtype=np.int64)
+        self.features = None
+        self.target = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['features'] = state['target'] = None
+        return state
+
+    def _open(self):
+        self.features = np.memmap(os.path.join(self.cache_dir, 'features.f32'), dtype=np.float32, mode='r', shape=(self.rows, self.width))
+        self.target = np.memmap(os.path.join(self.cache_dir, 'target.f32'), dtype=np.float32, mode='r', shape=(self.rows,))
+
+    def __len__(self) -> int:
+        return int(self.ends[-1]) if len(self.ends) else 0
+
+    def locate(self, item: int) -> tuple:
+        """Index global -> (symbol, row global bar terakhir window)."""
+        position = int(np.searchsorted(self.ends, item, side='right'))
+        start = self.ends[position - 1] if position else 0
+        return self.symbols[position], int(self.first_rows[position] + (item - start) * self.stride)
+
+    def __getitem__(self, item: int):
+        if self.features is None:
+            self._open()
+        if item < 0:
+            item += len(self)
+        _, row = self.locate(item)
+        window = np.array(self.features[row - self.lookback + 1:row + 1])
+        target = float(self.target[row + 1:row + 1 + self.horizon].sum())
+        return torch.from_numpy(window), torch.tensor(target, dtype=torch.float32)
+
+def make_loader(dataset: WindowDataset, batch_size: int = 256, workers: int = None, shuffle: bool = True) -> DataLoader:
+    """DataLoader multi-worker, default jumlah worker = jumlah CPU."""
+    workers = os.cpu_count() if workers is None else workers
+    return DataLoader(
+        dataset,
+        batch_size=batch_size,
+        shuffle=shuffle,
+        num_workers=workers,
+        persistent_workers=workers > 0,
+        pin_memory=False,
+    )
+
+if __name__ == '__main__':
+    cache_dir = build_features(source='kline', dir='log/data/raw')
+    train = WindowDataset(cache_dir, lookback=60, horizon=5, split='train')
+    loader = make_loader(train, batch_size=512)
+    inputs, targets = next(iter(loader))
+    logging.info(f"[📦] {len(train)} window train, batch {tuple(inputs.shape)} -> {tuple(targets.shape)}")
@@ -0,0 +1,212 @@
+from controller.forecast.dataset import compute_features, META_FILE
+from helper.kline_store import get_store, interval_dir
+from helper.planner import interval_to_ms
+from service.decoder import KlineEvent
+from service.metrics import get_registry
+import numpy as np
+import asyncio
+import logging
+import torch
+import json
+import time
+import os
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+
+OHLCV = ('open', 'high', 'low', 'close', 'volume')
+
+def configure_threads(threads: int = None):
+    """
+    Membatasi thread intra-op torch supaya forward pass tidak memakai semua core yang
+    juga dipakai event loop stream. Default sejumlah core yang boleh dipakai proses.
+    """
+    if not threads:
+        threads = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count()
+    torch.set_num_threads(threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError: # hanya bisa diatur sebelum ada pekerjaan paralel pertama
+        pass
+    return threads
+
+def load_model(path: str, example: np.ndarray, threads: int = 1):
+    """
+    Memuat model untuk inference CPU.
+
+    - .onnx  : onnxruntime dengan graph optimization penuh dan jumlah thread yang sama
+    - lainnya: TorchScript ( torch.jit.load ), atau nn.Module hasil torch.save yang
+               di-trace, lalu di-freeze dan optimize_for_inference
+
+    Args:
+        path (str): File model
+        example (np.ndarray): Contoh input (batch, lookback, fitur) untuk trace
+        threads (int): Thread intra-op
+
+    Returns:
+        callable: predict(np.ndarray float32) -> np.ndarray (batch,)
+    """
+    if path.endswith('.onnx'):
+        import onnxruntime
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = threads
+        options.inter_op_num_threads = 1
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        session = onnxruntime.InferenceSession(path, options, providers=['CPUExecutionProvider'])
+        input_name = session.get_inputs()[0].name
+        return lambda inputs: np.asarray(session.run(None, {input_name: inputs})[0]).reshape(len(inputs), -1)[:, 0]
+
+    try:
+        model = torch.jit.load(path, map_location='cpu')
+    except RuntimeError: # bukan TorchScript, checkpoint nn.Module biasa
+        model = torch.load(path, map_location='cpu', weights_only=False)
+        model.eval()
+        with torch.inference_mode():
+            model = torch.jit.trace(model, torch.from_numpy(example))
+    model = torch.jit.optimize_for_inference(model.eval()) # freeze + fuse operator untuk CPU
+
+    def predict(inputs: np.ndarray) -> np.ndarray:
+        with torch.inference_mode():
+            output = model(torch.from_numpy(inputs))
+        return output.reshape(len(inputs), -1)[:, 0].numpy()
+    return predict
+
+class InferenceService:
+    """
+    Scoring model untuk setiap kline close semua symbol yang dipantau.
+
+    Symbol yang candle-nya close ditandai ready. Loop run() menunggu sampai semua symbol
+    yang bisa di-score ( history penuh dan punya mean/std ) ready atau max_wait habis sejak symbol pertama ready, lalu semua symbol itu digabung
+    menjadi satu batch dan satu forward pass ( di thread terpisah ). Latency per batch
+    dicatat di histogram: wait ( ready -> mulai ), forward dan total ( ready -> publish ).
+
+    Args:
+        model_path (str): Model TorchScript / torch.save / ONNX
+        feature_dir (str): Hasil build_features, dipakai untuk mean/std normalisasi per symbol
+        lookback (int): Panjang window input, harus sama dengan saat training
+        store_dir (str): Folder KlineStore 1m, seed history memakai interval_dir(store_dir, interval)
+        interval (str): Interval kline
+        max_wait (float): Waktu maksimal ( detik ) mengumpulkan symbol sebelum batch dijalankan
+        threads (int): Thread intra-op torch / onnxruntime
+        on_predictions (callable): Callback async opsional yang menerima dict symbol -> (open_time, nilai)
+    """
+    def __init__(
+                self,
+                model_path: str = os.environ.get('MODEL_PATH'),
+                feature_dir: str = os.environ.get('FEATURE_DIR'),
+                lookback: int = int(os.environ.get('MODEL_LOOKBACK', 60)),
+                store_dir: str = 'log/data/raw',
+                interval: str = '1m',
+                max_wait: float = 0.5,
+                threads: int = None,
+                on_predictions = None
+            ):
+        if not feature_dir:
+            raise ValueError("feature_dir wajib diisi ( folder hasil build_features atau env FEATURE_DIR )")
+        with open(os.path.join(feature_dir, META_FILE)) as file:
+            meta = json.load(file)
+        self.stats_by_symbol = {
+            symbol: (np.asarray(stats['mean']), np.asarray(stats['std'])) for symbol, stats in meta['stats'].items()
+        }
+        self.width = len(meta['features'])
+        self.lookback = lookback
+        self.store = get_store(interval_dir(store_dir, interval))
+        self.interval = interval
+        self.max_wait = max_wait
+        self.on_predictions = on_predictions
+        self.threads = configure_threads(threads)
+        self.predict = load_model(model_path, np.zeros((1, lookback, self.width), dtype=np.float32), self.threads)
+
+        self.history = {} # symbol -> [array (lookback+1, 5) OHLCV, jumlah row terisi, open_time terakhir]
+        self.ready = {}   # symbol -> waktu ready ( perf_counter )
+        self.scorable = set() # symbol dengan history penuh dan stats normalisasi
+        self.ready_event = asyncio.Event()
+        self.latest = {}
+        latency = get_registry().histogram('forecast_inference_seconds', 'Latency inference per tahap ( wait / forward / total )', ('stage',))
+        self.histograms = {name: latency.labels(stage=name) for name in ('wait', 'forward', 'total')}
+        self.metrics = {"batches": 0, "scored": 0, "max_batch": 0}
+
+    def seed(self, symbol: str):
+        """Mengisi history symbol dari klines terakhir di store."""
+        max_open_time = self.store.index(symbol)['max_open_time']
+        if max_open_time is None:
+            return
+        records = self.store.read(symbol, start_time=max_open_time - self.lookback * interval_to_ms(self.interval))
+        for row in records[-(self.lookback + 1):]:
+            self.push(symbol, int(row['open_time']), [row[field] for field in OHLCV])
+
+    def push(self, symbol: str, open_time: int, values: list) -> bool:
+        """Menambahkan satu candle close. Return True jika history symbol sudah cukup untuk scoring."""
+        if symbol not in self.history:
+            self.history[symbol] = [np.zeros((self.lookback + 1, len(OHLCV))), 0, None]
+        state = self.history[symbol]
+        if state[2] is not None and open_time <= state[2]:
+            return False
+        buffer = state[0]
+        buffer[:-1] = buffer[1:]
+        buffer[-1] = values
+        state[1] = min(state[1] + 1, len(buffer))
+        state[2] = open_time
+        if state[1] == len(buffer) and symbol in self.stats_by_symbol:
+            self.scorable.add(symbol)
+            return True
+        return False
+
+    async def on_batch(self, events: list):
+        """Dipasang sebagai ( bagian dari ) on_batch BinanceStreamSocket."""
+        now = time.perf_counter()
+        for event in events:
+            if isinstance(event, KlineEvent) and event.closed:
+                if self.push(event.symbol, event.open_time, [event.open, event.high, event.low, event.close, event.volume]):
+                    self.ready.setdefault(event.symbol, now)
+        if self.ready:
+            self.ready_event.set()
+
+    def build_inputs(self, symbols: list) -> np.ndarray:
+        inputs = np.empty((len(symbols), self.lookback, self.width), dtype=np.float32)
+        for position, symbol in enumerate(symbols):
+            buffer = self.history[symbol][0]
+            features, _ = compute_features(*buffer.T)
+            mean, std = self.stats_by_symbol[symbol]
+            inputs[position] = (features[1:] - mean) / std # row pertama tidak punya return sebelumnya
+        return inputs
+
+    def score(self, symbols: list) -> np.ndarray:
+        return self.predict(self.build_inputs(symbols))
+
+    async def run_batch(self):
+        ready, self.ready = self.ready, {}
+        self.ready_event.clear()
+        symbols = list(ready)
+        first = min(ready.values())
+        started = time.perf_counter()
+        predictions = await asyncio.to_thread(self.score, symbols)
+        finished = time.perf_counter()
+
+        published = {symbol: (self.history[symbol][2], float(value)) for symbol, value in zip(symbols, predictions)}
+        self.latest.update(published)
+        if self.on_predictions:
+            await self.on_predictions(published)
+        done = time.perf_counter()
+        self.histograms['wait'].observe(started - first)
+        self.histograms['forward'].observe(finished - started)
+        self.histograms['total'].observe(done - first)
+        self.metrics["batches"] += 1
+        self.metrics["scored"] += len(symbols)
+        self.metrics["max_batch"] = max(self.metrics["max_batch"], len(symbols))
+
+    async def run(self):
+        while True:
+            await self.ready_event.wait()
+            deadline = min(self.ready.values()) + self.max_wait
+            while len(self.ready) < len(self.scorable) and time.perf_counter() < deadline:
+                self.ready_event.clear()
+                try:
+                    await asyncio.wait_for(self.ready_event.wait(), timeout=max(deadline - time.perf_counter(), 0))
+                except asyncio.TimeoutError:
+                    break
+            await self.run_batch()
+
+    def stats(self) -> dict:
+        return {**self.metrics, **{name: histogram.summary(scale=1000) for name, histogram in self.histograms.items()}}
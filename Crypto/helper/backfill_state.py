@@ -0,0 +1,165 @@
+import sqlite3
+import logging
+import time
+import os
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    name TEXT PRIMARY KEY,
+    interval TEXT NOT NULL,
+    start_time INTEGER NOT NULL,
+    end_time INTEGER NOT NULL,
+    limit_size INTEGER NOT NULL,
+    created INTEGER NOT NULL,
+    finished INTEGER
+);
+CREATE TABLE IF NOT EXISTS plans (
+    job TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    windows INTEGER NOT NULL,
+    PRIMARY KEY (job, symbol)
+);
+CREATE TABLE IF NOT EXISTS windows (
+    job TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    window_start INTEGER NOT NULL,
+    window_end INTEGER NOT NULL,
+    cursor INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    rows INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    updated INTEGER NOT NULL,
+    PRIMARY KEY (job, symbol, window_start)
+);
+"""
+PENDING, DONE, EMPTY, FAILED = 'pending', 'done', 'empty', 'failed'
+MAX_ATTEMPTS = int(os.environ.get('BACKFILL_MAX_ATTEMPTS', 3))
+
+class BackfillState:
+    """
+    Checkpoint job backfill di SQLite: window hasil planning per symbol beserta cursor
+    ( startTime request berikutnya ) dan statusnya.
+
+    Cursor hanya dimajukan setelah klines masuk ke KlineStore, sehingga setelah crash
+    paling banyak satu halaman diunduh ulang ( duplikat dibuang oleh append ). Window
+    yang kosong ( sebelum listing ) ditandai 'empty' dan tidak diminta lagi saat resume.
+    Window yang gagal max_attempts kali atau ditolak Binance ( error client, misal symbol
+    delisting ) ditandai 'failed' supaya job tetap bisa selesai.
+
+    Args:
+        path (str): Lokasi file database
+        max_attempts (int): Jumlah percobaan sebelum window ditandai 'failed'
+    """
+    def __init__(self, path: str = os.environ.get('BACKFILL_STATE', 'log/backfill.sqlite3'), max_attempts: int = MAX_ATTEMPTS):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path
+        self.max_attempts = max_attempts
+        self.connection = sqlite3.connect(path)
+        self.connection.execute('PRAGMA journal_mode=WAL')    # reader tidak memblok writer
+        self.connection.execute('PRAGMA synchronous=NORMAL')  # commit tetap aman saat process crash
+        self.connection.executescript(SCHEMA)
+
+    def open_job(self, name: str, interval: str, start_time: int, end_time: int, limit: int) -> dict:
+        """
+        Job yang belum selesai dengan nama yang sama dilanjutkan dengan range aslinya,
+        job yang sudah selesai diganti job baru dengan parameter sekarang.
+
+        Returns:
+            dict: name, interval, start_time, end_time, limit
+        """
+        row = self.connection.execute(
+            'SELECT interval, start_time, end_time, limit_size, finished FROM jobs WHERE name = ?', (name,)
+        ).fetchone()
+        if row and row[4] is None:
+            logging.info(f"[↩️] Melanjutkan job {name}: {self.progress(name)}")
+            return {"name": name, "interval": row[0], "start_time": row[1], "end_time": row[2], "limit": row[3]}
+
+        with self.connection:
+            self.connection.execute('DELETE FROM windows WHERE job = ?', (name,))
+            self.connection.execute('DELETE FROM plans WHERE job = ?', (name,))
+            self.connection.execute(
+                'INSERT OR REPLACE INTO jobs (name, interval, start_time, end_time, limit_size, created, finished) VALUES (?, ?, ?, ?, ?, ?, NULL)',
+                (name, interval, start_time, end_time, limit, int(time.time()))
+            )
+        return {"name": name, "interval": interval, "start_time": start_time, "end_time": end_time, "limit": limit}
+
+    def planned(self, job: str, symbol: str) -> bool:
+        return self.connection.execute('SELECT 1 FROM plans WHERE job = ? AND symbol = ?', (job, symbol)).fetchone() is not None
+
+    def add_plan(self, job: str, symbol: str, windows: list):
+        """Simpan hasil planning satu symbol dalam satu transaksi."""
+        now = int(time.time())
+        with self.connection:
+            self.connection.executemany(
+                'INSERT OR IGNORE INTO windows (job, symbol, window_start, window_end, cursor, updated) VALUES (?, ?, ?, ?, ?, ?)',
+                [(job, symbol, start, end, start, now) for start, end in windows]
+            )
+            self.connection.execute('INSERT OR REPLACE INTO plans (job, symbol, windows) VALUES (?, ?, ?)', (job, symbol, len(windows)))
+
+    def pending(self, job: str, symbol: str) -> list:
+        """Window yang belum selesai: (window_start, window_end, cursor), urut waktu."""
+        return self.connection.execute(
+            'SELECT window_start, window_end, cursor FROM windows WHERE job = ? AND symbol = ? AND status = ? ORDER BY window_start',
+            (job, symbol, PENDING)
+        ).fetchall()
+
+    def advance(self, job: str, symbol: str, window_start: int, cursor: int, rows: int):
+        """Majukan cursor setelah halaman klines tersimpan."""
+        with self.connection:
+            self.connection.execute(
+                'UPDATE windows SET cursor = ?, rows = rows + ?, updated = ? WHERE job = ? AND symbol = ? AND window_start = ?',
+                (cursor, rows, int(time.time()), job, symbol, window_start)
+            )
+
+    def finish(self, job: str, symbol: str, window_start: int, status: str = DONE):
+        with self.connection:
+            self.connection.execute(
+                'UPDATE windows SET status = ?, updated = ? WHERE job = ? AND symbol = ? AND window_start = ?',
+                (status, int(time.time()), job, symbol, window_start)
+            )
+
+    def fail(self, job: str, symbol: str, window_start: int, terminal: bool = False) -> str:
+        """
+        Catat percobaan yang gagal. Window tetap pending ( dicoba lagi saat resume ) sampai
+        max_attempts, setelah itu atau jika terminal ( error client ) menjadi 'failed'.
+
+        Returns:
+            str: Status window sekarang
+        """
+        with self.connection:
+            self.connection.execute(
+                'UPDATE windows SET attempts = attempts + 1, status = CASE WHEN ? OR attempts + 1 >= ? THEN ? ELSE status END, updated = ? '
+                'WHERE job = ? AND symbol = ? AND window_start = ?',
+                (int(terminal), self.max_attempts, FAILED, int(time.time()), job, symbol, window_start)
+            )
+            row = self.connection.execute(
+                'SELECT status FROM windows WHERE job = ? AND symbol = ? AND window_start = ?', (job, symbol, window_start)
+            ).fetchone()
+        return row[0] if row else PENDING
+
+    def abandoned(self, job: str) -> list:
+        """Window yang ditinggalkan: (symbol, window_start, window_end, cursor, attempts)."""
+        return self.connection.execute(
+            'SELECT symbol, window_start, window_end, cursor, attempts FROM windows WHERE job = ? AND status = ? ORDER BY symbol, window_start',
+            (job, FAILED)
+        ).fetchall()
+
+    def progress(self, job: str) -> dict:
+        """Jumlah window dan row per status."""
+        rows = self.connection.execute(
+            'SELECT status, COUNT(*), SUM(rows) FROM windows WHERE job = ? GROUP BY status', (job,)
+        ).fetchall()
+        return {status: {"windows": count, "rows": total or 0} for status, count, total in rows}
+
+    def complete_job(self, job: str) -> bool:
+        """Tandai job selesai jika semua window sudah done / empty / failed."""
+        if PENDING in self.progress(job):
+            return False
+        for symbol, window_start, window_end, cursor, attempts in self.abandoned(job):
+            logging.warning(f"[⚠️][{symbol}] Window {window_start} - {window_end} ditinggalkan di cursor {cursor} setelah {attempts} percobaan")
+        with self.connection:
+            self.connection.execute('UPDATE jobs SET finished = ? WHERE name = ?', (int(time.time()), job))
+        return True
+
+    def close(self):
+        self.connection.close()
@@ -0,0 +1,80 @@
+from concurrent.futures import ProcessPoolExecutor
+from helper.kline_store import get_store
+from helper.planner import interval_to_ms, plan_windows
+import numpy as np
+import logging
+import os
+
+GAP_DTYPE = np.dtype([
+    ('symbol', 'U20'),
+    ('start', '<i8'),
+    ('end', '<i8'),
+    ('missing', '<i8'),
+])
+
+def find_gaps(open_times, interval: str = '1m') -> np.ndarray:
+    """
+    Mencari candle yang hilang di antara data yang ada, sepenuhnya dengan NumPy.
+
+    Args:
+        open_times (array): open_time int64 yang sudah urut
+        interval (str): Interval kline
+
+    Returns:
+        np.ndarray: Array (start, end, missing) berisi open_time candle pertama/terakhir yang hilang
+    """
+    step = interval_to_ms(interval)
+    times = np.asarray(open_times, dtype=np.int64)
+    diffs = np.diff(times)
+    positions = np.flatnonzero(diffs > step)
+    gaps = np.empty((len(positions), 3), dtype=np.int64)
+    gaps[:, 0] = times[positions] + step
+    gaps[:, 1] = times[positions + 1] - step
+    gaps[:, 2] = diffs[positions] // step - 1
+    return gaps
+
+def _scan_symbol(args: tuple) -> np.ndarray:
+    dir, symbol, interval = args
+    gaps = find_gaps(get_store(dir).read(symbol)['open_time'], interval)
+    result = np.empty(len(gaps), dtype=GAP_DTYPE)
+    result['symbol'] = symbol
+    result['start'], result['end'], result['missing'] = gaps[:, 0], gaps[:, 1], gaps[:, 2]
+    return result
+
+def scan_store(dir: str = 'log/data/raw', interval: str = '1m', processes: int = None, out: str = 'log/data/gaps.npy') -> np.ndarray:
+    """
+    Scan gap semua symbol di KlineStore secara paralel lalu simpan gap index ke disk.
+
+    Args:
+        dir (str): Folder KlineStore
+        interval (str): Interval kline
+        processes (int): Jumlah process, default jumlah core
+        out (str): Lokasi file gap index ( .npy ), kosongkan untuk tidak menyimpan
+
+    Returns:
+        np.ndarray: Gap index GAP_DTYPE (symbol, start, end, missing)
+    """
+    symbols = get_store(dir).symbols()
+    jobs = [(dir, symbol, interval) for symbol in symbols]
+    if processes == 1 or len(jobs) <= 1:
+        results = [_scan_symbol(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            results = list(pool.map(_scan_symbol, jobs, chunksize=max(1, len(jobs) // (4 * (processes or os.cpu_count() or 1)))))
+
+    gaps = np.concatenate(results) if results else np.empty(0, dtype=GAP_DTYPE)
+    if out:
+        os.makedirs(os.path.dirname(out) or '.', exist_ok=True)
+        np.save(out, gaps)
+    logging.info(f"[🔍] {len(symbols)} symbol discan, {len(gaps)} gap, {int(gaps['missing'].sum())} candle hilang")
+    return gaps
+
+def load_gap_index(path: str = 'log/data/gaps.npy') -> np.ndarray:
+    return np.load(path)
+
+def gap_windows(gaps: np.ndarray, interval: str = '1m', limit: int = 1000) -> dict:
+    """Mengubah gap index menjadi window download per symbol untuk backfill_klines."""
+    windows = {}
+    for gap in gaps:
+        windows.setdefault(str(gap['symbol']), []).extend(plan_windows(int(gap['start']), int(gap['end']), interval, limit))
+    return windows
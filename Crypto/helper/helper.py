@@ -6,7 +6,9 @@ from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
 from dotenv import load_dotenv
 import logging
 import pandas as pd
-import os
+from helper.kline_store import get_store
+from helper.gaps import find_gaps
+from helper.planner import interval_to_ms
 load_dotenv()
 logging.basicConfig(
     level=logging.INFO,
@@ -120,76 +122,28 @@ def write_coin_potential(dir: str, filename: str, data: dict):
 def write_history_klines(dir: str, filename: str, data: dict):
     if not data:
         return
-    
-    rows = []
-    for item in data:
-        rows.append({
-            "open_time": item[0],
-            "open": item[1],
-            "high": item[2],
-            "low": item[3],
-            "close": item[4],
-            "volume": item[5],
-            "close_time": item[6],
-            "quote_asset_volume": item[7],
-            "num_trades": item[8],
-            "taker_buy_base_volume": item[9],
-            "taker_buy_quote_volume": item[10],
-        })
-
-    if not rows:
-        return
-    
-    os.makedirs(dir, exist_ok=True)
-    filenames = filename + '.csv'
-    file_path = os.path.join(dir, filenames)
-    new_data = pd.DataFrame(rows)
 
-    if os.path.exists(file_path):
-        logging.info(f"[📄] File ditemukan: {filenames}")
-        try:
-            existing = pd.read_csv(file_path)
-            new_data = new_data[existing.columns.tolist()] # samakan column dengan data yang sudah ada
-            new_df = new_data[~new_data['open_time'].isin(existing['open_time'])]
-            if not new_df.empty:
-                combine_data = pd.concat([existing, new_data], ignore_index=True)
-                combine_data.drop_duplicates(subset='open_time', keep='last', inplace=True) # duplicate when open_match match to another, and get lasted
-                combine_data.to_csv(file_path, index=False)
-                logging.info(f"[✅] Data berhasil ditambahkan dengan filter duplikat")
-            else:
-                logging.info(f"[ℹ️] Tidak ada data baru, dilewati")
-        except Exception as e:
-            logging.error(f"[⛔] Gagal menambahkan data ke file: {e}")
+    store = get_store(dir)
+    appended = store.append(filename, store.to_records(data))
+    if appended:
+        logging.info(f"[✅][{filename}] {appended} data berhasil ditambahkan")
     else:
-        logging.info(f"[🆕] File belum ada, membuat baru: {filenames}")
-        try:
-            df = pd.DataFrame(rows)
-            df.to_csv(file_path, index=False)
-            print(f"[✅] File baru berhasil dibuat.")
-        except Exception as e:
-            print(f"[⛔] Gagal membuat file: {e}")
+        logging.info(f"[ℹ️][{filename}] Tidak ada data baru, dilewati")
+    return appended
 
-def check_noise_data(dir: str, filename: str):
-    os.makedirs(dir, exist_ok=True)
-    filenames = filename + '.csv'
-    file_path = os.path.join(dir, filenames)
-
-    if os.path.exists(file_path):
-        logging.info(f"[📄] File ditemukan: {filenames}")
-    
-        data = pd.read_csv(file_path)
-        data['open_time'] = pd.to_datetime(data['open_time'], unit='ms')
-        data = data.sort_values(by='open_time').reset_index(drop=True)
+def check_noise_data(dir: str, filename: str, interval: str = '1m'):
+    store = get_store(dir)
+    if store.index(filename)['rows']:
+        logging.info(f"[📄] Data ditemukan: {filename}")
 
-        # Tambahkan previous_time sebelum membuat subset
-        data['previous_time'] = data['open_time'].shift(1)
-
-        # Hitung selisih antar waktu
-        data['diff'] = data['open_time'].diff().dt.total_seconds()
-
-        # Ambil data yang punya gap > 60 detik
-        missing_info = data[data['diff'] > 60][['previous_time', 'open_time', 'diff']]
-        missing_info['candles_missing'] = (missing_info['diff'] // 60 - 1).astype(int)
-        logging.info(f"[🔍][{filename}] GAP waktu antar data : {data['open_time'].iloc[1] - data['open_time'].iloc[0]}")
-        logging.info(f"[🔍][{filename}] data yang hilang: {missing_info.head(10)}")
-        logging.info(f"[⚠️][{filename}] Total data lebih dari 60 detik: {len(missing_info)}")
\ No newline at end of file
+        open_time = store.read(filename)['open_time'] # sudah urut dan unik dari store
+        gaps = find_gaps(open_time, interval)
+        missing_info = pd.DataFrame({
+            'previous_time': pd.to_datetime(gaps[:10, 0] - interval_to_ms(interval), unit='ms'),
+            'open_time': pd.to_datetime(gaps[:10, 1] + interval_to_ms(interval), unit='ms'),
+            'candles_missing': gaps[:10, 2]
+        })
+        logging.info(f"[🔍][{filename}] GAP waktu antar data : {pd.to_timedelta(open_time[1] - open_time[0], unit='ms')}")
+        logging.info(f"[🔍][{filename}] data yang hilang: {missing_info}")
+        logging.info(f"[⚠️][{filename}] Total gap: {len(gaps)}, candle hilang: {int(gaps[:, 2].sum())}")
+        return gaps
@@ -0,0 +1,280 @@
+from array import array
+from helper.kline_store import get_store, interval_dir
+from helper.rollup import ROLLUP_INTERVALS, ROLLUP_FOLDER
+from helper.planner import interval_to_ms
+from service.decoder import KlineEvent
+import math
+import time
+import os
+
+class RingBuffer:
+    """Buffer float ukuran tetap berbasis array('d'), push O(1) dan mengembalikan nilai yang tergeser."""
+    __slots__ = ('size', 'data', 'position', 'count')
+
+    def __init__(self, size: int):
+        self.size = size
+        self.data = array('d', bytes(8 * size))
+        self.position = 0
+        self.count = 0
+
+    def push(self, value: float) -> float:
+        evicted = self.data[self.position] if self.count == self.size else 0.0
+        self.data[self.position] = value
+        self.position = (self.position + 1) % self.size
+        if self.count < self.size:
+            self.count += 1
+        return evicted
+
+    @property
+    def full(self) -> bool:
+        return self.count == self.size
+
+class RollingSum:
+    """
+    Jumlah dan jumlah kuadrat window bergulir. Setiap buffer berputar satu kali,
+    jumlah dihitung ulang dari buffer agar error floating point tidak menumpuk ( amortized O(1) ).
+    """
+    __slots__ = ('buffer', 'total', 'total_sq')
+
+    def __init__(self, size: int):
+        self.buffer = RingBuffer(size)
+        self.total = 0.0
+        self.total_sq = 0.0
+
+    def push(self, value: float):
+        evicted = self.buffer.push(value)
+        self.total += value - evicted
+        self.total_sq += value * value - evicted * evicted
+        if self.buffer.position == 0:
+            data = self.buffer.data[:self.buffer.count]
+            self.total = math.fsum(data)
+            self.total_sq = math.fsum(x * x for x in data)
+
+    def mean(self) -> float:
+        return self.total / self.buffer.count if self.buffer.count else 0.0
+
+    def std(self) -> float:
+        count = self.buffer.count
+        if count < 2:
+            return 0.0
+        variance = (self.total_sq - self.total * self.total / count) / count
+        return math.sqrt(variance) if variance > 0 else 0.0
+
+class EMA:
+    __slots__ = ('period', 'alpha', 'value', 'count', 'seed')
+
+    def __init__(self, period: int):
+        self.period = period
+        self.alpha = 2.0 / (period + 1)
+        self.value = None
+        self.count = 0
+        self.seed = 0.0
+
+    def update(self, x: float) -> float:
+        self.count += 1
+        if self.count <= self.period: # seed dengan SMA periode pertama
+            self.seed += x
+            self.value = self.seed / self.count
+        else:
+            self.value += self.alpha * (x - self.value)
+        return self.value
+
+class RSI:
+    __slots__ = ('period', 'prev', 'avg_gain', 'avg_loss', 'count', 'value')
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prev = None
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self.count = 0
+        self.value = None
+
+    def update(self, close: float) -> float:
+        if self.prev is None:
+            self.prev = close
+            return self.value
+        change = close - self.prev
+        self.prev = close
+        gain, loss = max(change, 0.0), max(-change, 0.0)
+        self.count += 1
+        if self.count <= self.period:
+            self.avg_gain += gain / self.period
+            self.avg_loss += loss / self.period
+            if self.count < self.period:
+                return self.value
+        else: # smoothing Wilder
+            self.avg_gain = (self.avg_gain * (self.period - 1) + gain) / self.period
+            self.avg_loss = (self.avg_loss * (self.period - 1) + loss) / self.period
+        self.value = 100.0 if self.avg_loss == 0 else 100.0 - 100.0 / (1.0 + self.avg_gain / self.avg_loss)
+        return self.value
+
+class MACD:
+    __slots__ = ('fast', 'slow', 'signal', 'value')
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast = EMA(fast)
+        self.slow = EMA(slow)
+        self.signal = EMA(signal)
+        self.value = None
+
+    def update(self, close: float) -> tuple:
+        macd = self.fast.update(close) - self.slow.update(close)
+        signal = self.signal.update(macd)
+        self.value = (macd, signal, macd - signal)
+        return self.value
+
+class ATR:
+    __slots__ = ('period', 'prev_close', 'count', 'value')
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prev_close = None
+        self.count = 0
+        self.value = None
+
+    def update(self, high: float, low: float, close: float) -> float:
+        if self.prev_close is None:
+            true_range = high - low
+        else:
+            true_range = max(high - low, abs(high - self.prev_close), abs(low - self.prev_close))
+        self.prev_close = close
+        self.count += 1
+        if self.count <= self.period:
+            self.value = ((self.value or 0.0) * (self.count - 1) + true_range) / self.count
+        else:
+            self.value = (self.value * (self.period - 1) + true_range) / self.period
+        return self.value
+
+class Bollinger:
+    __slots__ = ('width', 'window', 'value')
+
+    def __init__(self, period: int = 20, width: float = 2.0):
+        self.width = width
+        self.window = RollingSum(period)
+        self.value = None
+
+    def update(self, close: float) -> tuple:
+        self.window.push(close)
+        middle, deviation = self.window.mean(), self.window.std()
+        self.value = (middle, middle + self.width * deviation, middle - self.width * deviation)
+        return self.value
+
+class VWAP:
+    """VWAP bergulir N candle memakai typical price (high + low + close) / 3."""
+    __slots__ = ('price_volume', 'volume', 'value')
+
+    def __init__(self, period: int = 20):
+        self.price_volume = RollingSum(period)
+        self.volume = RollingSum(period)
+        self.value = None
+
+    def update(self, high: float, low: float, close: float, volume: float) -> float:
+        self.price_volume.push((high + low + close) / 3.0 * volume)
+        self.volume.push(volume)
+        self.value = self.price_volume.total / self.volume.total if self.volume.total > 0 else close
+        return self.value
+
+class RollingVolume:
+    __slots__ = ('window', 'value')
+
+    def __init__(self, period: int = 20):
+        self.window = RollingSum(period)
+        self.value = None
+
+    def update(self, volume: float) -> tuple:
+        self.window.push(volume)
+        mean, std = self.window.mean(), self.window.std()
+        self.value = (mean, std, (volume - mean) / std if std > 0 else 0.0)
+        return self.value
+
+class SymbolIndicators:
+    """Semua indikator untuk satu symbol, diupdate sekali per candle close."""
+    __slots__ = ('open_time', 'ema_fast', 'ema_slow', 'rsi', 'macd', 'atr', 'bollinger', 'vwap', 'volume')
+
+    def __init__(self):
+        self.open_time = None
+        self.ema_fast = EMA(12)
+        self.ema_slow = EMA(26)
+        self.rsi = RSI(14)
+        self.macd = MACD(12, 26, 9)
+        self.atr = ATR(14)
+        self.bollinger = Bollinger(20, 2.0)
+        self.vwap = VWAP(20)
+        self.volume = RollingVolume(20)
+
+    def update(self, open_time: int, high: float, low: float, close: float, volume: float):
+        if self.open_time is not None and open_time <= self.open_time: # candle lama / duplikat
+            return
+        self.open_time = open_time
+        self.ema_fast.update(close)
+        self.ema_slow.update(close)
+        self.rsi.update(close)
+        self.macd.update(close)
+        self.atr.update(high, low, close)
+        self.bollinger.update(close)
+        self.vwap.update(high, low, close, volume)
+        self.volume.update(volume)
+
+    def snapshot(self) -> dict:
+        return {
+            "open_time": self.open_time,
+            "ema_12": self.ema_fast.value,
+            "ema_26": self.ema_slow.value,
+            "rsi_14": self.rsi.value,
+            "macd": self.macd.value,
+            "atr_14": self.atr.value,
+            "bollinger": self.bollinger.value,
+            "vwap_20": self.vwap.value,
+            "volume": self.volume.value,
+        }
+
+class IndicatorEngine:
+    """
+    Indikator incremental untuk banyak symbol. Bisa dipasang langsung sebagai
+    on_batch BinanceStreamSocket sehingga indikator terupdate di batch yang sama dengan write.
+
+    Args:
+        store_dir (str): Folder KlineStore 1m, seed memakai interval_dir(store_dir, interval)
+            atau rollup store 1m jika store interval tersebut belum berisi data
+        interval (str): Interval kline
+    """
+    def __init__(self, store_dir: str = 'log/data/raw', interval: str = '1m'):
+        self.store = get_store(interval_dir(store_dir, interval))
+        self.rollup_dir = os.path.join(store_dir, ROLLUP_FOLDER, interval) if interval in ROLLUP_INTERVALS else None
+        self.interval = interval
+        self.symbols = {}
+
+    def get(self, symbol: str) -> SymbolIndicators:
+        if symbol not in self.symbols:
+            self.symbols[symbol] = SymbolIndicators()
+        return self.symbols[symbol]
+
+    def seed(self, symbol: str, candles: int = 500):
+        """Menghangatkan indikator dari klines terakhir yang tersimpan di store interval yang sama."""
+        store = self.store
+        if store.index(symbol)['max_open_time'] is None and self.rollup_dir and os.path.isdir(self.rollup_dir):
+            store = get_store(self.rollup_dir)
+        max_open_time = store.index(symbol)['max_open_time']
+        if max_open_time is None:
+            return
+        records = store.read(symbol, start_time=max_open_time - candles * interval_to_ms(self.interval))
+        if store is not self.store:
+            records = records[records['close_time'] < time.time() * 1000] # bucket rollup yang belum selesai dilewati
+        indicators = self.get(symbol)
+        for open_time, high, low, close, volume in zip(
+            records['open_time'].tolist(), records['high'].tolist(), records['low'].tolist(),
+            records['close'].tolist(), records['volume'].tolist()
+        ):
+            indicators.update(open_time, high, low, close, volume)
+
+    def update(self, event: KlineEvent):
+        self.get(event.symbol).update(event.open_time, event.high, event.low, event.close, event.volume)
+
+    async def on_batch(self, events: list):
+        for event in events:
+            if isinstance(event, KlineEvent) and event.closed:
+                self.update(event)
+
+    def snapshot(self, symbol: str) -> dict:
+        return self.get(symbol).snapshot()
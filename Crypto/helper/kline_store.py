@@ -0,0 +1,386 @@
+import numpy as np
+import pandas as pd
+import logging
+import json
+import os
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+
+KLINE_DTYPE = np.dtype([
+    ('open_time', '<i8'),
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('volume', '<f8'),
+    ('close_time', '<i8'),
+    ('quote_asset_volume', '<f8'),
+    ('num_trades', '<i8'),
+    ('taker_buy_base_volume', '<f8'),
+    ('taker_buy_quote_volume', '<f8'),
+])
+KLINE_COLUMNS = list(KLINE_DTYPE.names)
+PARTITION_UNIT = {'month': 'datetime64[M]', 'day': 'datetime64[D]'}
+INDEX_FILE = '_index.json'
+
+class KlineStore:
+    """
+    Penyimpanan klines append-only dengan partisi per symbol / bulan ( atau hari ).
+
+    Layout folder:
+        {root}/{symbol}/{YYYY-MM}.bin   record biner fixed-size sesuai KLINE_DTYPE
+        {root}/{symbol}/_index.json     max open_time, jumlah row, row committed per partisi dan
+                                        partisi yang perlu compaction
+
+    Data selalu ditulis sebelum index, dan index ditulis atomic ( tmp + rename ). Reader
+    hanya membaca sampai jumlah row committed, sehingga append writer yang belum selesai
+    tidak pernah terbaca. Sisa append yang terputus ( crash ) baru dipotong saat symbol
+    pertama kali ditulis oleh process ini. Satu folder store diasumsikan hanya ditulis oleh
+    satu process.
+
+    Args:
+        root (str): Folder utama penyimpanan
+        partition (str): 'month' atau 'day'
+    """
+    def __init__(self, root: str = 'log/data/raw', partition: str = 'month'):
+        if partition not in PARTITION_UNIT:
+            raise ValueError(f"Partisi '{partition}' tidak didukung")
+        self.root = root
+        self.partition = partition
+        self.indexes = {}
+        self.recovered = set() # symbol yang sudah diperiksa recovery oleh process writer ini
+        self.listeners = [] # callback(symbol, fresh, late) setiap ada row baru, contoh RollupStore
+
+    def symbols(self) -> list:
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            name for name in os.listdir(self.root)
+            if os.path.exists(os.path.join(self.root, name, INDEX_FILE))
+        )
+
+    def _symbol_dir(self, symbol: str) -> str:
+        return os.path.join(self.root, symbol)
+
+    def _partition_path(self, symbol: str, key: str) -> str:
+        return os.path.join(self._symbol_dir(symbol), key + '.bin')
+
+    def _partition_keys(self, open_time) -> np.ndarray:
+        return np.datetime_as_string(np.asarray(open_time, dtype='datetime64[ms]').astype(PARTITION_UNIT[self.partition]))
+
+    def index(self, symbol: str) -> dict:
+        """Index per symbol, dibaca sekali dari disk lalu disimpan di memory."""
+        if symbol not in self.indexes:
+            path = os.path.join(self._symbol_dir(symbol), INDEX_FILE)
+            if os.path.exists(path):
+                with open(path) as file:
+                    self.indexes[symbol] = json.load(file)
+                self.indexes[symbol].setdefault('committed', {})
+            else:
+                self.indexes[symbol] = {"max_open_time": None, "rows": 0, "partitions": [], "dirty": [], "committed": {}}
+        return self.indexes[symbol]
+
+    def _save_index(self, symbol: str):
+        path = os.path.join(self._symbol_dir(symbol), INDEX_FILE)
+        with open(path + '.tmp', 'w') as file:
+            json.dump(self.indexes[symbol], file)
+        os.replace(path + '.tmp', path) # index lama tetap utuh jika crash saat menulis
+
+    def _committed_rows(self, symbol: str, key: str, size: int) -> int:
+        """Jumlah row partisi yang boleh dibaca: committed, atau semua record utuh untuk index lama."""
+        committed = self.index(symbol)['committed'].get(key)
+        rows = size // KLINE_DTYPE.itemsize
+        return rows if committed is None else min(committed, rows)
+
+    def _writable(self, symbol: str) -> dict:
+        """Index symbol untuk ditulis, recovery dijalankan sekali per symbol sebelum write pertama."""
+        index = self.index(symbol)
+        if symbol not in self.recovered:
+            if os.path.isdir(self._symbol_dir(symbol)):
+                self._recover(symbol)
+            self.recovered.add(symbol)
+        return index
+
+    def _recover(self, symbol: str):
+        """
+        Menyamakan partisi dengan index setelah crash: tail yang belum committed dan partisi
+        yang belum tercatat di index dipotong. Index lama tanpa committed memakai isi disk
+        saat ini ( hanya record terpotong di akhir file yang dibuang ). Hanya dipanggil dari
+        jalur write, reader tidak pernah mengubah file.
+        """
+        index = self.indexes[symbol]
+        committed = index['committed']
+        changed = False
+        for file in os.listdir(self._symbol_dir(symbol)):
+            key, extension = os.path.splitext(file)
+            if extension == '.bin' and key not in index['partitions']:
+                os.remove(self._partition_path(symbol, key))
+                logging.warning(f"[🩹][{symbol}] Partisi {key} belum committed, dihapus")
+        for key in index['partitions']:
+            path = self._partition_path(symbol, key)
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            rows = size // KLINE_DTYPE.itemsize
+            expected = committed.get(key)
+            if expected is None or rows < expected: # index lama / rewrite yang belum selesai dicatat
+                expected = rows
+            if size != expected * KLINE_DTYPE.itemsize:
+                os.truncate(path, expected * KLINE_DTYPE.itemsize)
+                logging.warning(f"[🩹][{symbol}] Partisi {key}: {size - expected * KLINE_DTYPE.itemsize} byte belum committed dipotong")
+            if committed.get(key) != expected:
+                committed[key] = expected
+                changed = True
+        if changed or index['rows'] != sum(committed.values()):
+            index['rows'] = sum(committed.values())
+            self._save_index(symbol)
+
+    def _replace_partition(self, symbol: str, key: str, records: np.ndarray):
+        """
+        Menulis ulang satu partisi. Committed dikosongkan dulu di index supaya recovery
+        tidak memotong file baru jika crash terjadi sebelum index berikutnya disimpan.
+        """
+        index = self.index(symbol)
+        index['committed'][key] = None
+        self._save_index(symbol)
+        path = self._partition_path(symbol, key)
+        with open(path + '.tmp', 'wb') as file:
+            file.write(records.tobytes())
+        os.replace(path + '.tmp', path)
+        index['committed'][key] = len(records)
+
+    @staticmethod
+    def to_records(data: list) -> np.ndarray:
+        """Convert response /klines Binance ( list of list ) menjadi structured array."""
+        records = np.empty(len(data), dtype=KLINE_DTYPE)
+        for position, name in enumerate(KLINE_COLUMNS):
+            records[name] = [item[position] for item in data]
+        return records
+
+    @staticmethod
+    def _sort_unique(records: np.ndarray) -> np.ndarray:
+        # stable sort lalu ambil row terakhir untuk open_time yang sama ( data terbaru menang )
+        records = records[np.argsort(records['open_time'], kind='stable')]
+        keep = np.ones(len(records), dtype=bool)
+        keep[:-1] = records['open_time'][1:] != records['open_time'][:-1]
+        return records[keep]
+
+    def _write_partitions(self, symbol: str, records: np.ndarray):
+        keys = self._partition_keys(records['open_time'])
+        index = self.index(symbol)
+        for key in np.unique(keys):
+            with open(self._partition_path(symbol, key), 'ab') as file:
+                file.write(records[keys == key].tobytes())
+                index['committed'][str(key)] = file.tell() // KLINE_DTYPE.itemsize # berlaku setelah index disimpan
+            if key not in index['partitions']:
+                index['partitions'].append(key)
+        index['partitions'].sort()
+
+    def append(self, symbol: str, records: np.ndarray) -> int:
+        """
+        Menambahkan klines ke store.
+
+        Row dengan open_time > max_open_time langsung di-append ( cek O(1) via index ).
+        Row yang lebih lama ( misal hasil repair gap ) hanya dicek terhadap partisi yang
+        bersangkutan, lalu partisi ditandai dirty untuk compaction.
+
+        Args:
+            symbol (str): Symbol coin
+            records (np.ndarray): Structured array KLINE_DTYPE
+
+        Returns:
+            int: Jumlah row yang benar-benar ditambahkan
+        """
+        if len(records) == 0:
+            return 0
+        index = self._writable(symbol)
+        os.makedirs(self._symbol_dir(symbol), exist_ok=True)
+        records = self._sort_unique(records)
+
+        max_open_time = index['max_open_time']
+        if max_open_time is None:
+            fresh, late = records, records[:0]
+        else:
+            split = np.searchsorted(records['open_time'], max_open_time, side='right')
+            fresh, late = records[split:], records[:split]
+
+        if len(late):
+            keys = self._partition_keys(late['open_time'])
+            missing = []
+            for key in np.unique(keys):
+                chunk = late[keys == key]
+                existing = self._read_partition(symbol, key)['open_time']
+                missing.append(chunk[~np.isin(chunk['open_time'], existing)])
+            late = np.concatenate(missing)
+            if len(late):
+                self._write_partitions(symbol, late)
+                dirty = set(index['dirty']) | set(self._partition_keys(late['open_time']).tolist())
+                index['dirty'] = sorted(dirty)
+
+        if len(fresh):
+            self._write_partitions(symbol, fresh)
+            index['max_open_time'] = int(fresh['open_time'][-1])
+
+        appended = len(fresh) + len(late)
+        if appended:
+            index['rows'] += appended
+            self._save_index(symbol)
+            for listener in self.listeners:
+                listener(symbol, fresh, late)
+        return appended
+
+    def upsert(self, symbol: str, records: np.ndarray) -> int:
+        """
+        Seperti append, tetapi row dengan open_time yang sudah ada ditimpa. Dipakai rollup
+        untuk memperbarui bucket terakhir yang belum selesai.
+
+        Jika yang ditimpa hanya record terakhir, record ditulis langsung di akhir file
+        tanpa membaca partisi. Selain itu partisi yang terkena ditulis ulang.
+
+        Returns:
+            int: Jumlah row yang ditulis ( baru + ditimpa )
+        """
+        if len(records) == 0:
+            return 0
+        index = self._writable(symbol)
+        os.makedirs(self._symbol_dir(symbol), exist_ok=True)
+        records = self._sort_unique(records)
+
+        max_open_time = index['max_open_time']
+        split = 0 if max_open_time is None else np.searchsorted(records['open_time'], max_open_time, side='right')
+        existing, fresh = records[:split], records[split:]
+
+        last_key = index['partitions'][-1] if index['partitions'] else None
+        if len(existing) == 1 and existing['open_time'][0] == max_open_time and last_key not in index['dirty']:
+            with open(self._partition_path(symbol, last_key), 'r+b') as file:
+                file.seek(-KLINE_DTYPE.itemsize, os.SEEK_END)
+                file.write(existing.tobytes())
+        elif len(existing):
+            keys = self._partition_keys(existing['open_time'])
+            for key in np.unique(keys):
+                current = self._read_partition(symbol, key)
+                merged = self._sort_unique(np.concatenate([current, existing[keys == key]])) # row baru menang
+                self._replace_partition(symbol, key, merged)
+                index['rows'] += len(merged) - len(current)
+                index['dirty'] = [dirty for dirty in index['dirty'] if dirty != key]
+                if key not in index['partitions']:
+                    index['partitions'] = sorted(index['partitions'] + [str(key)])
+
+        if len(fresh):
+            self._write_partitions(symbol, fresh)
+            index['max_open_time'] = int(fresh['open_time'][-1])
+            index['rows'] += len(fresh)
+        self._save_index(symbol)
+        return len(records)
+
+    def tail(self, symbol: str) -> np.ndarray:
+        """Record dengan open_time terbesar ( array berisi 0 atau 1 row )."""
+        index = self.index(symbol)
+        if not index['partitions']:
+            return np.empty(0, dtype=KLINE_DTYPE)
+        last_key = index['partitions'][-1]
+        if last_key in index['dirty']:
+            return self._read_partition(symbol, last_key)[-1:]
+        path = self._partition_path(symbol, last_key)
+        rows = self._committed_rows(symbol, last_key, os.path.getsize(path))
+        if not rows:
+            return np.empty(0, dtype=KLINE_DTYPE)
+        with open(path, 'rb') as file:
+            file.seek((rows - 1) * KLINE_DTYPE.itemsize) # row committed terakhir, bukan akhir file
+            return np.frombuffer(file.read(KLINE_DTYPE.itemsize), dtype=KLINE_DTYPE).copy()
+
+    def _read_partition(self, symbol: str, key: str) -> np.ndarray:
+        path = self._partition_path(symbol, key)
+        if not os.path.exists(path):
+            return np.empty(0, dtype=KLINE_DTYPE)
+        records = np.fromfile(path, dtype=KLINE_DTYPE, count=self._committed_rows(symbol, key, os.path.getsize(path)))
+        if key in self.index(symbol)['dirty']:
+            records = self._sort_unique(records)
+        return records
+
+    def read(self, symbol: str, start_time: int = None, end_time: int = None) -> np.ndarray:
+        """
+        Membaca klines hanya dari partisi yang beririsan dengan range waktu.
+
+        Args:
+            symbol (str): Symbol coin
+            start_time (int): Timestamp awal dalam ms ( inclusive )
+            end_time (int): Timestamp akhir dalam ms ( inclusive )
+
+        Returns:
+            np.ndarray: Structured array KLINE_DTYPE, urut open_time tanpa duplikat
+        """
+        keys = self.index(symbol)['partitions']
+        if start_time is not None:
+            first = str(self._partition_keys([start_time])[0])
+            keys = [key for key in keys if key >= first]
+        if end_time is not None:
+            last = str(self._partition_keys([end_time])[0])
+            keys = [key for key in keys if key <= last]
+        if not keys:
+            return np.empty(0, dtype=KLINE_DTYPE)
+
+        records = np.concatenate([self._read_partition(symbol, key) for key in keys])
+        mask = np.ones(len(records), dtype=bool)
+        if start_time is not None:
+            mask &= records['open_time'] >= start_time
+        if end_time is not None:
+            mask &= records['open_time'] <= end_time
+        return records[mask]
+
+    def read_frame(self, symbol: str, start_time: int = None, end_time: int = None, columns: list = None) -> pd.DataFrame:
+        df = pd.DataFrame(self.read(symbol, start_time, end_time))
+        return df[columns] if columns else df
+
+    def compact(self, symbol: str = None):
+        """
+        Menulis ulang partisi dirty menjadi urut dan tanpa duplikat.
+
+        Args:
+            symbol (str): Symbol coin, jika kosong semua symbol di-compact
+        """
+        for name in ([symbol] if symbol else self.symbols()):
+            index = self._writable(name)
+            if not index['dirty']:
+                continue
+            rows = index['rows']
+            for key in index['dirty']:
+                path = self._partition_path(name, key)
+                before = os.path.getsize(path) // KLINE_DTYPE.itemsize
+                records = self._sort_unique(np.fromfile(path, dtype=KLINE_DTYPE))
+                self._replace_partition(name, key, records)
+                rows -= before - len(records)
+            index['rows'] = rows
+            index['dirty'] = []
+            self._save_index(name)
+            logging.info(f"[🧹][{name}] Compaction selesai")
+
+    def import_csv(self, file_path: str, symbol: str) -> int:
+        """Migrasi file CSV lama hasil write_history_klines ke dalam store."""
+        df = pd.read_csv(file_path)
+        records = np.empty(len(df), dtype=KLINE_DTYPE)
+        for name in KLINE_COLUMNS:
+            records[name] = df[name].to_numpy()
+        return self.append(symbol, records)
+
+_stores = {}
+
+def interval_dir(root: str = 'log/data/raw', interval: str = '1m') -> str:
+    """Folder store per interval: 1m di root, interval lain di folder sendiri ( contoh log/data/raw_5m )."""
+    return root if interval == '1m' else f"{root}_{interval}"
+
+def get_store(root: str = 'log/data/raw') -> KlineStore:
+    """KlineStore dipakai bersama per folder supaya index tidak dibaca berulang."""
+    if root not in _stores:
+        _stores[root] = KlineStore(root)
+    return _stores[root]
+
+if __name__ == '__main__':
+    # migrasi CSV lama di log/data/raw menjadi partisi biner
+    store = get_store('log/data/raw')
+    for file in sorted(os.listdir(store.root)):
+        if file.endswith('.csv'):
+            symbol = os.path.splitext(file)[0]
+            count = store.import_csv(os.path.join(store.root, file), symbol)
+            logging.info(f"[✅][{symbol}] {count} row dimigrasi")
+    store.compact()
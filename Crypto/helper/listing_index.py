@@ -0,0 +1,58 @@
+import json
+import time
+import os
+
+class ListingIndex:
+    """
+    Index lokal timestamp listing ( open_time candle pertama ) setiap symbol.
+
+    Timestamp listing tidak pernah berubah, jadi cukup diambil sekali dari Binance
+    lalu disimpan di file JSON. Symbol yang belum punya kline dicatat sebagai kosong
+    beserta waktu pengecekan, dan baru dicek ulang setelah empty_ttl lewat.
+
+    Args:
+        path (str): Lokasi file index
+        empty_ttl (int): Detik sebelum symbol kosong dicek ulang ke Binance
+    """
+    def __init__(self, path: str = 'log/data/listing.json', empty_ttl: int = int(os.environ.get('LISTING_EMPTY_TTL', 7 * 86400))):
+        self.path = path
+        self.empty_ttl = empty_ttl
+        self.listing = {}
+        self.empty = {} # symbol -> waktu terakhir dicek ( detik )
+        if os.path.exists(path):
+            with open(path) as file:
+                data = json.load(file)
+            if 'listing' in data and isinstance(data['listing'], dict):
+                self.listing, self.empty = data['listing'], data.get('empty', {})
+            else: # format lama: symbol -> timestamp
+                self.listing = data
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.listing
+
+    def get(self, symbol: str) -> int:
+        return self.listing.get(symbol)
+
+    def missing(self, symbols: list) -> list:
+        """Symbol yang belum ada di index dan tidak sedang ditandai kosong."""
+        now = time.time()
+        return [
+            symbol for symbol in symbols
+            if symbol not in self.listing and now - self.empty.get(symbol, 0) >= self.empty_ttl
+        ]
+
+    def update(self, listing: dict):
+        self.listing.update(listing)
+        for symbol in listing:
+            self.empty.pop(symbol, None)
+
+    def mark_empty(self, symbols: list):
+        now = int(time.time())
+        for symbol in symbols:
+            self.empty[symbol] = now
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path + '.tmp', 'w') as file:
+            json.dump({"listing": self.listing, "empty": self.empty}, file)
+        os.replace(self.path + '.tmp', self.path) # tidak pernah meninggalkan file setengah tertulis
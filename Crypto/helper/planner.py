@@ -0,0 +1,109 @@
+from helper.kline_store import get_store
+import numpy as np
+
+INTERVAL_MS = {
+    '1m': 60_000,
+    '3m': 180_000,
+    '5m': 300_000,
+    '15m': 900_000,
+    '30m': 1_800_000,
+    '1h': 3_600_000,
+    '2h': 7_200_000,
+    '4h': 14_400_000,
+    '6h': 21_600_000,
+    '8h': 28_800_000,
+    '12h': 43_200_000,
+    '1d': 86_400_000,
+    '3d': 259_200_000,
+    '1w': 604_800_000,
+}
+
+def interval_to_ms(interval: str) -> int:
+    if interval not in INTERVAL_MS: # 1M panjangnya tidak tetap, tidak bisa dipakai untuk planning
+        raise ValueError(f"Interval '{interval}' tidak didukung planner")
+    return INTERVAL_MS[interval]
+
+def align_time(timestamp: int, interval: str) -> int:
+    """Membulatkan timestamp ke atas sesuai grid open_time interval."""
+    step = interval_to_ms(interval)
+    return -(-int(timestamp) // step) * step
+
+def next_cursor(klines: list) -> int:
+    """
+    Cursor request berikutnya diambil dari close_time candle terakhir yang diterima.
+
+    Args:
+        klines (list): Response /klines dari Binance
+
+    Returns:
+        int: startTime untuk request berikutnya
+    """
+    return int(klines[-1][6]) + 1
+
+def plan_windows(start_time: int, end_time: int, interval: str = '1m', limit: int = 1000) -> list:
+    """
+    Membagi range waktu menjadi window yang pas interval x limit, tanpa overlap.
+
+    Args:
+        start_time (int): Timestamp awal dalam ms
+        end_time (int): Timestamp akhir dalam ms ( inclusive )
+        interval (str): Interval kline Binance
+        limit (int): Jumlah candle per request
+
+    Returns:
+        list: Daftar tuple (startTime, endTime)
+    """
+    step = interval_to_ms(interval) * limit
+    start_time = align_time(start_time, interval)
+    return [(start, min(start + step - 1, end_time)) for start in range(start_time, end_time + 1, step)]
+
+def missing_ranges(open_times, start_time: int, end_time: int, interval: str = '1m') -> list:
+    """
+    Mencari range open_time yang belum ada di data.
+
+    Args:
+        open_times (array): open_time candle yang sudah tersimpan
+        start_time (int): Timestamp awal dalam ms
+        end_time (int): Timestamp akhir dalam ms ( inclusive )
+        interval (str): Interval kline Binance
+
+    Returns:
+        list: Daftar tuple (start, end) open_time candle yang hilang
+    """
+    step = interval_to_ms(interval)
+    start_time = align_time(start_time, interval)
+    last_time = int(end_time) // step * step
+    if last_time < start_time:
+        return []
+
+    times = np.asarray(open_times, dtype=np.int64)
+    times = np.unique(times[(times >= start_time) & (times <= last_time)])
+    # tambahkan batas semu sebelum awal dan sesudah akhir agar head/tail ikut terdeteksi sebagai gap
+    edges = np.concatenate(([start_time - step], times, [last_time + step]))
+    gaps = np.flatnonzero(np.diff(edges) > step)
+    return [(int(edges[i] + step), int(edges[i + 1] - step)) for i in gaps]
+
+def plan_missing_windows(dir: str, symbol: str, start_time: int, end_time: int, interval: str = '1m', limit: int = 1000) -> list:
+    """
+    Planning window hanya untuk range yang belum ada di disk, sehingga resume tidak download ulang.
+
+    Args:
+        dir (str): Folder KlineStore
+        symbol (str): Symbol coin
+        start_time (int): Timestamp awal dalam ms
+        end_time (int): Timestamp akhir dalam ms
+        interval (str): Interval kline Binance
+        limit (int): Jumlah candle per request
+
+    Returns:
+        list: Daftar tuple (startTime, endTime)
+    """
+    store = get_store(dir)
+    if not store.index(symbol)['rows']:
+        return plan_windows(start_time, end_time, interval, limit)
+
+    existing = store.read(symbol, start_time, end_time)['open_time'] # hanya partisi dalam range yang dibaca
+    windows = []
+    for start, end in missing_ranges(existing, start_time, end_time, interval):
+        windows.extend(plan_windows(start, end, interval, limit))
+    return windows
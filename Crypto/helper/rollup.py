@@ -0,0 +1,147 @@
+from collections import OrderedDict
+from helper.kline_store import KlineStore, KLINE_DTYPE, get_store
+from helper.planner import interval_to_ms
+import numpy as np
+import threading
+import logging
+import shutil
+import os
+
+ROLLUP_INTERVALS = ('5m', '15m', '1h', '4h', '1d')
+ROLLUP_FOLDER = '_rollup'
+
+def aggregate(records: np.ndarray, interval: str) -> np.ndarray:
+    """
+    Menggabungkan klines 1m yang sudah urut menjadi candle interval lebih besar.
+
+    Args:
+        records (np.ndarray): KLINE_DTYPE urut open_time
+        interval (str): Interval tujuan, contoh '1h'
+
+    Returns:
+        np.ndarray: KLINE_DTYPE dengan open_time = awal bucket
+    """
+    if len(records) == 0:
+        return np.empty(0, dtype=KLINE_DTYPE)
+    step = interval_to_ms(interval)
+    buckets = records['open_time'] // step * step
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(records)] - 1
+
+    result = np.empty(len(starts), dtype=KLINE_DTYPE)
+    result['open_time'] = buckets[starts]
+    result['close_time'] = buckets[starts] + step - 1
+    result['open'] = records['open'][starts]
+    result['close'] = records['close'][ends]
+    result['high'] = np.maximum.reduceat(records['high'], starts)
+    result['low'] = np.minimum.reduceat(records['low'], starts)
+    for name in ('volume', 'quote_asset_volume', 'num_trades', 'taker_buy_base_volume', 'taker_buy_quote_volume'):
+        result[name] = np.add.reduceat(records[name], starts)
+    return result
+
+def merge_tail(previous: np.ndarray, current: np.ndarray) -> np.ndarray:
+    """Menggabungkan bucket lama ( sebelum data baru ) dengan bucket baru yang open_time-nya sama."""
+    merged = current.copy()
+    merged['open'] = previous['open']
+    merged['high'] = np.maximum(previous['high'], current['high'])
+    merged['low'] = np.minimum(previous['low'], current['low'])
+    for name in ('volume', 'quote_asset_volume', 'num_trades', 'taker_buy_base_volume', 'taker_buy_quote_volume'):
+        merged[name] = previous[name] + current[name]
+    return merged
+
+class RollupStore:
+    """
+    Candle 5m/15m/1h/4h/1d yang diperbarui incremental setiap ada batch 1m baru di KlineStore,
+    disimpan di {dir}/_rollup/{interval}/ dengan format yang sama, plus cache LRU di memory.
+
+    Args:
+        dir (str): Folder KlineStore 1m
+        intervals (tuple): Interval rollup yang dikelola
+        cache_size (int): Jumlah pasangan (symbol, interval) yang disimpan di cache
+        attach (bool): Daftarkan sebagai listener KlineStore supaya update otomatis
+    """
+    def __init__(self, dir: str = 'log/data/raw', intervals: tuple = ROLLUP_INTERVALS, cache_size: int = 64, attach: bool = True):
+        self.base = get_store(dir)
+        self.intervals = intervals
+        self.stores = {interval: KlineStore(os.path.join(dir, ROLLUP_FOLDER, interval)) for interval in intervals}
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+        if attach and self.update not in self.base.listeners:
+            self.base.listeners.append(self.update)
+
+    def _invalidate(self, symbol: str):
+        with self.lock:
+            for interval in self.intervals:
+                self.cache.pop((symbol, interval), None)
+
+    def update(self, symbol: str, fresh: np.ndarray, late: np.ndarray):
+        """
+        Listener KlineStore. Row baru setelah max open_time cukup digabung dengan bucket terakhir;
+        row lama ( repair gap ) menghitung ulang bucket yang terkena dari data 1m.
+        """
+        for interval, store in self.stores.items():
+            if not store.index(symbol)['rows'] and self.base.index(symbol)['rows'] > len(fresh) + len(late):
+                self.rebuild(symbol) # rollup baru diaktifkan, history lama belum pernah di-rollup
+                return
+            if len(fresh):
+                rolled = aggregate(fresh, interval)
+                tail = store.tail(symbol)
+                if len(tail) and tail['open_time'][0] == rolled['open_time'][0]:
+                    rolled[:1] = merge_tail(tail, rolled[:1])
+                store.upsert(symbol, rolled)
+            if len(late):
+                step = interval_to_ms(interval)
+                buckets = np.unique(late['open_time'] // step * step)
+                minutes = self.base.read(symbol, int(buckets[0]), int(buckets[-1]) + step - 1)
+                rolled = aggregate(minutes, interval)
+                store.upsert(symbol, rolled[np.isin(rolled['open_time'], buckets)])
+        self._invalidate(symbol)
+
+    def rebuild(self, symbol: str):
+        """Membangun ulang semua rollup satu symbol dari seluruh data 1m."""
+        minutes = self.base.read(symbol)
+        for interval, store in self.stores.items():
+            shutil.rmtree(os.path.join(store.root, symbol), ignore_errors=True)
+            store.indexes.pop(symbol, None)
+            store.upsert(symbol, aggregate(minutes, interval))
+        self._invalidate(symbol)
+        logging.info(f"[🧱][{symbol}] Rollup {', '.join(self.intervals)} selesai dibangun")
+
+    def read(self, symbol: str, interval: str, start_time: int = None, end_time: int = None) -> np.ndarray:
+        """
+        Membaca candle rollup, pasangan (symbol, interval) yang sering dipakai disimpan di cache LRU.
+
+        Returns:
+            np.ndarray: KLINE_DTYPE urut open_time
+        """
+        key = (symbol, interval)
+        with self.lock:
+            records = self.cache.get(key)
+            if records is not None:
+                self.cache.move_to_end(key)
+        if records is None:
+            records = self.stores[interval].read(symbol)
+            with self.lock:
+                self.cache[key] = records
+                if len(self.cache) > self.cache_size:
+                    self.cache.popitem(last=False)
+        start = 0 if start_time is None else np.searchsorted(records['open_time'], start_time, side='left')
+        end = len(records) if end_time is None else np.searchsorted(records['open_time'], end_time, side='right')
+        return records[start:end]
+
+_rollups = {}
+
+def enable_rollups(dir: str = 'log/data/raw') -> RollupStore:
+    """
+    Pasang RollupStore ke KlineStore folder dir ( sekali per folder, sama seperti get_store ),
+    sehingga 5m..1d ikut diperbarui setiap batch 1m masuk. Aman dipanggil berulang.
+    """
+    if dir not in _rollups:
+        _rollups[dir] = RollupStore(dir)
+    return _rollups[dir]
+
+if __name__ == '__main__':
+    rollups = RollupStore('log/data/raw', attach=False)
+    for symbol in rollups.base.symbols():
+        rollups.rebuild(symbol)
@@ -0,0 +1,163 @@
+from service.decoder import MiniTickerEvent
+import pandas as pd
+import logging
+import heapq
+import os
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+
+class TopIndex:
+    """
+    Max-heap ber-index: posisi setiap symbol di heap disimpan, sehingga update nilai
+    symbol yang sudah ada cukup sift naik/turun O(log n) tanpa membangun ulang heap.
+    top(k) membaca k terbesar dalam O(k log k) tanpa mengubah heap.
+    """
+    __slots__ = ('heap', 'values', 'position')
+
+    def __init__(self):
+        self.heap = []
+        self.values = {}
+        self.position = {}
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def _swap(self, a: int, b: int):
+        heap = self.heap
+        heap[a], heap[b] = heap[b], heap[a]
+        self.position[heap[a]] = a
+        self.position[heap[b]] = b
+
+    def _sift_up(self, index: int):
+        values, heap = self.values, self.heap
+        while index:
+            parent = (index - 1) >> 1
+            if values[heap[index]] <= values[heap[parent]]:
+                break
+            self._swap(index, parent)
+            index = parent
+
+    def _sift_down(self, index: int):
+        values, heap, size = self.values, self.heap, len(self.heap)
+        while True:
+            largest, left = index, 2 * index + 1
+            if left < size and values[heap[left]] > values[heap[largest]]:
+                largest = left
+            if left + 1 < size and values[heap[left + 1]] > values[heap[largest]]:
+                largest = left + 1
+            if largest == index:
+                return
+            self._swap(index, largest)
+            index = largest
+
+    def update(self, symbol: str, value: float):
+        if symbol in self.position:
+            previous = self.values[symbol]
+            self.values[symbol] = value
+            if value > previous:
+                self._sift_up(self.position[symbol])
+            elif value < previous:
+                self._sift_down(self.position[symbol])
+            return
+        self.values[symbol] = value
+        self.position[symbol] = len(self.heap)
+        self.heap.append(symbol)
+        self._sift_up(len(self.heap) - 1)
+
+    def remove(self, symbol: str):
+        index = self.position.pop(symbol, None)
+        if index is None:
+            return
+        last = self.heap.pop()
+        if index < len(self.heap):
+            self.heap[index] = last
+            self.position[last] = index
+            self._sift_up(index)
+            self._sift_down(self.position[last])
+        del self.values[symbol]
+
+    def top(self, k: int) -> list:
+        """k symbol dengan nilai terbesar, list (symbol, nilai) urut menurun."""
+        heap, values, result = self.heap, self.values, []
+        candidates = [(-values[heap[0]], 0)] if heap else []
+        while candidates and len(result) < k:
+            value, index = heapq.heappop(candidates)
+            result.append((heap[index], -value))
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(heap):
+                    heapq.heappush(candidates, (-values[heap[child]], child))
+        return result
+
+class MarketScreener:
+    """
+    Screener top movers dari stream all-market mini ticker ( !miniTicker@arr ).
+
+    Setiap event memperbarui tiga index ( O(log n) per symbol ):
+        gainers     perubahan harga 24 jam dalam persen
+        volume      quote volume 24 jam
+        volatility  range high-low 24 jam terhadap harga open, dalam persen
+
+    Args:
+        quote_asset (str): Hanya symbol dengan akhiran ini, contoh 'USDT' ( kosong = semua )
+        symbols (list): Batasi ke daftar symbol tertentu, opsional
+    """
+    METRICS = ('gainers', 'volume', 'volatility')
+
+    def __init__(self, quote_asset: str = 'USDT', symbols: list = None):
+        self.quote_asset = quote_asset
+        self.symbols = set(symbols) if symbols else None
+        self.indexes = {metric: TopIndex() for metric in self.METRICS}
+        self.tickers = {}
+
+    def update(self, event: MiniTickerEvent):
+        symbol = event.symbol
+        if self.quote_asset and not symbol.endswith(self.quote_asset):
+            return
+        if self.symbols is not None and symbol not in self.symbols:
+            return
+        if event.close == 0 or event.volume == 0 or event.open == 0: # coin tidak aktif di market
+            if symbol in self.tickers:
+                del self.tickers[symbol]
+                for index in self.indexes.values():
+                    index.remove(symbol)
+            return
+        self.tickers[symbol] = event
+        self.indexes['gainers'].update(symbol, (event.close - event.open) / event.open * 100)
+        self.indexes['volume'].update(symbol, event.quote_volume)
+        self.indexes['volatility'].update(symbol, (event.high - event.low) / event.open * 100)
+
+    async def on_batch(self, events: list):
+        for event in events:
+            if isinstance(event, MiniTickerEvent):
+                self.update(event)
+
+    def top(self, metric: str = 'gainers', k: int = 20) -> list:
+        """
+        Kandidat teratas untuk satu metric.
+
+        Returns:
+            list: dict symbol, value ( nilai metric ), lastPrice, volume, quoteVolume
+        """
+        rows = []
+        for symbol, value in self.indexes[metric].top(k):
+            ticker = self.tickers[symbol]
+            rows.append({
+                "symbol": symbol,
+                "value": value,
+                "lastPrice": ticker.close,
+                "volume": ticker.volume,
+                "quoteVolume": ticker.quote_volume,
+            })
+        return rows
+
+    def write(self, dir: str, filename: str, k: int = 20):
+        """Menulis top gainers dengan format yang sama seperti write_coin_potential."""
+        rows = self.top('gainers', k)
+        if not rows:
+            return
+        df = pd.DataFrame(rows).rename(columns={"value": "priceChangePercent"})
+        path = f"{dir}/{filename}.csv"
+        df[['symbol', 'priceChangePercent', 'lastPrice', 'volume']].to_csv(path + '.tmp', index=False)
+        os.replace(path + '.tmp', path)
@@ -0,0 +1,86 @@
+from pathlib import Path
+from helper.helper import load_binance_config
+import threading
+import base64
+import time
+import os
+
+class Signer:
+    """
+    Signing context yang dipakai bersama oleh client REST dan websocket.
+
+    Config dan private key Ed25519 hanya dimuat sekali, lalu dimuat ulang otomatis
+    jika mtime config.ini atau file PEM berubah ( dicek paling sering tiap check_interval detik ).
+
+    Args:
+        config_folder (str): Folder yang berisikan file config.ini
+        config_file (str): Nama file config
+        check_interval (float): Jeda minimal antar pengecekan mtime dalam detik
+    """
+    def __init__(self, config_folder: str = 'configuration', config_file: str = 'config.ini', check_interval: float = 1.0):
+        self.config_folder = config_folder
+        self.config_file = config_file
+        self.config_path = (Path().absolute() / config_folder / config_file).resolve()
+        self.check_interval = check_interval
+        self.lock = threading.Lock()
+        self._configs = None
+        self._mtimes = None
+        self._checked = 0.0
+
+    def _current_mtimes(self) -> tuple:
+        key_path = self._configs['private_key_path'] if self._configs else None
+        return (
+            os.stat(self.config_path).st_mtime_ns,
+            os.stat(key_path).st_mtime_ns if key_path and os.path.exists(key_path) else None
+        )
+
+    @property
+    def configs(self) -> dict:
+        now = time.monotonic()
+        if self._configs is not None and now - self._checked < self.check_interval:
+            return self._configs
+        with self.lock:
+            self._checked = now
+            if self._configs is None or self._current_mtimes() != self._mtimes:
+                self._configs = load_binance_config(config_folder=self.config_folder, config_file=self.config_file)
+                self._mtimes = self._current_mtimes()
+        return self._configs
+
+    @property
+    def api_key(self) -> str:
+        return self.configs['api_key']
+
+    @staticmethod
+    def payload(params: dict) -> str:
+        """Query string dengan urutan parameter sesuai abjad, sama seperti yang dikirim ke Binance."""
+        return '&'.join([f'{param}={value}' for param, value in sorted(params.items())])
+
+    def sign(self, payload: str) -> str:
+        signature = base64.b64encode(self.configs['private_key'].sign(payload.encode('ASCII')))
+        return signature.decode('ASCII')
+
+    def signed_params(self, params: dict) -> dict:
+        """
+        Menambahkan timestamp dan signature pada params.
+
+        Args:
+            params (dict): Parameter request, signature lama ( jika ada ) diabaikan
+
+        Returns:
+            dict: Params baru berisi timestamp dan signature
+        """
+        params = {key: value for key, value in params.items() if key != 'signature'}
+        params['timestamp'] = int(time.time() * 1000)
+        params['signature'] = self.sign(self.payload(params))
+        return params
+
+_signers = {}
+_signers_lock = threading.Lock()
+
+def get_signer(config_folder: str = 'configuration', config_file: str = 'config.ini') -> Signer:
+    """Signer per process, satu instance untuk setiap folder config."""
+    key = (config_folder, config_file)
+    with _signers_lock:
+        if key not in _signers:
+            _signers[key] = Signer(config_folder=config_folder, config_file=config_file)
+        return _signers[key]
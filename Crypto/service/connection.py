@@ -7,10 +7,14 @@ import os
 import json
 import asyncio
 import time
+from urllib.parse import quote
 from rich import print_json
 from dotenv import load_dotenv
-from helper.helper import load_binance_config
-import requests
+from helper.signer import get_signer
+from service.decoder import TimedDecoder, SampledLogger
+from service.http_client import get_client, IPBanned
+from service.recorder import get_recorder
+from service.metrics import get_registry
 load_dotenv()
 logging.basicConfig(
     level=logging.INFO,
@@ -27,7 +31,8 @@ class BinanceConnectionApi:
                 max_reconnect_attempts: int = int(os.environ.get('RECONNECT_MAX_ATTEMPTS',5)),
                 interval: int = int(os.environ.get('INTERVAL',5)),
                 folder_config: str = 'configuration',
-                sub_url: str = ''
+                sub_url: str = '',
+                signed: bool = False
             ):
         self.reconnect_count = reconnect_count
         self.url = url
@@ -36,20 +41,33 @@ class BinanceConnectionApi:
         self.folder_config = folder_config
         self.reconnect_delay = reconnect_delay
         self.sub_url = sub_url
+        self.signed = signed
         self.max_reconnect_attempts = max_reconnect_attempts
         self.logger = logging.getLogger("REQUEST")
-        self.session = requests.Session()
+        self.client = get_client(url) # pool koneksi dipakai bersama semua instance dengan url yang sama
+        self.errors = get_registry().counter('binance_api_errors_total', 'Request REST yang gagal setelah retry', ('endpoint',)).labels(endpoint=sub_url)
 
-    async def get(self):
+    async def get(self, payload: dict = None):
+        payload = payload if payload is not None else self.payload
         try:
-            if self.payload:
-                params = '&'.join([f'{param}={value}' for param, value in sorted(self.payload.items())])
-                response = self.session.get(self.url + self.sub_url, params=params)
+            headers = None
+            if self.signed: # endpoint USER_DATA, signature ditaruh di akhir query
+                signer = get_signer(config_folder=self.folder_config)
+                params = signer.payload(dict(payload or {}, timestamp=int(time.time() * 1000)))
+                params = f"{params}&signature={quote(signer.sign(params), safe='')}"
+                headers = {'X-MBX-APIKEY': signer.api_key}
+            elif payload:
+                params = '&'.join([f'{param}={value}' for param, value in sorted(payload.items())])
             else:
-                response = self.session.get(self.url + self.sub_url)
-            return response.json()
+                params = None
+            return await self.client.get(self.sub_url, params, headers=headers)
+        except IPBanned:
+            self.errors.inc()
+            raise # caller harus berhenti menunggu ban, bukan menganggap response kosong
         except Exception as e:
+            self.errors.inc()
             self.logger.error(f"Error occurred: {e}")
+
 class BinanceConnectionSocket:
     def __init__(
                     self,
@@ -63,7 +81,9 @@ class BinanceConnectionSocket:
                     interval: int = int(os.environ.get('INTERVAL',5)),
                     folder_config: str = 'configuration',
                     use_log: bool = True,
-                    disable_loop: bool = False
+                    disable_loop: bool = False,
+                    decoder: str = os.environ.get('WS_DECODER') or None,
+                    log_interval: float = float(os.environ.get('WS_LOG_INTERVAL', 5))
                 ):
         self.reconnect_count = reconnect_count
         self.url = url
@@ -77,6 +97,10 @@ class BinanceConnectionSocket:
         self.reconnect_delay = reconnect_delay
         self.max_reconnect_attempts = max_reconnect_attempts
         self.logger = logging.getLogger("REQUEST")
+        self.decode = TimedDecoder(decoder, component=type(self).__name__) # orjson/msgspec jika ada, fallback json
+        self.reconnects = get_registry().counter('binance_ws_reconnects_total', 'Koneksi websocket yang putus / gagal', ('component',)).labels(component=type(self).__name__)
+        self.recorder = get_recorder() # aktif jika RECORD_PATH di-set
+        self.sampled_log = SampledLogger(lambda data: print_json(data=data), interval=log_interval)
 
     async def generate_signature_ed(self, secret_key: str, payload: str):
         signature = base64.b64encode(secret_key.sign(payload.encode('ASCII')))
@@ -136,24 +160,13 @@ class BinanceConnectionSocket:
         return False
 
     async def refresh_signature(self):
-        current_timestamp = int(time.time() * 1000)
-        
-        configs = load_binance_config(config_folder=self.folder_config)
-        params = {
-            "apiKey" : configs['api_key'],
-            "timestamp" : current_timestamp
-        }
-        params_signature = await self.generate_payload(params)
-        signature = await self.generate_signature_ed(
-            configs['private_key'],
-            payload=params_signature
-        )
-        self.payload['params'].update({
-            'timestamp': current_timestamp,
-            'signature': signature
-        })
+        # signer di-cache per process, config & private key tidak dibaca ulang selama file tidak berubah
+        signer = get_signer(config_folder=self.folder_config)
+        params = dict(self.payload['params'], apiKey=signer.api_key)
+        self.payload['params'].update(signer.signed_params(params))
 
     async def handle_reconnect_error(self, error):
+        self.reconnects.inc()
         await self.on_error(error)
         self.reconnect_count += 1
         if self.reconnect_count < self.max_reconnect_attempts:
@@ -192,13 +205,16 @@ class BinanceConnectionSocket:
 
                     try:
                         async for message in ws:
-                            response_data = json.loads(message)
+                            if self.recorder:
+                                self.recorder.frame(self.url, message)
+                            response_data = self.decode(message)
                             if self.use_log:
-                                print_json(data=response_data)
+                                self.sampled_log.log(response_data)
                             if self.on_data:
                                 self.on_data(response_data, self.extra_data)
                             if self.disable_loop:
                                 return True
+                        self.reconnects.inc() # ditutup normal oleh server, tetap dihitung sebagai reconnect
                     finally:
                         refresh_task.cancel()
 
@@ -211,7 +227,7 @@ class BinanceConnectionSocket:
                 success = await self.call_request()
                 if not success:
                     self.reconnect_delay = min(self.reconnect_delay * 2, 60)
-                    await self.logger.info("Waiting before next attempt...")
+                    self.logger.info("Waiting before next attempt...")
                     await asyncio.sleep(self.reconnect_delay)
                 else:
                     break
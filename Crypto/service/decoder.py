@@ -0,0 +1,178 @@
+import json
+import time
+from typing import NamedTuple
+from service.metrics import get_registry, MICRO_BUCKETS
+
+def _stdlib_decoder():
+    return json.loads
+
+def _orjson_decoder():
+    import orjson
+    return orjson.loads
+
+def _msgspec_decoder():
+    import msgspec
+    return msgspec.json.Decoder().decode
+
+DECODERS = {
+    'orjson': _orjson_decoder,
+    'msgspec': _msgspec_decoder,
+    'json': _stdlib_decoder,
+}
+
+def get_decoder(name: str = None):
+    """
+    Memilih fungsi decode JSON.
+
+    Args:
+        name (str): 'orjson', 'msgspec' atau 'json'. Jika kosong dipilih yang tercepat yang terinstall
+
+    Returns:
+        callable: Fungsi decode bytes/str -> object
+    """
+    if name:
+        return DECODERS[name]()
+    for candidate in ('orjson', 'msgspec'):
+        try:
+            return DECODERS[candidate]()
+        except ImportError:
+            continue
+    return _stdlib_decoder()
+
+loads = get_decoder()
+
+class KlineEvent(NamedTuple):
+    # urutan field setelah symbol & closed sama dengan KLINE_DTYPE, sehingga event[2:] bisa langsung disimpan
+    symbol: str
+    closed: bool
+    open_time: int
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    close_time: int
+    quote_asset_volume: float
+    num_trades: int
+    taker_buy_base_volume: float
+    taker_buy_quote_volume: float
+
+class TradeEvent(NamedTuple):
+    symbol: str
+    trade_id: int
+    price: float
+    quantity: float
+    trade_time: int
+    buyer_maker: bool
+
+class MiniTickerEvent(NamedTuple):
+    # statistik rolling 24 jam dari stream !miniTicker@arr
+    symbol: str
+    event_time: int
+    close: float
+    open: float
+    high: float
+    low: float
+    volume: float
+    quote_volume: float
+
+class DepthEvent(NamedTuple):
+    # diff depth, bids/asks tetap [price, quantity] string dari Binance, diparse oleh OrderBook
+    symbol: str
+    first_update_id: int
+    final_update_id: int
+    bids: list
+    asks: list
+
+def to_event(data: dict):
+    """
+    Convert payload event market stream menjadi record typed yang ringkas.
+    Event selain kline/trade/mini ticker/depth dikembalikan apa adanya.
+    """
+    kind = data.get('e')
+    if kind == 'kline':
+        k = data['k']
+        return KlineEvent(
+            data['s'], k['x'], k['t'],
+            float(k['o']), float(k['h']), float(k['l']), float(k['c']), float(k['v']),
+            k['T'], float(k['q']), k['n'], float(k['V']), float(k['Q'])
+        )
+    if kind == 'trade':
+        return TradeEvent(data['s'], data['t'], float(data['p']), float(data['q']), data['T'], data['m'])
+    if kind == 'depthUpdate':
+        return DepthEvent(data['s'], data['U'], data['u'], data['b'], data['a'])
+    if kind == '24hrMiniTicker':
+        return MiniTickerEvent(
+            data['s'], data['E'], float(data['c']), float(data['o']),
+            float(data['h']), float(data['l']), float(data['v']), float(data['q'])
+        )
+    return data
+
+class DecodeStats:
+    """Akumulasi jumlah pesan dan waktu decode, untuk mengukur overhead per pesan."""
+    __slots__ = ('count', 'total_ns', 'max_ns')
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def add(self, elapsed_ns: int):
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_us": round(self.total_ns / self.count / 1000, 3) if self.count else 0.0,
+            "max_us": round(self.max_ns / 1000, 3)
+        }
+
+class TimedDecoder:
+    """
+    Membungkus fungsi decode dan mencatat waktu decode setiap pesan ke DecodeStats,
+    serta jumlah pesan dan histogram waktu decode di registry metrics per component.
+    """
+    def __init__(self, name: str = None, component: str = 'websocket'):
+        self.decode = get_decoder(name)
+        self.stats = DecodeStats()
+        registry = get_registry()
+        self.messages = registry.counter('binance_ws_messages_total', 'Pesan websocket yang diterima', ('component',)).labels(component=component)
+        self.decode_time = registry.histogram('binance_ws_decode_seconds', 'Waktu decode JSON per pesan', ('component',), MICRO_BUCKETS).labels(component=component)
+
+    def __call__(self, message):
+        started = time.perf_counter_ns()
+        data = self.decode(message)
+        elapsed = time.perf_counter_ns() - started
+        self.stats.add(elapsed)
+        self.messages.inc()
+        self.decode_time.observe(elapsed / 1e9)
+        return data
+
+class SampledLogger:
+    """
+    Logger yang hanya menampilkan satu pesan per interval, sisanya dihitung saja.
+
+    Args:
+        emit (callable): Fungsi output, contoh rich.print_json
+        interval (float): Jeda minimal antar output dalam detik ( 0 = tampilkan semua )
+    """
+    def __init__(self, emit, interval: float = 5.0):
+        self.emit = emit
+        self.interval = interval
+        self.last = 0.0
+        self.suppressed = 0
+
+    def log(self, data):
+        now = time.monotonic()
+        if now - self.last < self.interval:
+            self.suppressed += 1
+            return
+        self.last = now
+        if self.suppressed:
+            self.emit({"suppressed": self.suppressed, "data": data})
+            self.suppressed = 0
+        else:
+            self.emit(data)
@@ -0,0 +1,160 @@
+import httpx
+import asyncio
+import logging
+import random
+import time
+import os
+from service.limiter import get_limiter
+from service.recorder import get_recorder
+from service.metrics import get_registry
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+BANNED_STATUS = 418 # IP diblokir sementara, retry hanya memperpanjang ban
+logging.getLogger("httpx").setLevel(logging.WARNING) # httpx log setiap request di level INFO
+
+class IPBanned(Exception):
+    """Binance memblokir IP ( HTTP 418 ), retry_after dalam detik."""
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+def _http2_available() -> bool:
+    try:
+        import h2 # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+class BinanceHttpClient:
+    """
+    Client REST async dengan connection pool keep-alive yang dipakai bersama.
+
+    - HTTP/2 otomatis aktif jika package h2 terinstall
+    - Retry dengan backoff + jitter untuk 429/5xx ( menghormati header Retry-After )
+    - 418 ( IP ban ) tidak diulang: WeightLimiter di-pause selama Retry-After lalu IPBanned dilempar
+    - Pool ditutup eksplisit lewat close() / close_clients() di akhir entry point
+    - Header X-MBX-USED-WEIGHT-1M disinkronkan ke WeightLimiter bersama
+
+    Args:
+        base_url (str): URL API Binance
+        timeout (float): Timeout request dalam detik
+        max_connections (int): Jumlah socket maksimal di pool
+        retries (int): Jumlah percobaan ulang
+        backoff (float): Jeda dasar backoff dalam detik
+    """
+    def __init__(
+                self,
+                base_url: str = os.environ.get('URL_API', ''),
+                timeout: float = float(os.environ.get('HTTP_TIMEOUT', 10)),
+                max_connections: int = int(os.environ.get('HTTP_MAX_CONNECTIONS', 10)),
+                retries: int = int(os.environ.get('HTTP_RETRIES', 5)),
+                backoff: float = 0.5
+            ):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.retries = retries
+        self.backoff = backoff
+        self.used_weight = 0
+        self.limiter = get_limiter()
+        self.recorder = get_recorder()
+        registry = get_registry()
+        self.latency = registry.histogram('binance_http_request_seconds', 'Latency request REST per endpoint', ('endpoint',))
+        self.responses = registry.counter('binance_http_responses_total', 'Response REST per endpoint dan status', ('endpoint', 'status'))
+        self.retry_count = registry.counter('binance_http_retries_total', 'Request REST yang diulang', ('endpoint',))
+        self.weight_gauge = registry.gauge('binance_used_weight_1m', 'X-MBX-USED-WEIGHT-1M terakhir').labels()
+        self.logger = logging.getLogger("REQUEST")
+        self._client = None
+        self._loop = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # AsyncClient terikat ke event loop, buat ulang jika dipanggil dari loop lain ( asyncio.run baru )
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            if self._client is not None and not self._client.is_closed:
+                self.logger.warning("AsyncClient dari event loop sebelumnya belum ditutup ( panggil close_clients() )")
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                http2=_http2_available(),
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections)
+            )
+            self._loop = loop
+        return self._client
+
+    def _track_weight(self, response: httpx.Response):
+        used = response.headers.get('x-mbx-used-weight-1m')
+        if used is not None:
+            self.used_weight = int(used)
+            self.weight_gauge.set(self.used_weight)
+            self.limiter.sync(self.used_weight)
+
+    def _retry_delay(self, attempt: int, response: httpx.Response = None) -> float:
+        retry_after = response.headers.get('retry-after') if response is not None else None
+        if retry_after:
+            return float(retry_after)
+        return self.backoff * 2 ** attempt * random.uniform(0.5, 1.5)
+
+    async def get(self, path: str, query: str = None, headers: dict = None):
+        """
+        GET ke Binance dan kembalikan hasil JSON.
+
+        Args:
+            path (str): Sub url, contoh '/klines'
+            query (str): Query string yang sudah jadi ( urutan parameter dipertahankan untuk signature )
+            headers (dict): Header tambahan, contoh X-MBX-APIKEY
+
+        Returns:
+            dict | list: Response JSON Binance
+        """
+        url = f"{path}?{query}" if query else path
+        latency = self.latency.labels(endpoint=path)
+        for attempt in range(self.retries + 1):
+            started = time.perf_counter()
+            try:
+                response = await self.client.get(url, headers=headers)
+            except httpx.TransportError as e:
+                self.responses.labels(endpoint=path, status='error').inc()
+                if attempt == self.retries:
+                    raise
+                self.retry_count.labels(endpoint=path).inc()
+                delay = self._retry_delay(attempt)
+                self.logger.warning(f"[{path}] {e}, retry dalam {delay:.2f} detik")
+                await asyncio.sleep(delay)
+                continue
+
+            latency.observe(time.perf_counter() - started)
+            self.responses.labels(endpoint=path, status=response.status_code).inc()
+            self._track_weight(response)
+            if self.recorder:
+                self.recorder.response(response.request.url.raw_path.decode(), response.status_code, response.content)
+            if response.status_code == BANNED_STATUS:
+                retry_after = self._retry_delay(self.retries, response)
+                self.limiter.pause(retry_after) # semua request lain ikut menunggu sampai ban selesai
+                raise IPBanned(f"[{path}] IP diblokir Binance ( HTTP 418 ), retry setelah {retry_after:.0f} detik", retry_after)
+            if response.status_code in RETRY_STATUS and attempt < self.retries:
+                self.retry_count.labels(endpoint=path).inc()
+                delay = self._retry_delay(attempt, response)
+                self.logger.warning(f"[{path}] HTTP {response.status_code}, retry dalam {delay:.2f} detik")
+                await asyncio.sleep(delay)
+                continue
+            return response.json()
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+_clients = {}
+
+def get_client(base_url: str = os.environ.get('URL_API', '')) -> BinanceHttpClient:
+    """Client per base url yang dipakai bersama semua BinanceConnectionApi dalam satu process."""
+    if base_url not in _clients:
+        _clients[base_url] = BinanceHttpClient(base_url=base_url)
+    return _clients[base_url]
+
+async def close_clients():
+    """Menutup pool semua client, dipanggil di finally entry point sebelum event loop selesai."""
+    for client in _clients.values():
+        await client.close()
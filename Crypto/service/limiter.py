@@ -0,0 +1,72 @@
+import asyncio
+import os
+import time
+from service.metrics import get_registry
+
+class WeightLimiter:
+    """
+    Token bucket berbasis request weight Binance, dipakai bersama oleh semua worker.
+
+    Args:
+        weight_limit (int): Budget weight per window ( default REQUEST_WEIGHT_LIMIT / 6000 per menit )
+        window (float): Panjang window budget dalam detik
+        safety (float): Porsi budget yang boleh dipakai, sisanya cadangan untuk proses lain
+    """
+    def __init__(
+                self,
+                weight_limit: int = int(os.environ.get('REQUEST_WEIGHT_LIMIT', 6000)),
+                window: float = float(os.environ.get('REQUEST_WEIGHT_WINDOW', 60)),
+                safety: float = 0.9
+            ):
+        self.capacity = weight_limit * safety
+        self.rate = self.capacity / window
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0 # monotonic, diisi pause() saat Binance minta berhenti ( Retry-After )
+        self.lock = asyncio.Lock()
+        self.wait_time = get_registry().histogram('binance_limiter_wait_seconds', 'Waktu tunggu budget weight').labels()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, weight: int = 1):
+        """
+        Menunggu sampai budget cukup lalu memotong token sebesar weight request.
+        Lock ditahan selama menunggu supaya antrian tetap FIFO.
+        """
+        started = time.monotonic()
+        async with self.lock:
+            while True:
+                if self.paused_until > time.monotonic():
+                    await asyncio.sleep(self.paused_until - time.monotonic())
+                    continue
+                self._refill()
+                if self.tokens >= weight:
+                    self.tokens -= weight
+                    self.wait_time.observe(time.monotonic() - started)
+                    return
+                await asyncio.sleep((weight - self.tokens) / self.rate)
+
+    def sync(self, used_weight: int):
+        """
+        Menyamakan budget dengan header X-MBX-USED-WEIGHT-1M dari Binance, sehingga
+        pemakaian proses lain dengan IP yang sama ikut diperhitungkan.
+        """
+        self._refill()
+        self.tokens = min(self.tokens, self.capacity - used_weight)
+
+    def pause(self, seconds: float):
+        """Tahan semua request sampai seconds detik lagi ( header Retry-After 418 / 429 )."""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        self.tokens = 0
+
+_limiter = None
+
+def get_limiter() -> WeightLimiter:
+    """Limiter bersama untuk satu process."""
+    global _limiter
+    if _limiter is None:
+        _limiter = WeightLimiter()
+    return _limiter
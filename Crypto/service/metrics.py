@@ -0,0 +1,195 @@
+from bisect import bisect_left
+import asyncio
+import logging
+import json
+import os
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+MICRO_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3)
+
+class Counter:
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+class Gauge:
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float):
+        self.value = value
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.value -= amount
+
+class Histogram:
+    """
+    Histogram bucket tetap. observe hanya bisect + beberapa penjumlahan, tanpa lock
+    ( semua dipanggil dari satu event loop ), sehingga aman dipakai per pesan websocket.
+    """
+    __slots__ = ('bounds', 'counts', 'count', 'sum', 'max')
+
+    def __init__(self, bounds: tuple = DEFAULT_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Perkiraan quantile dari batas atas bucket ( tidak lebih dari nilai max )."""
+        if not self.count:
+            return 0.0
+        rank, seen = q * self.count, 0
+        for position, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(self.bounds[position], self.max) if position < len(self.bounds) else self.max
+        return self.max
+
+    def summary(self, scale: float = 1.0) -> dict:
+        """Ringkasan count, mean, p50, p99, max. scale=1000 untuk detik -> ms."""
+        return {
+            "count": self.count,
+            "mean": round(self.sum / self.count * scale, 6) if self.count else 0.0,
+            "p50": round(self.quantile(0.5) * scale, 6),
+            "p99": round(self.quantile(0.99) * scale, 6),
+            "max": round(self.max * scale, 6),
+        }
+
+KINDS = {'counter': Counter, 'gauge': Gauge, 'histogram': Histogram}
+
+class MetricFamily:
+    """Satu nama metric dengan beberapa kombinasi label. Child dibuat sekali lalu di-cache."""
+    def __init__(self, name: str, help: str, kind: str, labelnames: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.kind = kind
+        self.labelnames = tuple(labelnames)
+        self.buckets = buckets
+        self.children = {}
+
+    def labels(self, **labels):
+        """Child untuk kombinasi label, simpan hasilnya di hot path supaya tidak dicari ulang."""
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        child = self.children.get(key)
+        if child is None:
+            child = Histogram(self.buckets) if self.kind == 'histogram' else KINDS[self.kind]()
+            self.children[key] = child
+        return child
+
+class MetricsRegistry:
+    """
+    Registry metric in-process dengan output Prometheus text atau JSON.
+
+    Contoh:
+        latency = get_registry().histogram('binance_http_request_seconds', 'Latency REST', ('endpoint',))
+        latency.labels(endpoint='/klines').observe(0.12)
+    """
+    def __init__(self):
+        self.families = {}
+
+    def _family(self, name: str, help: str, kind: str, labelnames: tuple, buckets: tuple = DEFAULT_BUCKETS) -> MetricFamily:
+        family = self.families.get(name)
+        if family is None:
+            family = self.families[name] = MetricFamily(name, help, kind, labelnames, buckets)
+        elif family.kind != kind or family.labelnames != tuple(labelnames):
+            raise ValueError(f"Metric {name} sudah terdaftar sebagai {family.kind} {family.labelnames}")
+        return family
+
+    def counter(self, name: str, help: str = '', labelnames: tuple = ()) -> MetricFamily:
+        return self._family(name, help, 'counter', labelnames)
+
+    def gauge(self, name: str, help: str = '', labelnames: tuple = ()) -> MetricFamily:
+        return self._family(name, help, 'gauge', labelnames)
+
+    def histogram(self, name: str, help: str = '', labelnames: tuple = (), buckets: tuple = DEFAULT_BUCKETS) -> MetricFamily:
+        return self._family(name, help, 'histogram', labelnames, buckets)
+
+    @staticmethod
+    def _label_text(family: MetricFamily, key: tuple, extra: str = '') -> str:
+        pairs = [f'{name}="{value}"' for name, value in zip(family.labelnames, key)]
+        if extra:
+            pairs.append(extra)
+        return '{' + ','.join(pairs) + '}' if pairs else ''
+
+    def to_prometheus(self) -> str:
+        lines = []
+        for family in self.families.values():
+            lines.append(f"# HELP {family.name} {family.help}")
+            lines.append(f"# TYPE {family.name} {family.kind}")
+            for key, child in list(family.children.items()):
+                if family.kind != 'histogram':
+                    lines.append(f"{family.name}{self._label_text(family, key)} {child.value}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(family.buckets, child.counts):
+                    cumulative += count
+                    labels = self._label_text(family, key, 'le="%s"' % bound)
+                    lines.append(f"{family.name}_bucket{labels} {cumulative}")
+                labels = self._label_text(family, key, 'le="+Inf"')
+                lines.append(f"{family.name}_bucket{labels} {child.count}")
+                lines.append(f"{family.name}_sum{self._label_text(family, key)} {child.sum}")
+                lines.append(f"{family.name}_count{self._label_text(family, key)} {child.count}")
+        return '\n'.join(lines) + '\n'
+
+    def to_json(self) -> dict:
+        result = {}
+        for family in self.families.values():
+            samples = []
+            for key, child in list(family.children.items()):
+                value = child.summary() if family.kind == 'histogram' else child.value
+                samples.append({"labels": dict(zip(family.labelnames, key)), "value": value})
+            result[family.name] = {"type": family.kind, "help": family.help, "samples": samples}
+        return result
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request_line = await reader.readline()
+            while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                pass
+            path = request_line.decode().split(' ')[1] if request_line else '/'
+            if path.startswith('/metrics.json'):
+                body, content_type = json.dumps(self.to_json()).encode(), 'application/json'
+            else:
+                body, content_type = self.to_prometheus().encode(), 'text/plain; version=0.0.4'
+            writer.write(
+                f"HTTP/1.1 200 OK\r\nContent-Type: {content_type}\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+        except (ConnectionError, IndexError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = '0.0.0.0', port: int = int(os.environ.get('METRICS_PORT', 9100))):
+        """Endpoint HTTP: /metrics ( Prometheus text ) dan /metrics.json."""
+        server = await asyncio.start_server(self.handle, host, port)
+        logging.info(f"[📊] Metrics tersedia di http://{host}:{port}/metrics")
+        async with server:
+            await server.serve_forever()
+
+_registry = None
+
+def get_registry() -> MetricsRegistry:
+    """Registry bersama untuk satu process."""
+    global _registry
+    if _registry is None:
+        _registry = MetricsRegistry()
+    return _registry
@@ -0,0 +1,187 @@
+from collections import defaultdict
+from urllib.parse import urlsplit
+from service.recorder import read_log, KIND_FRAME, KIND_RESPONSE
+import websockets
+import itertools
+import asyncio
+import logging
+import json
+import time
+import sys
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logging.getLogger("websockets").setLevel(logging.WARNING) # log setiap koneksi terlalu ramai saat uji reconnect
+
+SUBSCRIPTION_METHODS = {'SUBSCRIBE', 'UNSUBSCRIBE', 'LIST_SUBSCRIPTIONS', 'SET_PROPERTY', 'GET_PROPERTY'}
+HTTP_REASON = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 418: "I'm a teapot", 429: 'Too Many Requests', 500: 'Internal Server Error'}
+
+class MockExchange:
+    """
+    Exchange tiruan lokal yang memutar ulang rekaman Recorder lewat websocket dan HTTP.
+
+    Websocket: setiap koneksi menerima ulang frame event dari url dengan path yang sama
+    ( /stream, /ws-api/v3, ... ) sesuai jeda aslinya dibagi speed ( speed 0 = secepatnya ).
+    SUBSCRIBE dibalas ack, request websocket API lain dibalas response rekaman berikutnya
+    dengan id yang disesuaikan.
+
+    HTTP: request dicocokkan dengan path+query rekaman, jika tidak ada ( misal query berisi
+    timestamp / signature ) dipakai response berikutnya untuk path yang sama secara bergiliran.
+
+    Args:
+        log_path (str): File hasil Recorder
+        host (str): Host server
+        ws_port (int): Port websocket ( 0 = pilih otomatis )
+        http_port (int): Port HTTP ( 0 = pilih otomatis )
+        speed (float): Kelipatan kecepatan replay, 1 = real-time, 0 = tanpa jeda
+        loop (bool): Ulangi rekaman dari awal setelah habis
+        drop_after (int): Putus koneksi websocket setelah sekian frame, untuk menguji reconnect
+    """
+    def __init__(self, log_path: str, host: str = '127.0.0.1', ws_port: int = 0, http_port: int = 0, speed: float = 1.0, loop: bool = False, drop_after: int = 0):
+        self.host = host
+        self.ws_port = ws_port
+        self.http_port = http_port
+        self.speed = speed
+        self.loop = loop
+        self.drop_after = drop_after
+        self.events = defaultdict(list)     # path websocket -> [(time_ns, frame)]
+        self.ws_responses = defaultdict(list)
+        self.responses = {}                 # path+query -> (status, body)
+        self.routes = defaultdict(list)     # path -> [(status, body)]
+        for record in read_log(log_path):
+            if record.kind == KIND_FRAME:
+                path = urlsplit(record.key).path or '/'
+                data = json.loads(record.payload)
+                if isinstance(data, dict) and 'id' in data:
+                    self.ws_responses[path].append(data)
+                else:
+                    self.events[path].append((record.time_ns, record.payload))
+            elif record.kind == KIND_RESPONSE:
+                self.responses.setdefault(record.key, (record.status, record.payload))
+                self.routes[urlsplit(record.key).path].append((record.status, record.payload))
+        self.cursors = {path: itertools.cycle(items) for path, items in self.routes.items()}
+        self.ws_cursors = {path: itertools.cycle(items) for path, items in self.ws_responses.items()}
+        self.metrics = {"connections": 0, "frames": 0, "requests": 0, "drops": 0}
+        self.ws_server = None
+        self.http_server = None
+        self.http_clients = set()
+
+    @property
+    def ws_url(self) -> str:
+        return f"ws://{self.host}:{self.ws_port}"
+
+    @property
+    def http_url(self) -> str:
+        return f"http://{self.host}:{self.http_port}"
+
+    async def answer(self, ws, path: str):
+        async for message in ws:
+            request = json.loads(message)
+            if request.get('method') in SUBSCRIPTION_METHODS:
+                response = {"result": None, "id": request.get('id')}
+            elif path in self.ws_cursors:
+                response = dict(next(self.ws_cursors[path]), id=request.get('id'))
+            else:
+                response = {"id": request.get('id'), "status": 404, "error": {"code": -1, "msg": "Tidak ada di rekaman"}}
+            await ws.send(json.dumps(response))
+
+    async def ws_handler(self, ws):
+        path = urlsplit(ws.request.path).path
+        events = self.events.get(path) or [event for items in self.events.values() for event in items]
+        self.metrics["connections"] += 1
+        answer = asyncio.create_task(self.answer(ws, path))
+        sent = 0
+        try:
+            while True:
+                started, first = time.monotonic(), events[0][0] if events else 0
+                for time_ns, frame in events:
+                    if self.speed:
+                        delay = (time_ns - first) / 1e9 / self.speed - (time.monotonic() - started)
+                        if delay > 0:
+                            await asyncio.sleep(delay)
+                    await ws.send(frame.decode())
+                    sent += 1
+                    self.metrics["frames"] += 1
+                    if self.drop_after and sent % self.drop_after == 0:
+                        self.metrics["drops"] += 1
+                        await ws.close()
+                        return
+                if not self.loop or not events:
+                    await ws.wait_closed()
+                    return
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            answer.cancel()
+
+    def lookup(self, target: str) -> tuple:
+        if target in self.responses:
+            return self.responses[target]
+        path = urlsplit(target).path
+        if path in self.cursors:
+            return next(self.cursors[path])
+        return 404, json.dumps({"code": -1, "msg": f"{path} tidak ada di rekaman"}).encode()
+
+    async def http_handler(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.http_clients.add(writer)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                _, target, _ = request_line.decode().split(' ', 2)
+                keep_alive = True
+                while True:
+                    header = await reader.readline()
+                    if header in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = header.decode().partition(':')
+                    if name.lower() == 'connection' and value.strip().lower() == 'close':
+                        keep_alive = False
+                status, body = self.lookup(target)
+                self.metrics["requests"] += 1
+                writer.write(
+                    f"HTTP/1.1 {status} {HTTP_REASON.get(status, 'Unknown')}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + body
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            self.http_clients.discard(writer)
+            writer.close()
+
+    async def start(self):
+        self.ws_server = await websockets.serve(self.ws_handler, self.host, self.ws_port)
+        self.ws_port = self.ws_server.sockets[0].getsockname()[1]
+        self.http_server = await asyncio.start_server(self.http_handler, self.host, self.http_port)
+        self.http_port = self.http_server.sockets[0].getsockname()[1]
+        logging.info(f"[🧪] Mock exchange websocket {self.ws_url}, HTTP {self.http_url}")
+
+    async def close(self):
+        self.ws_server.close()
+        self.http_server.close()
+        for writer in list(self.http_clients): # koneksi keep-alive, supaya handler selesai normal
+            writer.close()
+        await self.ws_server.wait_closed()
+        await self.http_server.wait_closed()
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            await asyncio.Future()
+        finally:
+            await self.close()
+
+if __name__ == '__main__':
+    # python -m service.mock_exchange log/record/stream.bin.gz [speed]
+    # lalu jalankan pipeline dengan URL_STREAM=ws://127.0.0.1:9443/stream URL_API=http://127.0.0.1:8080/api/v3
+    exchange = MockExchange(sys.argv[1], ws_port=9443, http_port=8080, speed=float(sys.argv[2]) if len(sys.argv) > 2 else 1.0, loop=True)
+    try:
+        asyncio.run(exchange.serve_forever())
+    except KeyboardInterrupt:
+        logging.info("Stopped by user")
@@ -0,0 +1,345 @@
+from bisect import bisect_left
+import websockets
+import asyncio
+import json
+import os
+from service.connection import BinanceConnectionSocket, BinanceConnectionApi
+from service.http_client import IPBanned
+from service.decoder import DepthEvent, to_event
+from service.limiter import get_limiter
+from service.stream import MAX_STREAMS, SUBSCRIBE_CHUNK
+from service.metrics import get_registry
+
+def depth_streams(symbols: list, speed: str = '100ms') -> list:
+    suffix = '' if speed == '1000ms' else f"@{speed}" # stream 1000ms tanpa akhiran
+    return [f"{symbol.lower()}@depth{suffix}" for symbol in symbols]
+
+def snapshot_weight(limit: int) -> int:
+    """Weight GET /depth sesuai limit ( dokumentasi Binance )."""
+    if limit <= 100:
+        return 5
+    if limit <= 500:
+        return 25
+    if limit <= 1000:
+        return 50
+    return 250
+
+class OutOfSync(Exception):
+    """Ada diff depth yang terlewat, book harus diambil ulang dari snapshot."""
+
+class BookSide:
+    """
+    Satu sisi order book sebagai dua list paralel ( key harga, quantity ) yang selalu urut.
+
+    Key disusun supaya level terbaik selalu di akhir list: bid memakai harga, ask memakai
+    -harga. Cari level O(log n) via bisect, best level O(1), dan level yang paling sering
+    berubah ( dekat best ) hanya menggeser sedikit elemen saat insert/hapus.
+    """
+    __slots__ = ('sign', 'keys', 'quantities')
+
+    def __init__(self, is_bid: bool):
+        self.sign = 1.0 if is_bid else -1.0
+        self.keys = []
+        self.quantities = []
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def clear(self):
+        self.keys.clear()
+        self.quantities.clear()
+
+    def load(self, levels: list):
+        pairs = sorted((float(price) * self.sign, float(quantity)) for price, quantity in levels if float(quantity))
+        self.keys = [key for key, _ in pairs]
+        self.quantities = [quantity for _, quantity in pairs]
+
+    def set(self, price: float, quantity: float):
+        keys = self.keys
+        key = price * self.sign
+        index = bisect_left(keys, key)
+        if index < len(keys) and keys[index] == key:
+            if quantity:
+                self.quantities[index] = quantity
+            else:
+                del keys[index]
+                del self.quantities[index]
+        elif quantity:
+            keys.insert(index, key)
+            self.quantities.insert(index, quantity)
+
+    def best(self) -> tuple:
+        if not self.keys:
+            return None, 0.0
+        return self.keys[-1] * self.sign, self.quantities[-1]
+
+    def levels(self, depth: int = 10) -> list:
+        """depth level terbaik sebagai list (harga, quantity), dari yang terbaik."""
+        return [(key * self.sign, quantity) for key, quantity in zip(reversed(self.keys[-depth:]), reversed(self.quantities[-depth:]))]
+
+    def volume(self, depth: int) -> float:
+        return sum(self.quantities[-depth:])
+
+class OrderBook:
+    """
+    Local order book satu symbol yang disinkronkan dari snapshot REST + diff depth stream.
+
+    Aturan sinkronisasi Binance:
+        - event dengan u <= lastUpdateId diabaikan ( sudah termasuk di snapshot )
+        - event berikutnya harus U <= lastUpdateId + 1, jika lebih besar ada event yang hilang
+    """
+    __slots__ = ('symbol', 'bids', 'asks', 'last_update_id', 'synced', 'updates')
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.bids = BookSide(is_bid=True)
+        self.asks = BookSide(is_bid=False)
+        self.last_update_id = 0
+        self.synced = False
+        self.updates = 0
+
+    def reset(self):
+        self.bids.clear()
+        self.asks.clear()
+        self.last_update_id = 0
+        self.synced = False
+
+    def load_snapshot(self, snapshot: dict):
+        self.bids.load(snapshot['bids'])
+        self.asks.load(snapshot['asks'])
+        self.last_update_id = snapshot['lastUpdateId']
+        self.synced = True
+
+    def apply(self, event: DepthEvent) -> bool:
+        """
+        Menerapkan satu diff depth.
+
+        Returns:
+            bool: False jika event sudah termasuk di snapshot ( diabaikan )
+
+        Raises:
+            OutOfSync: Jika ada update id yang terlewat
+        """
+        if event.final_update_id <= self.last_update_id:
+            return False
+        if event.first_update_id > self.last_update_id + 1:
+            raise OutOfSync(f"{self.symbol}: update {self.last_update_id + 1} sampai {event.first_update_id - 1} terlewat")
+        bids, asks = self.bids, self.asks
+        for price, quantity in event.bids:
+            bids.set(float(price), float(quantity))
+        for price, quantity in event.asks:
+            asks.set(float(price), float(quantity))
+        self.last_update_id = event.final_update_id
+        self.updates += 1
+        return True
+
+    @property
+    def best_bid(self) -> tuple:
+        return self.bids.best()
+
+    @property
+    def best_ask(self) -> tuple:
+        return self.asks.best()
+
+    @property
+    def spread(self) -> float:
+        bid, ask = self.bids.best()[0], self.asks.best()[0]
+        return ask - bid if bid is not None and ask is not None else None
+
+    @property
+    def mid(self) -> float:
+        bid, ask = self.bids.best()[0], self.asks.best()[0]
+        return (bid + ask) / 2 if bid is not None and ask is not None else None
+
+    def imbalance(self, depth: int = 1) -> float:
+        """(volume bid - volume ask) / total pada depth level terbaik, -1 .. 1."""
+        bid_volume, ask_volume = self.bids.volume(depth), self.asks.volume(depth)
+        total = bid_volume + ask_volume
+        return (bid_volume - ask_volume) / total if total else 0.0
+
+    @property
+    def microprice(self) -> float:
+        """Mid yang diberi bobot quantity best level: mendekati ask jika antrian bid lebih besar."""
+        (bid, bid_quantity), (ask, ask_quantity) = self.bids.best(), self.asks.best()
+        if bid is None or ask is None:
+            return None
+        return (bid * ask_quantity + ask * bid_quantity) / (bid_quantity + ask_quantity)
+
+    def snapshot(self, depth: int = 10) -> dict:
+        return {
+            "symbol": self.symbol,
+            "last_update_id": self.last_update_id,
+            "bids": self.bids.levels(depth),
+            "asks": self.asks.levels(depth),
+            "spread": self.spread,
+            "microprice": self.microprice,
+            "imbalance": self.imbalance(depth),
+        }
+
+class OrderBookSocket(BinanceConnectionSocket):
+    """
+    Order book beberapa symbol dari diff depth stream ( <symbol>@depth@100ms ).
+
+    Event yang datang sebelum book tersinkron disimpan di buffer, snapshot REST diambil
+    ( weight dihitung lewat WeightLimiter ), buffer diputar ulang di atas snapshot, lalu
+    event berikutnya langsung diterapkan di reader tanpa queue. Jika ada update yang
+    terlewat atau koneksi putus, book di-reset dan disinkron ulang.
+
+    Args:
+        symbols (list): Symbol, contoh ['BTCUSDT']
+        on_update (callable): Callback opsional on_update(book) setiap book berubah
+        speed (str): '100ms' atau '1000ms'
+        snapshot_limit (int): Jumlah level snapshot REST
+        api_url (str): Base url REST untuk snapshot
+        max_buffer (int): Event maksimal di buffer selama belum tersinkron, lebih dari itu
+            buffer dibuang dan sinkronisasi dimulai ulang dari snapshot baru
+    """
+    def __init__(
+                self,
+                symbols: list,
+                on_update = None,
+                url: str = os.environ.get('URL_STREAM', 'wss://stream.binance.com:9443/stream'),
+                speed: str = '100ms',
+                snapshot_limit: int = 1000,
+                api_url: str = os.environ.get('URL_API', ''),
+                max_buffer: int = int(os.environ.get('ORDERBOOK_MAX_BUFFER', 10000)),
+                **kwargs
+            ):
+        if len(symbols) > MAX_STREAMS:
+            raise ValueError(f"Maksimal {MAX_STREAMS} stream per koneksi, diberikan {len(symbols)}")
+        self.streams = depth_streams(symbols, speed)
+        super().__init__(
+            on_data=None,
+            extra_data=None,
+            payload={"method": "SUBSCRIBE", "params": self.streams, "id": 1},
+            url=url,
+            use_log=False,
+            **kwargs
+        )
+        self.books = {symbol: OrderBook(symbol) for symbol in symbols}
+        self.buffers = {symbol: [] for symbol in symbols}
+        self.syncing = {} # symbol -> task sync yang sedang berjalan
+        self.max_buffer = max_buffer
+        self.on_update = on_update
+        self.snapshot_limit = snapshot_limit
+        self.api = BinanceConnectionApi(url=api_url, sub_url='/depth')
+        self.limiter = get_limiter()
+        self.metrics = {"received": 0, "applied": 0, "buffered": 0, "resyncs": 0, "snapshots": 0, "overflows": 0}
+        self.resync_counter = get_registry().counter('binance_orderbook_resyncs_total', 'Order book yang disinkron ulang karena update terlewat').labels()
+
+    def stats(self) -> dict:
+        return {**self.metrics, "synced": sum(book.synced for book in self.books.values()), "decode": self.decode.stats.summary()}
+
+    async def sync(self, symbol: str):
+        """Mengambil snapshot lalu memutar ulang buffer, diulang sampai book tersinkron."""
+        book, buffer = self.books[symbol], self.buffers[symbol]
+        stale = 0
+        while not book.synced:
+            await self.limiter.acquire(snapshot_weight(self.snapshot_limit))
+            try:
+                snapshot = await self.api.get({"symbol": symbol, "limit": self.snapshot_limit})
+            except IPBanned as e: # limiter sudah di-pause selama Retry-After, acquire berikutnya menunggu
+                await self.on_error(e)
+                continue
+            self.metrics["snapshots"] += 1
+            if not snapshot or 'lastUpdateId' not in snapshot:
+                await asyncio.sleep(self.reconnect_delay)
+                continue
+            if buffer and buffer[0].first_update_id > snapshot['lastUpdateId'] + 1:
+                stale += 1 # snapshot lebih lama dari event pertama di buffer, tunggu lalu ambil ulang
+                await asyncio.sleep(min(0.25 * 2 ** stale, self.reconnect_delay))
+                continue
+            book.load_snapshot(snapshot)
+            try:
+                for event in buffer:
+                    book.apply(event)
+            except OutOfSync as e:
+                book.reset()
+                await self.on_error(e)
+                continue
+            buffer.clear()
+        if self.syncing.get(symbol) is asyncio.current_task():
+            self.syncing.pop(symbol) # tanpa await setelah synced, event berikutnya langsung bisa resync
+        await self.on_info(f"[📚][{symbol}] Order book tersinkron di update {book.last_update_id}")
+
+    def _sync_done(self, symbol: str, task: asyncio.Task):
+        if self.syncing.get(symbol) is task:
+            self.syncing.pop(symbol)
+        if not task.cancelled() and task.exception() is not None:
+            self.logger.error(f"[{symbol}] Sinkronisasi order book gagal: {task.exception()}")
+
+    def resync(self, symbol: str):
+        self.books[symbol].reset()
+        if symbol not in self.syncing:
+            task = asyncio.create_task(self.sync(symbol))
+            self.syncing[symbol] = task
+            task.add_done_callback(lambda task, symbol=symbol: self._sync_done(symbol, task))
+
+    def close(self):
+        for task in list(self.syncing.values()):
+            task.cancel()
+        self.syncing.clear()
+
+    async def run(self):
+        try:
+            await super().run()
+        finally:
+            self.close()
+
+    def handle(self, event):
+        if not isinstance(event, DepthEvent) or event.symbol not in self.books:
+            return
+        self.metrics["received"] += 1
+        book = self.books[event.symbol]
+        if not book.synced:
+            buffer = self.buffers[event.symbol]
+            if len(buffer) >= self.max_buffer: # snapshot terus gagal, mulai ulang dari event terbaru
+                buffer.clear()
+                self.metrics["overflows"] += 1
+                task = self.syncing.pop(event.symbol, None)
+                if task:
+                    task.cancel()
+            buffer.append(event)
+            self.metrics["buffered"] += 1
+            if event.symbol not in self.syncing:
+                self.resync(event.symbol)
+            return
+        try:
+            if book.apply(event):
+                self.metrics["applied"] += 1
+                if self.on_update:
+                    self.on_update(book)
+        except OutOfSync:
+            self.metrics["resyncs"] += 1
+            self.resync_counter.inc()
+            self.buffers[event.symbol].append(event)
+            self.resync(event.symbol)
+
+    async def subscribe(self, ws):
+        for start in range(0, len(self.streams), SUBSCRIBE_CHUNK):
+            await ws.send(json.dumps({
+                "method": "SUBSCRIBE",
+                "params": self.streams[start:start + SUBSCRIBE_CHUNK],
+                "id": start // SUBSCRIBE_CHUNK + 1
+            }))
+            await asyncio.sleep(0.25) # limit 5 pesan masuk per detik
+
+    async def call_request(self):
+        while self.reconnect_count < self.max_reconnect_attempts:
+            try:
+                async with websockets.connect(self.url) as ws:
+                    await self.on_info(f"Connected to Binance depth stream ({len(self.streams)} stream)")
+                    self.reconnect_count = 0
+                    for symbol, book in self.books.items(): # event selama putus hilang, semua book sinkron ulang
+                        book.reset()
+                        self.buffers[symbol].clear()
+                    await self.subscribe(ws)
+                    async for message in ws:
+                        if self.recorder:
+                            self.recorder.frame(self.url, message)
+                        data = self.decode(message).get('data')
+                        if data is not None:
+                            self.handle(to_event(data))
+                    self.reconnects.inc() # ditutup normal oleh server, tetap dihitung sebagai reconnect
+            except Exception as e:
+                await self.handle_reconnect_error(e)
@@ -0,0 +1,96 @@
+from typing import NamedTuple
+import atexit
+import struct
+import gzip
+import time
+import os
+
+MAGIC = b'BNRC\x01'
+HEADER = struct.Struct('<BqHHI') # kind, waktu ns, status HTTP, panjang key, panjang payload
+KIND_FRAME = 1
+KIND_RESPONSE = 2
+
+class Record(NamedTuple):
+    kind: int
+    time_ns: int
+    status: int
+    key: str
+    payload: bytes
+
+def _open(path: str, mode: str):
+    return gzip.open(path, mode, compresslevel=3) if path.endswith('.gz') else open(path, mode)
+
+class Recorder:
+    """
+    Merekam frame websocket mentah dan response REST ke log biner.
+
+    Format per record: header struct '<BqHHI' ( kind, time.time_ns, status, panjang key,
+    panjang payload ) lalu key ( url websocket / path+query REST ) dan payload apa adanya.
+    Jika nama file berakhiran .gz seluruh log dikompres gzip.
+
+    Args:
+        path (str): File log, contoh 'log/record/stream.bin.gz'
+    """
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path
+        self.file = _open(path, 'wb')
+        self.file.write(MAGIC)
+        self.count = 0
+        atexit.register(self.close)
+
+    def _write(self, kind: int, key: str, payload, status: int = 0):
+        if self.file is None:
+            return
+        key = key.encode()
+        if isinstance(payload, str):
+            payload = payload.encode()
+        self.file.write(HEADER.pack(kind, time.time_ns(), status, len(key), len(payload)))
+        self.file.write(key)
+        self.file.write(payload)
+        self.count += 1
+
+    def frame(self, url: str, message):
+        self._write(KIND_FRAME, url, message)
+
+    def response(self, path: str, status: int, body: bytes):
+        self._write(KIND_RESPONSE, path, body, status)
+
+    def flush(self):
+        if self.file is not None:
+            self.file.flush()
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+def read_log(path: str):
+    """
+    Membaca log hasil Recorder.
+
+    Yields:
+        Record: kind, time_ns, status, key, payload
+    """
+    with _open(path, 'rb') as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} bukan file rekaman")
+        while True:
+            header = file.read(HEADER.size)
+            if len(header) < HEADER.size: # akhir file ( atau record terakhir terpotong )
+                return
+            kind, time_ns, status, key_length, payload_length = HEADER.unpack(header)
+            key = file.read(key_length).decode()
+            payload = file.read(payload_length)
+            if len(payload) < payload_length:
+                return
+            yield Record(kind, time_ns, status, key, payload)
+
+_recorder = None
+
+def get_recorder(path: str = os.environ.get('RECORD_PATH')) -> Recorder:
+    """Recorder bersama per process, None jika RECORD_PATH tidak di-set ( rekaman mati )."""
+    global _recorder
+    if _recorder is None and path:
+        _recorder = Recorder(path)
+    return _recorder
@@ -0,0 +1,290 @@
+import websockets
+import asyncio
+import logging
+import itertools
+import heapq
+import json
+import time
+import os
+import uuid
+from service.decoder import TimedDecoder
+from service.recorder import get_recorder
+from service.metrics import get_registry
+from service.stream import MAX_STREAMS, SUBSCRIBE_CHUNK
+from helper.signer import get_signer
+
+class PooledConnection:
+    """
+    Satu koneksi websocket di dalam pool SocketSessionManager.
+
+    Reader memetakan response ke request berdasarkan `id`, dan event stream ke
+    handler berdasarkan nama stream. Saat koneksi putus, semua stream milik koneksi
+    ini disubscribe ulang otomatis setelah reconnect.
+    """
+    def __init__(self, manager, number: int):
+        self.manager = manager
+        self.number = number
+        self.ws = None
+        self.streams = set()
+        self.pending = {}
+        self.ready = asyncio.Event()
+        self.reconnect_count = 0
+        self.resubscribe = None # task subscribe ulang setelah reconnect
+        self.task = asyncio.create_task(self.run())
+
+    @property
+    def load(self) -> int:
+        return len(self.pending) + len(self.streams)
+
+    async def send(self, message: dict):
+        await self.ready.wait()
+        await self.ws.send(json.dumps(message))
+
+    async def send_subscription(self, method: str, streams: list):
+        for start in range(0, len(streams), SUBSCRIBE_CHUNK):
+            await self.send({
+                "method": method,
+                "params": streams[start:start + SUBSCRIBE_CHUNK],
+                "id": str(uuid.uuid4())
+            })
+            await asyncio.sleep(0.25) # limit 5 pesan masuk per detik per koneksi
+
+    def fail_pending(self, error: Exception):
+        for future in self.pending.values():
+            if not future.done():
+                future.set_exception(error)
+        self.pending.clear()
+
+    async def run(self):
+        manager = self.manager
+        while True:
+            try:
+                async with websockets.connect(manager.url) as ws:
+                    self.ws = ws
+                    self.reconnect_count = 0
+                    self.ready.set()
+                    manager.logger.info(f"[#{self.number}] Connected to {manager.url}")
+                    if self.resubscribe and not self.resubscribe.done():
+                        self.resubscribe.cancel()
+                    if self.streams:
+                        self.resubscribe = asyncio.create_task(self.send_subscription("SUBSCRIBE", sorted(self.streams)))
+                    async for message in ws:
+                        if manager.recorder:
+                            manager.recorder.frame(manager.url, message)
+                        data = manager.decode(message)
+                        request_id = data.get('id') if isinstance(data, dict) else None
+                        if request_id in self.pending:
+                            future = self.pending.pop(request_id)
+                            if not future.done():
+                                future.set_result(data)
+                        elif isinstance(data, dict) and 'stream' in data:
+                            manager.dispatch(data['stream'], data['data'])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                manager.logger.error(f"[#{self.number}] Error occurred: {e}")
+            self.ready.clear()
+            self.fail_pending(ConnectionError("Websocket terputus sebelum response diterima"))
+            manager.reconnects += 1
+            manager.reconnect_counter.inc()
+            self.reconnect_count += 1
+            delay = min(manager.reconnect_delay * 2 ** (self.reconnect_count - 1), 60)
+            manager.logger.info(f"[#{self.number}] Reconnecting in {delay} sec...")
+            await asyncio.sleep(delay)
+
+class SocketSessionManager:
+    """
+    Multiplexer banyak request dan subscription di atas pool koneksi websocket yang kecil.
+
+    - request(): dikirim lewat koneksi paling sepi, response dicocokkan dengan `id`
+    - subscribe(): stream dibagi ke koneksi yang masih di bawah batas stream per koneksi
+    - every(): request berkala ( pengganti periodic_refresh per koneksi ) dijalankan satu scheduler
+
+    Args:
+        url (str): Endpoint websocket ( ws-api untuk request, /stream untuk market stream )
+        max_connections (int): Jumlah koneksi maksimal di dalam pool
+        max_streams (int): Batas stream per koneksi
+        request_timeout (float): Timeout menunggu response request dalam detik
+        reconnect_delay (int): Jeda awal reconnect, naik dua kali lipat sampai 60 detik
+        folder_config (str): Folder config untuk request yang butuh signature
+    """
+    def __init__(
+                self,
+                url: str = os.environ.get('URL_WS', ''),
+                max_connections: int = int(os.environ.get('WS_MAX_CONNECTIONS', 4)),
+                max_streams: int = MAX_STREAMS,
+                request_timeout: float = 10.0,
+                reconnect_delay: int = int(os.environ.get('RECONNECT_DELAY', 5)),
+                folder_config: str = 'configuration',
+                decoder: str = os.environ.get('WS_DECODER') or None
+            ):
+        self.url = url
+        self.max_connections = max_connections
+        self.max_streams = max_streams
+        self.request_timeout = request_timeout
+        self.reconnect_delay = reconnect_delay
+        self.folder_config = folder_config
+        self.decode = TimedDecoder(decoder, component='SocketSessionManager')
+        registry = get_registry()
+        self.reconnect_counter = registry.counter('binance_ws_reconnects_total', 'Koneksi websocket yang putus / gagal', ('component',)).labels(component='SocketSessionManager')
+        self.request_latency = registry.histogram('binance_ws_request_seconds', 'Latency request ws-api per method', ('method',))
+        self.recorder = get_recorder()
+        self.connections = []
+        self.handlers = {}
+        self.jobs = []
+        self.job_counter = itertools.count()
+        self.running = {} # key jadwal -> task request yang masih berjalan
+        self.scheduler = None
+        self.reconnects = 0
+        self.logger = logging.getLogger("SESSION")
+
+    def _new_connection(self) -> PooledConnection:
+        if len(self.connections) >= self.max_connections:
+            raise RuntimeError(f"Pool penuh, maksimal {self.max_connections} koneksi")
+        connection = PooledConnection(self, len(self.connections))
+        self.connections.append(connection)
+        return connection
+
+    def _least_loaded(self) -> PooledConnection:
+        if not self.connections:
+            return self._new_connection()
+        return min(self.connections, key=lambda connection: connection.load)
+
+    def dispatch(self, stream: str, data: dict):
+        for callback in self.handlers.get(stream, ()):
+            try:
+                callback(stream, data)
+            except Exception as e:
+                self.logger.error(f"Handler error [{stream}]: {e}")
+
+    async def request(self, method: str, params: dict = None, signed: bool = False) -> dict:
+        """
+        Mengirim request ws-api dan menunggu response dengan id yang sama.
+
+        Args:
+            method (str): Method ws-api, contoh 'account.status'
+            params (dict): Parameter request
+            signed (bool): Tambahkan apiKey, timestamp dan signature
+
+        Returns:
+            dict: Response Binance
+        """
+        params = dict(params or {})
+        if signed:
+            signer = get_signer(config_folder=self.folder_config)
+            params = signer.signed_params(dict(params, apiKey=signer.api_key))
+        connection = self._least_loaded()
+        request_id = str(uuid.uuid4())
+        future = asyncio.get_running_loop().create_future()
+        connection.pending[request_id] = future
+        started = time.perf_counter()
+
+        async def exchange():
+            await connection.send({"id": request_id, "method": method, "params": params}) # menunggu koneksi ready
+            return await future
+
+        try:
+            response = await asyncio.wait_for(exchange(), self.request_timeout) # timeout mencakup send saat koneksi putus
+            self.request_latency.labels(method=method).observe(time.perf_counter() - started)
+            return response
+        finally:
+            connection.pending.pop(request_id, None)
+            if future.done() and not future.cancelled():
+                future.exception() # koneksi putus saat send masih menunggu, error sudah diwakili timeout
+
+    async def subscribe(self, streams: list, callback):
+        """
+        Subscribe stream dan daftarkan callback(stream, data). Callback dipanggil langsung
+        di reader, jadi harus ringan ( misal hanya memasukkan data ke queue ).
+        """
+        assigned = {}
+        for stream in streams:
+            self.handlers.setdefault(stream, []).append(callback)
+            if any(stream in connection.streams for connection in self.connections):
+                continue
+            candidates = [connection for connection in self.connections if len(connection.streams) < self.max_streams]
+            connection = min(candidates, key=lambda connection: len(connection.streams)) if candidates else self._new_connection()
+            connection.streams.add(stream)
+            assigned.setdefault(connection, []).append(stream)
+        await asyncio.gather(*[
+            connection.send_subscription("SUBSCRIBE", names) for connection, names in assigned.items()
+        ])
+
+    async def unsubscribe(self, streams: list, callback = None):
+        removed = {}
+        for stream in streams:
+            handlers = self.handlers.get(stream, [])
+            if callback in handlers:
+                handlers.remove(callback)
+            if callback is None or not handlers:
+                self.handlers.pop(stream, None)
+                for connection in self.connections:
+                    if stream in connection.streams:
+                        connection.streams.discard(stream)
+                        removed.setdefault(connection, []).append(stream)
+        await asyncio.gather(*[
+            connection.send_subscription("UNSUBSCRIBE", names) for connection, names in removed.items()
+        ])
+
+    def every(self, interval: float, method: str, params: dict = None, callback = None, signed: bool = False):
+        """
+        Menjadwalkan request berkala. Semua jadwal dijalankan oleh satu task scheduler.
+
+        Args:
+            interval (float): Jeda antar request dalam detik
+            method (str): Method ws-api
+            params (dict): Parameter request
+            callback (callable): Dipanggil dengan response setiap request selesai
+            signed (bool): Signature diperbarui setiap kali request dikirim
+        """
+        loop = asyncio.get_running_loop()
+        heapq.heappush(self.jobs, (loop.time(), next(self.job_counter), interval, method, params, callback, signed))
+        if self.scheduler is None:
+            self.scheduler = asyncio.create_task(self._run_scheduler())
+
+    async def _run_job(self, method, params, callback, signed):
+        try:
+            response = await self.request(method, params, signed=signed)
+            if callback:
+                callback(response)
+        except Exception as e:
+            self.logger.error(f"Scheduled {method} error: {e}")
+
+    async def _run_scheduler(self):
+        loop = asyncio.get_running_loop()
+        while self.jobs:
+            due, key, interval, method, params, callback, signed = self.jobs[0]
+            delay = due - loop.time()
+            if delay > 0:
+                await asyncio.sleep(min(delay, 1.0)) # cek ulang agar jadwal baru tidak menunggu lama
+                continue
+            heapq.heapreplace(self.jobs, (due + interval, key, interval, method, params, callback, signed))
+            if key in self.running: # request sebelumnya belum selesai, jadwal ini dilewati
+                self.logger.warning(f"Scheduled {method} masih berjalan, dilewati")
+                continue
+            task = asyncio.create_task(self._run_job(method, params, callback, signed))
+            self.running[key] = task
+            task.add_done_callback(lambda _, key=key: self.running.pop(key, None))
+        self.scheduler = None
+
+    def stats(self) -> dict:
+        return {
+            "connections": len(self.connections),
+            "streams": [len(connection.streams) for connection in self.connections],
+            "pending": sum(len(connection.pending) for connection in self.connections),
+            "reconnects": self.reconnects,
+            "decode": self.decode.stats.summary()
+        }
+
+    async def close(self):
+        if self.scheduler:
+            self.scheduler.cancel()
+        for task in list(self.running.values()):
+            task.cancel()
+        for connection in self.connections:
+            connection.task.cancel()
+            if connection.resubscribe:
+                connection.resubscribe.cancel()
+            if connection.ws is not None:
+                await connection.ws.close()
+        self.connections.clear()
@@ -0,0 +1,172 @@
+import websockets
+import asyncio
+import logging
+import json
+import os
+import time
+import numpy as np
+from service.connection import BinanceConnectionSocket
+from service.decoder import KlineEvent, to_event
+from helper.kline_store import get_store, interval_dir, KLINE_DTYPE
+from service.metrics import get_registry
+
+MAX_STREAMS = 1024 # batas stream per koneksi Binance
+SUBSCRIBE_CHUNK = 200
+MINI_TICKER_STREAM = '!miniTicker@arr' # semua symbol, hanya yang berubah, setiap 1 detik
+
+def kline_streams(symbols: list, interval: str = '1m') -> list:
+    return [f"{symbol.lower()}@kline_{interval}" for symbol in symbols]
+
+def trade_streams(symbols: list) -> list:
+    return [f"{symbol.lower()}@trade" for symbol in symbols]
+
+class BinanceStreamSocket(BinanceConnectionSocket):
+    """
+    Pipeline market stream: banyak stream kline/trade dalam satu socket combined stream.
+
+    Reader hanya memasukkan frame mentah ke queue yang dibatasi; consumer terpisah
+    melakukan decode ( KlineEvent / TradeEvent ), micro-batch dan write ke KlineStore.
+    Jika queue penuh, frame paling lama dibuang dan dihitung di metrics['dropped']
+    sehingga reader tidak pernah menunggu consumer.
+
+    Args:
+        streams (list): Nama stream, contoh kline_streams(['BTCUSDT'])
+        on_batch (callable): Callback async opsional yang menerima list event typed per batch
+        queue_size (int): Kapasitas queue antara reader dan consumer
+        batch_size (int): Jumlah frame maksimal per batch
+        flush_interval (float): Waktu maksimal ( detik ) menunggu batch penuh
+        store_dir (str): Folder KlineStore 1m untuk kline yang sudah close, interval lain
+            disimpan di interval_dir(store_dir, interval). Satu socket hanya boleh satu interval kline
+    """
+    def __init__(
+                self,
+                streams: list,
+                on_batch = None,
+                url: str = os.environ.get('URL_STREAM', 'wss://stream.binance.com:9443/stream'),
+                queue_size: int = int(os.environ.get('STREAM_QUEUE_SIZE', 10000)),
+                batch_size: int = 500,
+                flush_interval: float = 1.0,
+                store_dir: str = 'log/data/raw',
+                **kwargs
+            ):
+        if len(streams) > MAX_STREAMS:
+            raise ValueError(f"Maksimal {MAX_STREAMS} stream per koneksi, diberikan {len(streams)}")
+        intervals = {stream.split('@kline_', 1)[1] for stream in streams if '@kline_' in stream}
+        if len(intervals) > 1: # KlineEvent tidak membawa interval, store tidak bisa dipisah per event
+            raise ValueError(f"Satu socket hanya untuk satu interval kline, diberikan {sorted(intervals)}")
+        super().__init__(
+            on_data=None,
+            extra_data=None,
+            payload={"method": "SUBSCRIBE", "params": streams, "id": 1},
+            url=url,
+            use_log=False,
+            **kwargs
+        )
+        self.streams = streams
+        self.on_batch = on_batch
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.store = get_store(interval_dir(store_dir, intervals.pop() if intervals else '1m'))
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.metrics = {"received": 0, "dropped": 0, "processed": 0, "batches": 0, "klines_written": 0, "max_depth": 0}
+        registry = get_registry()
+        self.depth_gauge = registry.gauge('binance_stream_queue_depth', 'Frame yang menunggu di queue consumer').labels()
+        self.dropped = registry.counter('binance_stream_dropped_total', 'Frame dibuang karena queue penuh').labels()
+        self.batch_time = registry.histogram('binance_stream_batch_seconds', 'Waktu proses satu batch ( decode + write + on_batch )').labels()
+        self.klines_written = registry.counter('binance_stream_klines_written_total', 'Kline close yang ditulis ke KlineStore').labels()
+
+    def stats(self) -> dict:
+        return {**self.metrics, "depth": self.queue.qsize(), "decode": self.decode.stats.summary()}
+
+    def enqueue(self, message):
+        self.metrics["received"] += 1
+        if self.queue.full():
+            self.queue.get_nowait() # buang frame paling lama, reader tidak boleh block
+            self.metrics["dropped"] += 1
+            self.dropped.inc()
+        self.queue.put_nowait(message)
+        depth = self.queue.qsize()
+        self.depth_gauge.set(depth)
+        self.metrics["max_depth"] = max(self.metrics["max_depth"], depth)
+
+    async def subscribe(self, ws):
+        for start in range(0, len(self.streams), SUBSCRIBE_CHUNK):
+            await ws.send(json.dumps({
+                "method": "SUBSCRIBE",
+                "params": self.streams[start:start + SUBSCRIBE_CHUNK],
+                "id": start // SUBSCRIBE_CHUNK + 1
+            }))
+            await asyncio.sleep(0.25) # limit 5 pesan masuk per detik
+
+    async def call_request(self):
+        while self.reconnect_count < self.max_reconnect_attempts:
+            try:
+                async with websockets.connect(self.url) as ws:
+                    await self.on_info(f"Connected to Binance stream ({len(self.streams)} stream)")
+                    self.reconnect_count = 0
+                    await self.subscribe(ws)
+                    async for message in ws:
+                        if self.recorder:
+                            self.recorder.frame(self.url, message)
+                        self.enqueue(message)
+                    self.reconnects.inc() # ditutup normal oleh server, tetap dihitung sebagai reconnect
+            except Exception as e:
+                await self.handle_reconnect_error(e)
+
+    async def next_batch(self) -> list:
+        batch = [await self.queue.get()]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            if self.queue.empty():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            else:
+                batch.append(self.queue.get_nowait())
+        return batch
+
+    async def process_batch(self, batch: list):
+        events, closed = [], {}
+        for message in batch:
+            response_data = self.decode(message)
+            data = response_data.get('data')
+            if data is None: # response SUBSCRIBE, bukan event market
+                continue
+            for item in (data if isinstance(data, list) else (data,)): # stream @arr berisi list event
+                event = to_event(item)
+                events.append(event)
+                if isinstance(event, KlineEvent) and event.closed:
+                    closed.setdefault(event.symbol, []).append(event[2:])
+
+        for symbol, rows in closed.items():
+            records = np.array(rows, dtype=KLINE_DTYPE)
+            written = await asyncio.to_thread(self.store.append, symbol, records)
+            self.metrics["klines_written"] += written
+            self.klines_written.inc(written)
+
+        if self.on_batch and events:
+            await self.on_batch(events)
+        self.metrics["processed"] += len(batch)
+        self.metrics["batches"] += 1
+
+    async def consume(self):
+        while True:
+            batch = await self.next_batch()
+            self.depth_gauge.set(self.queue.qsize())
+            started = time.perf_counter()
+            try:
+                await self.process_batch(batch)
+            except Exception as e:
+                await self.on_error(f"Batch error: {e}")
+            self.batch_time.observe(time.perf_counter() - started)
+
+    async def run(self):
+        consumer = asyncio.create_task(self.consume())
+        try:
+            await super().run()
+        finally:
+            consumer.cancel()
@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+import sys
+import os
+
+# modul diimport dari root Crypto ( helper.*, service.* ), sama seperti saat dijalankan langsung
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from helper.kline_store import KLINE_DTYPE
+
+MINUTE = 60_000
+JAN_2024 = 1704067200000 # 2024-01-01 00:00 UTC
+
+@pytest.fixture
+def make_records():
+    """Factory klines 1m sintetis: make_records(start, count), close = nomor urut + offset."""
+    def make(start: int = JAN_2024, count: int = 10, offset: float = 0.0) -> np.ndarray:
+        records = np.zeros(count, dtype=KLINE_DTYPE)
+        records['open_time'] = start + np.arange(count, dtype=np.int64) * MINUTE
+        records['close_time'] = records['open_time'] + MINUTE - 1
+        records['close'] = np.arange(count) + offset
+        records['open'] = records['close']
+        records['high'] = records['close'] + 1
+        records['low'] = records['close'] - 1
+        records['volume'] = 1.0
+        return records
+    return make
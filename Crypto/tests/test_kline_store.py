@@ -0,0 +1,129 @@
+from helper.kline_store import KlineStore, KLINE_DTYPE
+from conftest import MINUTE, JAN_2024
+import numpy as np
+import json
+import os
+
+FEB_2024 = 1706745600000
+
+def partition_path(root, symbol: str, key: str) -> str:
+    return os.path.join(root, symbol, key + '.bin')
+
+def load_index(root, symbol: str) -> dict:
+    with open(os.path.join(root, symbol, '_index.json')) as file:
+        return json.load(file)
+
+def test_append_read_round_trip(tmp_path, make_records):
+    store = KlineStore(str(tmp_path))
+    records = make_records(FEB_2024 - 5 * MINUTE, 20) # melewati batas bulan
+    assert store.append('X', records[:12]) == 12
+    assert store.append('X', records[8:]) == 8 # overlap dibuang
+    assert store.append('X', records) == 0
+
+    result = KlineStore(str(tmp_path)).read('X')
+    assert np.array_equal(result, records)
+    index = load_index(tmp_path, 'X')
+    assert index['partitions'] == ['2024-01', '2024-02']
+    assert index['committed'] == {'2024-01': 5, '2024-02': 15}
+    assert index['rows'] == 20
+    assert index['max_open_time'] == int(records['open_time'][-1])
+
+def test_read_range_only_in_bounds(tmp_path, make_records):
+    store = KlineStore(str(tmp_path))
+    records = make_records(FEB_2024 - 5 * MINUTE, 20)
+    store.append('X', records)
+    start, end = int(records['open_time'][3]), int(records['open_time'][9])
+    assert np.array_equal(store.read('X', start, end), records[3:10])
+    assert len(store.read('X', 0, JAN_2024 - 1)) == 0
+
+def test_late_append_marks_dirty_and_compact(tmp_path, make_records):
+    store = KlineStore(str(tmp_path))
+    records = make_records(count=30)
+    store.append('X', records[10:])
+    assert store.append('X', records[:15]) == 10 # hanya row yang belum ada
+
+    assert store.index('X')['dirty'] == ['2024-01']
+    assert np.array_equal(store.read('X'), records) # reader sudah urut walau partisi dirty
+
+    store.compact('X')
+    assert store.index('X')['dirty'] == []
+    on_disk = np.fromfile(partition_path(tmp_path, 'X', '2024-01'), dtype=KLINE_DTYPE)
+    assert np.array_equal(on_disk, records)
+    assert load_index(tmp_path, 'X')['rows'] == 30
+    assert load_index(tmp_path, 'X')['committed'] == {'2024-01': 30}
+
+def test_upsert_overwrites_last_and_older_rows(tmp_path, make_records):
+    store = KlineStore(str(tmp_path))
+    records = make_records(count=10)
+    store.append('X', records)
+
+    last = make_records(int(records['open_time'][-1]), 1, offset=100.0)
+    assert store.upsert('X', last) == 1 # jalur cepat: tulis ulang record terakhir
+    middle = make_records(int(records['open_time'][4]), 2, offset=200.0)
+    fresh = make_records(int(records['open_time'][-1]) + MINUTE, 3, offset=300.0)
+    assert store.upsert('X', np.concatenate([middle, fresh])) == 5
+
+    result = KlineStore(str(tmp_path)).read('X')
+    assert len(result) == 13
+    assert result['close'][9] == 100.0
+    assert list(result['close'][4:6]) == [200.0, 201.0]
+    assert list(result['close'][10:]) == [300.0, 301.0, 302.0]
+    assert load_index(tmp_path, 'X')['rows'] == 13
+
+def test_reader_ignores_uncommitted_tail_without_truncating(tmp_path, make_records):
+    store = KlineStore(str(tmp_path))
+    records = make_records(count=10)
+    store.append('X', records[:6])
+    path = partition_path(tmp_path, 'X', '2024-01')
+    with open(path, 'ab') as file: # append writer lain yang indexnya belum tersimpan
+        file.write(records[6:].tobytes())
+    size = os.path.getsize(path)
+
+    reader = KlineStore(str(tmp_path))
+    assert np.array_equal(reader.read('X'), records[:6])
+    assert reader.tail('X')['open_time'][0] == records['open_time'][5]
+    assert os.path.getsize(path) == size
+
+def test_writer_recovers_torn_tail(tmp_path, make_records):
+    records = make_records(count=10)
+    KlineStore(str(tmp_path)).append('X', records[:6])
+    path = partition_path(tmp_path, 'X', '2024-01')
+    with open(path, 'ab') as file: # crash di tengah record
+        file.write(records[6:8].tobytes()[:KLINE_DTYPE.itemsize + 5])
+
+    store = KlineStore(str(tmp_path))
+    assert store.append('X', records[6:]) == 4
+    assert os.path.getsize(path) == 10 * KLINE_DTYPE.itemsize
+    assert np.array_equal(KlineStore(str(tmp_path)).read('X'), records)
+
+def test_writer_removes_orphan_partition(tmp_path, make_records):
+    records = make_records(count=5)
+    KlineStore(str(tmp_path)).append('X', records)
+    orphan = partition_path(tmp_path, 'X', '2024-02')
+    with open(orphan, 'wb') as file: # partisi baru yang indexnya belum sempat disimpan
+        file.write(make_records(FEB_2024, 3).tobytes())
+
+    assert np.array_equal(KlineStore(str(tmp_path)).read('X'), records)
+    assert os.path.exists(orphan) # reader tidak menghapus apapun
+
+    store = KlineStore(str(tmp_path))
+    store.append('X', make_records(int(records['open_time'][-1]) + MINUTE, 1))
+    assert not os.path.exists(orphan)
+    assert load_index(tmp_path, 'X')['partitions'] == ['2024-01']
+
+def test_recover_keeps_partition_rewritten_before_crash(tmp_path, make_records):
+    records = make_records(count=8)
+    store = KlineStore(str(tmp_path))
+    store.append('X', records[4:])
+    store.append('X', records[:4]) # partisi dirty
+    # crash di compaction: committed sudah dikosongkan, file sudah diganti, index belum disimpan ulang
+    index = store.index('X')
+    index['committed']['2024-01'] = None
+    store._save_index('X')
+    with open(partition_path(tmp_path, 'X', '2024-01'), 'wb') as file:
+        file.write(records.tobytes())
+
+    store = KlineStore(str(tmp_path))
+    store.compact('X')
+    assert load_index(tmp_path, 'X')['committed'] == {'2024-01': 8}
+    assert np.array_equal(store.read('X'), records)
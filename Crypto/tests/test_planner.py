@@ -0,0 +1,91 @@
+from helper.planner import plan_windows, missing_ranges, plan_missing_windows, align_time
+from helper.backfill_state import BackfillState, PENDING, DONE, EMPTY, FAILED
+from helper.kline_store import get_store
+from conftest import MINUTE, JAN_2024
+import numpy as np
+import pytest
+
+def test_plan_windows_edges():
+    step = 1000 * MINUTE
+    end = JAN_2024 + 2 * step - 1
+    assert plan_windows(JAN_2024, end) == [(JAN_2024, JAN_2024 + step - 1), (JAN_2024 + step, end)]
+    assert plan_windows(JAN_2024, end + MINUTE)[-1] == (JAN_2024 + 2 * step, end + MINUTE) # window terakhir terpotong
+    assert plan_windows(JAN_2024 + 1, JAN_2024 + MINUTE)[0][0] == JAN_2024 + MINUTE # start dibulatkan ke grid
+    assert plan_windows(JAN_2024 + 1, JAN_2024 + 10) == [] # tidak ada open_time di dalam range
+    assert plan_windows(JAN_2024, JAN_2024 - 1) == []
+
+def test_plan_windows_rejects_month_interval():
+    with pytest.raises(ValueError):
+        plan_windows(JAN_2024, JAN_2024 + MINUTE, interval='1M')
+
+def test_missing_ranges_head_middle_tail():
+    times = JAN_2024 + np.array([2, 3, 4, 7, 8]) * MINUTE
+    assert missing_ranges(times, JAN_2024, JAN_2024 + 10 * MINUTE) == [
+        (JAN_2024, JAN_2024 + MINUTE),
+        (JAN_2024 + 5 * MINUTE, JAN_2024 + 6 * MINUTE),
+        (JAN_2024 + 9 * MINUTE, JAN_2024 + 10 * MINUTE),
+    ]
+    assert missing_ranges(times, JAN_2024 + 2 * MINUTE, JAN_2024 + 4 * MINUTE) == []
+    assert missing_ranges([], JAN_2024, JAN_2024 + MINUTE) == [(JAN_2024, JAN_2024 + MINUTE)]
+    assert missing_ranges([], JAN_2024 + 1, JAN_2024 + 2) == []
+
+def test_align_time_rounds_up():
+    assert align_time(JAN_2024, '1m') == JAN_2024
+    assert align_time(JAN_2024 + 1, '1m') == JAN_2024 + MINUTE
+
+def test_plan_missing_windows_only_covers_gaps(tmp_path, make_records):
+    dir = str(tmp_path)
+    end = JAN_2024 + 30 * MINUTE - 1
+    assert plan_missing_windows(dir, 'X', JAN_2024, end, limit=10) == plan_windows(JAN_2024, end, limit=10)
+
+    records = make_records(count=30)
+    get_store(dir).append('X', np.concatenate([records[:10], records[15:25]]))
+    assert plan_missing_windows(dir, 'X', JAN_2024, end, limit=10) == [
+        (JAN_2024 + 10 * MINUTE, JAN_2024 + 14 * MINUTE),
+        (JAN_2024 + 25 * MINUTE, JAN_2024 + 29 * MINUTE),
+    ]
+    get_store(dir).append('X', records)
+    assert plan_missing_windows(dir, 'X', JAN_2024, end, limit=10) == []
+
+def test_backfill_state_resume(tmp_path):
+    path = str(tmp_path / 'state.sqlite3')
+    windows = plan_windows(JAN_2024, JAN_2024 + 30 * MINUTE - 1, limit=10)
+    state = BackfillState(path)
+    state.open_job('job', '1m', JAN_2024, JAN_2024 + 30 * MINUTE - 1, 10)
+    state.add_plan('job', 'X', windows)
+    state.advance('job', 'X', windows[0][0], windows[0][0] + 4 * MINUTE, 4)
+    state.finish('job', 'X', windows[1][0], EMPTY)
+    state.close()
+
+    # process baru dengan range berbeda tetap melanjutkan range job asli
+    state = BackfillState(path)
+    spec = state.open_job('job', '1m', 0, 1, 1000)
+    assert (spec['start_time'], spec['limit']) == (JAN_2024, 10)
+    assert state.planned('job', 'X') and not state.planned('job', 'Y')
+    assert state.pending('job', 'X') == [(windows[0][0], windows[0][1], windows[0][0] + 4 * MINUTE), (windows[2][0], windows[2][1], windows[2][0])]
+    assert state.complete_job('job') is False
+
+    state.finish('job', 'X', windows[0][0])
+    state.finish('job', 'X', windows[2][0])
+    assert state.progress('job') == {DONE: {"windows": 2, "rows": 4}, EMPTY: {"windows": 1, "rows": 0}}
+    assert state.complete_job('job') is True
+
+    # job selesai diganti job baru dengan parameter sekarang
+    spec = state.open_job('job', '1m', JAN_2024 + 30 * MINUTE, JAN_2024 + 60 * MINUTE - 1, 10)
+    assert spec['start_time'] == JAN_2024 + 30 * MINUTE
+    assert not state.planned('job', 'X') and state.progress('job') == {}
+    state.close()
+
+def test_backfill_state_failed_windows_finish_job(tmp_path):
+    state = BackfillState(str(tmp_path / 'state.sqlite3'), max_attempts=2)
+    state.open_job('job', '1m', JAN_2024, JAN_2024 + 20 * MINUTE - 1, 10)
+    first, second = plan_windows(JAN_2024, JAN_2024 + 20 * MINUTE - 1, limit=10)
+    state.add_plan('job', 'X', [first, second])
+
+    assert state.fail('job', 'X', first[0]) == PENDING
+    assert state.fail('job', 'X', first[0]) == FAILED
+    assert state.fail('job', 'X', second[0], terminal=True) == FAILED # error client, tidak diulang
+    assert state.pending('job', 'X') == []
+    assert [(symbol, attempts) for symbol, _, _, _, attempts in state.abandoned('job')] == [('X', 2), ('X', 1)]
+    assert state.complete_job('job') is True
+    state.close()
@@ -0,0 +1,130 @@
+from controller.storage.packed import PackedUniverse, pack_universe
+from controller.runner.parallel import csv_source, idx_source
+from controller.screening.cross_section import build_panel, screen
+from controller.storage.crypto_store import load_crypto_module
+import pandas as pd
+import numpy as np
+import hashlib
+import tempfile
+import shutil
+import random
+import time
+import sys
+import os
+
+# helper hasil / regresi sama dengan Crypto/benchmark/suite.py ( satu modul untuk kedua suite )
+_report = load_crypto_module('crypto_benchmark_report', 'benchmark/report.py')
+run_benchmarks, RESULT_DIR = _report.run_benchmarks, _report.RESULT_DIR
+
+COLUMNS = ['Date', 'OpenPrice', 'High', 'Low', 'Close', 'Volume', 'Value']
+
+def column_checksum(columns: dict, index: dict) -> dict:
+    """Hash per column dengan urutan baris yang sama ( ticker urut nama, baris urut Date per ticker )."""
+    date = np.asarray(columns['Date'])
+    spans = [index[ticker] for ticker in sorted(index)]
+    order = np.concatenate([start + np.argsort(date[start:start + length], kind='stable') for start, length in spans]) if spans else np.empty(0, dtype=np.int64)
+    return {
+        name: hashlib.sha1(np.asarray(values, dtype=np.float64)[order].tobytes()).hexdigest()
+        for name, values in columns.items()
+    }
+
+def bench_full_load(raw_dir: str = 'data/raw', packed_dir: str = 'data/packed', columns: list = COLUMNS) -> dict:
+    """
+    Load seluruh universe ke NumPy: CSV per emiten ( csv_source ) dibanding column .npy
+    ( idx_source ). Memmap di-copy ke memory supaya yang dibandingkan sama-sama data siap
+    pakai, bukan hanya page yang belum dibaca. Page cache OS tidak dikosongkan ( warm ).
+    same_data membandingkan checksum setiap column ( di luar waktu yang diukur ).
+    """
+    started = time.perf_counter()
+    csv_columns, csv_index = csv_source(raw_dir, columns)
+    csv_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    packed_columns, packed_index = idx_source(packed_dir, columns)
+    packed_columns = {name: np.array(values) for name, values in packed_columns.items()}
+    packed_elapsed = time.perf_counter() - started
+
+    rows = len(packed_columns['Date'])
+    return {
+        "tickers": len(packed_index),
+        "rows": rows,
+        "columns": len(columns),
+        "same_data": set(csv_index) == set(packed_index) and column_checksum(csv_columns, csv_index) == column_checksum(packed_columns, packed_index),
+        "csv_seconds": round(csv_elapsed, 4),
+        "packed_seconds": round(packed_elapsed, 4),
+        "csv_rows_per_second": round(rows / csv_elapsed),
+        "packed_rows_per_second": round(rows / packed_elapsed),
+        "speedup": round(csv_elapsed / packed_elapsed, 1),
+    }
+
+def bench_ticker_load(raw_dir: str = 'data/raw', packed_dir: str = 'data/packed', columns: list = COLUMNS, samples: int = 100, seed: int = 7) -> dict:
+    """Latency membuka satu emiten sebagai DataFrame: read_csv dibanding PackedUniverse.frame."""
+    universe = PackedUniverse(packed_dir)
+    tickers = random.Random(seed).sample(universe.tickers, min(samples, len(universe.tickers)))
+    csv_timings, packed_timings = [], []
+    for ticker in tickers:
+        begin = time.perf_counter()
+        pd.read_csv(os.path.join(raw_dir, ticker + '.csv'), usecols=columns)
+        csv_timings.append(time.perf_counter() - begin)
+        begin = time.perf_counter()
+        universe.frame(ticker, columns)
+        packed_timings.append(time.perf_counter() - begin)
+    csv_timings, packed_timings = np.asarray(csv_timings) * 1000, np.asarray(packed_timings) * 1000
+    return {
+        "tickers": len(tickers),
+        "csv_p50_ms": round(float(np.percentile(csv_timings, 50)), 3),
+        "csv_p99_ms": round(float(np.percentile(csv_timings, 99)), 3),
+        "packed_p50_ms": round(float(np.percentile(packed_timings, 50)), 3),
+        "packed_p99_ms": round(float(np.percentile(packed_timings, 99)), 3),
+        "csv_tickers_per_second": round(len(tickers) / csv_timings.sum() * 1000),
+        "packed_tickers_per_second": round(len(tickers) / packed_timings.sum() * 1000),
+    }
+
+def bench_pack(raw_dir: str = 'data/raw') -> dict:
+    """Biaya sekali jalan pack_universe ( CSV -> column .npy ) ke folder sementara."""
+    out_dir = tempfile.mkdtemp(prefix='bench_pack_')
+    try:
+        started = time.perf_counter()
+        index = pack_universe(raw_dir, out_dir)
+        elapsed = time.perf_counter() - started
+        rows = sum(length for _, length in index.values())
+        return {"tickers": len(index), "rows": rows, "seconds": round(elapsed, 4), "rows_per_second": round(rows / elapsed)}
+    finally:
+        shutil.rmtree(out_dir, ignore_errors=True)
+
+def bench_screen(packed_dir: str = 'data/packed', repeat: int = 10) -> dict:
+    """Build panel tanggal x ticker dari data packed lalu screening seluruh emiten."""
+    out_dir = tempfile.mkdtemp(prefix='bench_panel_')
+    try:
+        started = time.perf_counter()
+        panel = build_panel(packed_dir, out_dir)
+        build_elapsed = time.perf_counter() - started
+        started = time.perf_counter()
+        for _ in range(repeat):
+            result = screen(panel)
+        elapsed = (time.perf_counter() - started) / repeat
+        return {
+            "dates": len(panel.dates),
+            "tickers": len(panel.tickers),
+            "screened": len(result),
+            "build_seconds": round(build_elapsed, 4),
+            "screen_ms": round(elapsed * 1000, 3),
+            "screens_per_second": round(1 / elapsed, 1),
+        }
+    finally:
+        shutil.rmtree(out_dir, ignore_errors=True)
+
+BENCHMARKS = {
+    "full_load": bench_full_load,
+    "ticker_load": bench_ticker_load,
+    "pack": bench_pack,
+    "screen": bench_screen,
+}
+
+def run_suite(names: list = None, out_dir: str = RESULT_DIR) -> dict:
+    """Menjalankan benchmark IDX ( default semua ) lewat run_benchmarks milik suite Crypto."""
+    return run_benchmarks(BENCHMARKS, names, out_dir, suite='idx')
+
+if __name__ == '__main__':
+    # python -m benchmark.load_universe [full_load ticker_load pack screen], data/packed dari pack_universe
+    run_suite(sys.argv[1:] or None)
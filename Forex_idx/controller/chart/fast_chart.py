@@ -0,0 +1,209 @@
+from concurrent.futures import ProcessPoolExecutor
+from controller.storage.packed import PackedUniverse
+from controller.runner.parallel import read_kline_store
+import numpy as np
+import os
+
+OHLCV = ('open', 'high', 'low', 'close', 'volume')
+IDX_COLUMNS = {'open': 'OpenPrice', 'high': 'High', 'low': 'Low', 'close': 'Close', 'volume': 'Volume'}
+
+def packed_range(universe: PackedUniverse, ticker: str, start_date: int = None, end_date: int = None) -> dict:
+    """
+    OHLCV satu emiten untuk rentang tanggal saja, dicari dengan searchsorted di column Date
+    ( sudah urut per emiten ) lalu diiris dari memmap, tanpa membaca seluruh history.
+
+    Args:
+        universe (PackedUniverse): Hasil pack_universe
+        ticker (str): Kode emiten
+        start_date (int): Tanggal awal YYYYMMDD ( inclusive )
+        end_date (int): Tanggal akhir YYYYMMDD ( inclusive )
+
+    Returns:
+        dict: time (YYYYMMDD) dan open/high/low/close/volume
+    """
+    start, length = universe.index[ticker]
+    dates = universe.column('Date')[start:start + length]
+    first = np.searchsorted(dates, start_date, side='left') if start_date is not None else 0
+    last = np.searchsorted(dates, end_date, side='right') if end_date is not None else length
+    data = {"time": np.asarray(dates[first:last])}
+    for field, column in IDX_COLUMNS.items():
+        data[field] = np.asarray(universe.column(column)[start + first:start + last])
+    # OpenPrice / High / Low 0 berarti tidak ada transaksi, pakai harga close supaya candle tidak jatuh ke 0
+    for field in ('open', 'high', 'low'):
+        data[field] = np.where(data[field] > 0, data[field], data['close'])
+    return data
+
+def kline_range(dir: str, symbol: str, start_time: int = None, end_time: int = None) -> dict:
+    """
+    OHLCV crypto dari KlineStore ( ../Crypto/log/data/raw ), hanya partisi bulanan yang
+    beririsan dengan rentang waktu ( ms ) yang dibaca ( lihat read_kline_store ).
+    """
+    records = read_kline_store(dir, symbol, start_time, end_time)
+    return {"time": records['open_time'], **{field: records[field] for field in OHLCV}}
+
+def decimate_ohlc(data: dict, max_bars: int) -> dict:
+    """
+    Menurunkan jumlah bar sesuai zoom dengan tetap menjaga OHLC: setiap kelompok bar
+    berurutan digabung menjadi satu candle ( open pertama, high max, low min, close terakhir,
+    volume dijumlah ), sehingga spike high/low tidak hilang seperti pada sampling biasa.
+
+    Args:
+        data (dict): time + open/high/low/close/volume
+        max_bars (int): Jumlah bar maksimal yang ditampilkan
+
+    Returns:
+        dict: Format sama dengan input, panjang <= max_bars
+    """
+    size = len(data['close'])
+    if size <= max_bars:
+        return data
+    step = -(-size // max_bars)
+    starts = np.arange(0, size, step)
+    ends = np.minimum(starts + step, size) - 1
+    return {
+        "time": data['time'][starts],
+        "open": data['open'][starts],
+        "high": np.maximum.reduceat(data['high'], starts),
+        "low": np.minimum.reduceat(data['low'], starts),
+        "close": data['close'][ends],
+        "volume": np.add.reduceat(data['volume'], starts),
+    }
+
+def bars_for_width(width_px: int, px_per_bar: float = 3.0) -> int:
+    """Jumlah bar yang masih terbaca untuk lebar chart tertentu ( level zoom )."""
+    return max(int(width_px / px_per_bar), 1)
+
+def time_labels(times: np.ndarray, count: int = 8) -> tuple:
+    """Posisi dan label sumbu x: YYYYMMDD ( IDX ) atau timestamp ms ( crypto )."""
+    if not len(times):
+        return [], []
+    positions = np.linspace(0, len(times) - 1, min(count, len(times))).astype(int)
+    if times[0] > 10**11: # timestamp ms
+        labels = [str(np.datetime64(int(times[p]), 'ms').astype('datetime64[m]')).replace('T', ' ') for p in positions]
+    else:
+        labels = [f"{int(times[p]) // 10000}-{int(times[p]) // 100 % 100:02d}-{int(times[p]) % 100:02d}" for p in positions]
+    return positions, labels
+
+class ChartCanvas:
+    """
+    Figure matplotlib ( Agg ) yang dibuat sekali lalu dipakai ulang untuk banyak chart.
+
+    Wick, body dan volume masing-masing satu LineCollection untuk semua bar ( bukan satu
+    artist per candle seperti mplfinance ). Setiap chart hanya mengganti segment, warna,
+    batas sumbu dan label, tanpa membuat ulang axes atau menghitung tight_layout.
+    """
+    def __init__(self, width: int = 1200, height: int = 600, dpi: int = 100):
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        from matplotlib.collections import LineCollection
+
+        self.width, self.dpi = width, dpi
+        self.figure, (self.price_ax, self.volume_ax) = plt.subplots(
+            2, 1, figsize=(width / dpi, height / dpi), dpi=dpi, sharex=True, gridspec_kw={'height_ratios': [3, 1]}
+        )
+        self.figure.subplots_adjust(left=0.07, right=0.98, top=0.94, bottom=0.14, hspace=0.05)
+        self.wicks = self.price_ax.add_collection(LineCollection([], linewidths=0.6))
+        self.bodies = self.price_ax.add_collection(LineCollection([]))
+        self.volumes = self.volume_ax.add_collection(LineCollection([]))
+        self.title = self.price_ax.set_title('')
+        self.price_ax.grid(alpha=0.2)
+
+    @staticmethod
+    def _segments(x: np.ndarray, bottom: np.ndarray, top: np.ndarray) -> np.ndarray:
+        segments = np.empty((len(x), 2, 2))
+        segments[:, 0, 0] = segments[:, 1, 0] = x
+        segments[:, 0, 1] = bottom
+        segments[:, 1, 1] = top
+        return segments
+
+    def draw(self, data: dict, path: str, title: str = ''):
+        count = len(data['close'])
+        x = np.arange(count, dtype=np.float64)
+        colors = np.where(data['close'] >= data['open'], 'green', 'red')
+        body_width = max(self.width * 0.9 / max(count, 1) * 72 / self.dpi * 0.6, 0.5)
+
+        self.wicks.set_segments(self._segments(x, data['low'], data['high']))
+        self.bodies.set_segments(self._segments(x, np.minimum(data['open'], data['close']), np.maximum(data['open'], data['close'])))
+        self.volumes.set_segments(self._segments(x, np.zeros(count), data['volume']))
+        for collection in (self.wicks, self.bodies, self.volumes):
+            collection.set_color(colors)
+        self.bodies.set_linewidth(body_width)
+        self.volumes.set_linewidth(body_width)
+
+        if count:
+            low, high = float(np.min(data['low'])), float(np.max(data['high']))
+            padding = (high - low) * 0.03 or abs(high) * 0.01 or 1.0
+            self.price_ax.set_xlim(-1, count)
+            self.price_ax.set_ylim(low - padding, high + padding)
+            self.volume_ax.set_ylim(0, float(np.max(data['volume'])) * 1.05 or 1.0)
+        positions, labels = time_labels(data['time'])
+        self.volume_ax.set_xticks(positions)
+        self.volume_ax.set_xticklabels(labels, rotation=30, ha='right', fontsize=8)
+        self.title.set_text(title)
+        self.figure.savefig(path, pil_kwargs={'compress_level': 1}) # kompresi ringan, encode PNG jauh lebih cepat
+
+_canvases = {}
+
+def render_png(data: dict, path: str, title: str = '', width: int = 1200, height: int = 600, dpi: int = 100):
+    """Menggambar candle + volume ke PNG, canvas dipakai ulang per ukuran di setiap process."""
+    key = (width, height, dpi)
+    if key not in _canvases:
+        _canvases[key] = ChartCanvas(width, height, dpi)
+    _canvases[key].draw(data, path, title)
+
+_worker = {}
+
+def _init_worker(source: str, dir: str):
+    _worker.update(source=source, dir=dir, universe=PackedUniverse(dir) if source == 'idx' else None)
+
+def _render_chunk(tickers: list, out_dir: str, start: int, end: int, width: int, height: int) -> list:
+    paths = []
+    for ticker in tickers:
+        if _worker['source'] == 'idx':
+            data = packed_range(_worker['universe'], ticker, start, end)
+        else:
+            data = kline_range(_worker['dir'], ticker, start, end)
+        if not len(data['close']):
+            continue
+        path = os.path.join(out_dir, ticker + '.png')
+        render_png(decimate_ohlc(data, bars_for_width(width)), path, title=ticker, width=width, height=height)
+        paths.append(path)
+    return paths
+
+def render_universe(source: str = 'idx', dir: str = 'data/packed', out_dir: str = 'data/chart', tickers: list = None, start: int = None, end: int = None, width: int = 1200, height: int = 600, processes: int = None) -> list:
+    """
+    Render PNG untuk banyak ticker sekaligus di process pool.
+
+    Args:
+        source (str): 'idx' ( hasil pack_universe ) atau 'kline' ( KlineStore crypto )
+        dir (str): Folder packed / KlineStore
+        out_dir (str): Folder PNG
+        tickers (list): Default semua ticker di source
+        start (int): Awal rentang, YYYYMMDD untuk idx atau ms untuk kline
+        end (int): Akhir rentang
+        width (int): Lebar PNG ( px ), juga menentukan jumlah bar setelah decimation
+        height (int): Tinggi PNG ( px )
+        processes (int): Jumlah process, default jumlah core
+
+    Returns:
+        list: Path PNG yang dibuat
+    """
+    if tickers is None:
+        if source == 'idx':
+            tickers = PackedUniverse(dir).tickers
+        else:
+            tickers = sorted(name for name in os.listdir(dir) if os.path.exists(os.path.join(dir, name, '_index.json')))
+    os.makedirs(out_dir, exist_ok=True)
+    processes = processes or os.cpu_count() or 1
+    chunk = max(1, len(tickers) // (processes * 4))
+    chunks = [tickers[position:position + chunk] for position in range(0, len(tickers), chunk)]
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=(source, dir)) as pool:
+        results = pool.map(_render_chunk, chunks, *[[value] * len(chunks) for value in (out_dir, start, end, width, height)])
+        return [path for paths in results for path in paths]
+
+if __name__ == '__main__':
+    import time
+    started = time.perf_counter()
+    paths = render_universe(source='idx', dir='data/packed', out_dir='data/chart', start=20240101)
+    print(f"[✅] {len(paths)} chart dalam {time.perf_counter() - started:.1f} detik")
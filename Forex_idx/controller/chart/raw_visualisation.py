@@ -1,15 +1,23 @@
+from controller.chart.fast_chart import packed_range, decimate_ohlc
+from controller.storage.packed import PackedUniverse
 import mplfinance as mpf
 import pandas as pd
-import os
 
-def mapping_chart(dir: str, emiten: str, start_date: str):
-    path_file = os.path.join(dir, emiten + '.csv')
-    df = pd.read_csv(path_file)
-    df['Date'] = pd.to_datetime(df['Date'], format='%Y%m%d', errors='coerce')
-    df = df[df['Date'] >= pd.to_datetime(start_date)]
-    df.style.format({'Date': lambda t: t.strftime('%Y-%m-%d')})
-    df['Open'] = df['OpenPrice']
-    map = df[['Date','Open','High','Low','Close','Volume']]
+def mapping_chart(dir: str, emiten: str, start_date: str, end_date: str = None, max_bars: int = 600):
+    """
+    Menampilkan candle satu emiten dari data packed. Hanya rentang tanggal yang diminta
+    yang dibaca, lalu di-decimate ke max_bars supaya history panjang tetap cepat digambar.
+    """
+    universe = PackedUniverse(dir)
+    data = decimate_ohlc(packed_range(universe, emiten, int(start_date), int(end_date) if end_date else None), max_bars)
+    map = pd.DataFrame({
+        'Date': pd.to_datetime(data['time'].astype(str), format='%Y%m%d'),
+        'Open': data['open'],
+        'High': data['high'],
+        'Low': data['low'],
+        'Close': data['close'],
+        'Volume': data['volume'],
+    })
     map.set_index('Date', inplace=True)
     style = mpf.make_mpf_style(
         marketcolors=mpf.make_marketcolors(up='green',
@@ -21,4 +29,4 @@ def mapping_chart(dir: str, emiten: str, start_date: str):
     mpf.plot(map, type='candle', style=style)
 
 if __name__ == '__main__':
-    mapping_chart(dir='data/raw', emiten='ANTM', start_date='20250101')
\ No newline at end of file
+    mapping_chart(dir='data/packed', emiten='ANTM', start_date='20250101')
@@ -0,0 +1,147 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from controller.storage.packed import PackedUniverse
+import numpy as np
+import pandas as pd
+import os
+
+def idx_source(packed_dir: str = 'data/packed', columns: list = None) -> tuple:
+    """Column dan index dari hasil pack_universe ( Forex_idx/data/raw )."""
+    universe = PackedUniverse(packed_dir)
+    names = columns or universe.columns
+    return {name: universe.column(name) for name in names}, {ticker: tuple(span) for ticker, span in universe.index.items()}
+
+def csv_source(dir: str, columns: list) -> tuple:
+    """Column dan index dari folder CSV per ticker ( contoh CSV klines crypto lama )."""
+    frames = {
+        os.path.splitext(file)[0]: pd.read_csv(os.path.join(dir, file), usecols=columns)
+        for file in sorted(os.listdir(dir)) if file.endswith('.csv')
+    }
+    return _concat(frames, columns)
+
+def read_kline_store(dir: str, symbol: str, start_time: int = None, end_time: int = None, partition: str = 'month') -> np.ndarray:
+    """
+    Membaca klines satu symbol dari KlineStore crypto lewat KlineStore.read milik Crypto
+    ( hanya row committed, partisi dirty urut tanpa duplikat ). Index dibaca ulang setiap
+    panggilan supaya data yang baru ditulis process collector ikut terbaca.
+
+    Returns:
+        np.ndarray: KLINE_DTYPE urut open_time
+    """
+    from controller.storage.crypto_store import KlineStore # Crypto hanya di-load jika store klines dipakai
+    return KlineStore(dir, partition).read(symbol, start_time, end_time)
+
+def kline_store_source(dir: str = '../Crypto/log/data/raw', columns: list = None, partition: str = 'month') -> tuple:
+    """Column dan index dari KlineStore crypto ( partisi biner per symbol )."""
+    from controller.storage.crypto_store import KlineStore, KLINE_DTYPE
+    columns = columns or list(KLINE_DTYPE.names)
+    store = KlineStore(dir, partition)
+    frames = {}
+    for symbol in store.symbols():
+        records = store.read(symbol)
+        frames[symbol] = {name: records[name] for name in columns}
+    return _concat(frames, columns)
+
+def _concat(frames: dict, columns: list) -> tuple:
+    index, offset = {}, 0
+    for ticker, frame in frames.items():
+        length = len(frame[columns[0]])
+        index[ticker] = (offset, length)
+        offset += length
+    data = {
+        name: np.concatenate([np.asarray(frame[name]) for frame in frames.values()]) if frames else np.empty(0)
+        for name in columns
+    }
+    return data, index
+
+class SharedColumns:
+    """
+    Semua column universe dalam satu blok SharedMemory. Worker hanya menerima `spec`
+    ( nama blok + layout ) lalu membuat view NumPy, tanpa pickling DataFrame.
+    """
+    def __init__(self, columns: dict):
+        layout, size = [], 0
+        for name, array in columns.items():
+            array = np.ascontiguousarray(array)
+            size = -(-size // 8) * 8 # align 8 byte
+            layout.append((name, array.dtype.str, size, len(array)))
+            size += array.nbytes
+        self.shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        for (name, dtype, offset, length), array in zip(layout, columns.values()):
+            np.ndarray(length, dtype=dtype, buffer=self.shm.buf, offset=offset)[:] = array
+        self.spec = {"name": self.shm.name, "layout": layout}
+
+    @staticmethod
+    def attach(spec: dict) -> tuple:
+        shm = shared_memory.SharedMemory(name=spec['name'])
+        views = {
+            name: np.ndarray(length, dtype=dtype, buffer=shm.buf, offset=offset)
+            for name, dtype, offset, length in spec['layout']
+        }
+        return shm, views
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+_worker = {}
+
+def _init_worker(spec: dict, index: dict, func):
+    shm, views = SharedColumns.attach(spec)
+    _worker.update(shm=shm, views=views, index=index, func=func)
+
+def _run_chunk(tickers: list) -> list:
+    views, index, func = _worker['views'], _worker['index'], _worker['func']
+    rows = []
+    for ticker in tickers:
+        start, length = index[ticker]
+        data = {name: view[start:start + length] for name, view in views.items()}
+        rows.append({"ticker": ticker, **func(ticker, data)})
+    return rows
+
+def run_universe(func, source: tuple, tickers: list = None, processes: int = None) -> pd.DataFrame:
+    """
+    Menjalankan `func(ticker, data)` untuk setiap ticker di process pool.
+
+    Args:
+        func (callable): Fungsi level modul ( bisa di-pickle ) yang menerima ticker dan
+            dict column -> view NumPy, lalu mengembalikan dict hasil skalar
+        source (tuple): (columns, index) dari idx_source / csv_source / kline_store_source
+        tickers (list): Subset ticker, default semua
+        processes (int): Jumlah process, default jumlah core
+
+    Returns:
+        pd.DataFrame: Satu baris per ticker
+    """
+    columns, index = source
+    tickers = tickers or list(index)
+    processes = processes or os.cpu_count() or 1
+    chunk = max(1, len(tickers) // (processes * 4))
+    chunks = [tickers[start:start + chunk] for start in range(0, len(tickers), chunk)]
+
+    shared = SharedColumns(columns)
+    try:
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=(shared.spec, index, func)) as pool:
+            rows = [row for result in pool.map(_run_chunk, chunks) for row in result]
+    finally:
+        shared.close()
+    return pd.DataFrame(rows).set_index('ticker') if rows else pd.DataFrame()
+
+def ticker_stats(ticker: str, data: dict) -> dict:
+    """Contoh job: statistik dasar harga dan likuiditas per ticker."""
+    close = data['Close']
+    valid = close > 0
+    returns = np.diff(np.log(close[valid])) if valid.sum() > 1 else np.empty(0)
+    return {
+        "rows": len(close),
+        "first_date": int(data['Date'][0]) if len(close) else 0,
+        "last_date": int(data['Date'][-1]) if len(close) else 0,
+        "zero_volume_days": int((data['Volume'] == 0).sum()),
+        "mean_return": float(returns.mean()) if len(returns) else 0.0,
+        "volatility": float(returns.std()) if len(returns) else 0.0,
+        "avg_value": float(data['Value'].mean()) if len(close) else 0.0,
+    }
+
+if __name__ == '__main__':
+    result = run_universe(ticker_stats, idx_source('data/packed', ['Date', 'Close', 'Volume', 'Value']))
+    print(result.sort_values('avg_value', ascending=False).head(20))
@@ -0,0 +1,228 @@
+from controller.storage.packed import PackedUniverse, PACKED_COLUMNS
+import numpy as np
+import pandas as pd
+import warnings
+import json
+import os
+
+PANEL_FIELDS = [name for name in PACKED_COLUMNS if name != 'Date']
+META_FILE = 'meta.json'
+RANKED = ('foreign_net_ratio', 'avg_value', 'momentum_20', 'bid_offer_imbalance')
+
+def _field_path(dir: str, field: str, width: int) -> str:
+    # lebar ( jumlah ticker ) ikut di nama file, file lebar lama tetap utuh sampai meta baru tersimpan
+    return os.path.join(dir, f"{field}.{width}.f64")
+
+def _save_meta(dir: str, dates: np.ndarray, tickers: list):
+    path = os.path.join(dir, META_FILE)
+    with open(path + '.tmp', 'w') as file:
+        json.dump({"dates": [int(date) for date in dates], "tickers": list(tickers), "fields": PANEL_FIELDS}, file)
+    os.replace(path + '.tmp', path)
+
+def build_panel(packed_dir: str = 'data/packed', out_dir: str = 'data/panel') -> 'Panel':
+    """
+    Mengubah hasil pack_universe menjadi panel tanggal x ticker per field dalam satu pass:
+    baris = posisi tanggal ( searchsorted ), kolom = posisi ticker, lalu satu scatter per
+    field. Sel tanpa data ( belum listing / suspensi ) berisi NaN.
+
+    Args:
+        packed_dir (str): Folder hasil pack_universe
+        out_dir (str): Folder panel
+
+    Returns:
+        Panel: Panel yang baru dibuat
+    """
+    universe = PackedUniverse(packed_dir)
+    tickers = universe.tickers
+    date_column = np.asarray(universe.column('Date'))
+    dates = np.unique(date_column)
+    owner = np.empty(universe.rows, dtype=np.int64)
+    for position, ticker in enumerate(tickers):
+        start, length = universe.index[ticker]
+        owner[start:start + length] = position
+    rows = np.searchsorted(dates, date_column)
+
+    os.makedirs(out_dir, exist_ok=True)
+    for field in PANEL_FIELDS:
+        panel = np.full((len(dates), len(tickers)), np.nan)
+        panel[rows, owner] = universe.column(field)
+        path = _field_path(out_dir, field, len(tickers))
+        panel.tofile(path + '.tmp')
+        os.replace(path + '.tmp', path)
+    _save_meta(out_dir, dates, tickers)
+    return Panel(out_dir)
+
+def forward_fill(values: np.ndarray) -> np.ndarray:
+    """Isi NaN dengan nilai valid terakhir di atasnya ( per kolom ), tanpa loop Python."""
+    valid = ~np.isnan(values)
+    rows = np.where(valid, np.arange(len(values))[:, None], 0)
+    np.maximum.accumulate(rows, axis=0, out=rows)
+    filled = values[rows, np.arange(values.shape[1])]
+    filled[~np.maximum.accumulate(valid, axis=0)] = np.nan # sebelum data pertama tetap NaN
+    return filled
+
+class Panel:
+    """
+    Panel tanggal x ticker untuk semua field IDX. Setiap field satu file float64 row-major
+    ( satu baris = satu tanggal ), sehingga update harian cukup append satu baris per file.
+
+    Meta ( tanggal dan ticker ) ditulis atomic setelah data; byte di belakang jumlah tanggal
+    di meta adalah append yang terputus dan dipotong saat panel dibuka.
+
+    Args:
+        dir (str): Folder hasil build_panel
+    """
+    def __init__(self, dir: str = 'data/panel'):
+        self.dir = dir
+        with open(os.path.join(dir, META_FILE)) as file:
+            meta = json.load(file)
+        self.dates = np.asarray(meta['dates'], dtype=np.int64)
+        self.tickers = meta['tickers']
+        self.positions = {ticker: position for position, ticker in enumerate(self.tickers)}
+        self.arrays = {}
+        for field in PANEL_FIELDS:
+            path = _field_path(dir, field, len(self.tickers))
+            size = len(self.dates) * len(self.tickers) * 8
+            if os.path.getsize(path) > size:
+                os.truncate(path, size)
+
+    def field(self, name: str) -> np.ndarray:
+        """Panel satu field ( memmap read-only ), shape (tanggal, ticker)."""
+        if name not in self.arrays:
+            self.arrays[name] = np.memmap(
+                _field_path(self.dir, name, len(self.tickers)), dtype=np.float64, mode='r', shape=(len(self.dates), len(self.tickers))
+            )
+        return self.arrays[name]
+
+    def row(self, date: int = None) -> int:
+        """Posisi baris tanggal terakhir <= date ( default tanggal terakhir )."""
+        if date is None:
+            return len(self.dates) - 1
+        position = int(np.searchsorted(self.dates, int(date), side='right')) - 1
+        if position < 0:
+            raise ValueError(f"Tidak ada data pada atau sebelum {date}")
+        return position
+
+    def _add_tickers(self, tickers: list):
+        width = len(self.tickers) + len(tickers)
+        for field in PANEL_FIELDS:
+            panel = np.full((len(self.dates), width), np.nan)
+            panel[:, :len(self.tickers)] = self.field(field)
+            path = _field_path(self.dir, field, width)
+            panel.tofile(path + '.tmp')
+            os.replace(path + '.tmp', path)
+        previous = len(self.tickers)
+        self.tickers = self.tickers + list(tickers)
+        self.positions = {ticker: position for position, ticker in enumerate(self.tickers)}
+        _save_meta(self.dir, self.dates, self.tickers)
+        self.arrays = {}
+        for field in PANEL_FIELDS:
+            os.remove(_field_path(self.dir, field, previous))
+
+    def update(self, frame: pd.DataFrame) -> int:
+        """
+        Update harian dari data ringkasan saham ( format CSV data/raw: Date, StockCode dan
+        field lain ). Tanggal baru di-append, tanggal terakhir boleh ditimpa ( koreksi data ),
+        tanggal yang lebih lama dilewati. Emiten baru menambah kolom berisi NaN untuk history.
+
+        Args:
+            frame (pd.DataFrame): Satu atau beberapa hari, semua emiten
+
+        Returns:
+            int: Jumlah tanggal yang ditulis
+        """
+        written = 0
+        for date, day in frame.groupby('Date', sort=True):
+            date = int(date)
+            if len(self.dates) and date < self.dates[-1]:
+                continue
+            new = [ticker for ticker in pd.unique(day['StockCode']) if ticker not in self.positions]
+            if new:
+                self._add_tickers(new)
+            columns = np.array([self.positions[ticker] for ticker in day['StockCode']], dtype=np.int64)
+            replace = bool(len(self.dates)) and date == self.dates[-1]
+            for field in PANEL_FIELDS:
+                row = np.full(len(self.tickers), np.nan)
+                if field in day:
+                    row[columns] = day[field].to_numpy(dtype=np.float64)
+                with open(_field_path(self.dir, field, len(self.tickers)), 'r+b' if replace else 'ab') as file:
+                    if replace:
+                        file.seek((len(self.dates) - 1) * row.nbytes)
+                    file.write(row.tobytes())
+            if not replace:
+                self.dates = np.append(self.dates, date)
+            _save_meta(self.dir, self.dates, self.tickers)
+            self.arrays = {}
+            written += 1
+        return written
+
+def screen(panel: Panel, date: int = None, window: int = 20, momentum: tuple = (20, 60), min_value: float = 0.0) -> pd.DataFrame:
+    """
+    Screening seluruh emiten pada satu tanggal, semua metric dihitung sekaligus sebagai
+    operasi vektor di atas irisan panel ( tanpa loop per ticker ).
+
+    Metric:
+        foreign_net_value: sum (ForeignBuy - ForeignSell) x Close selama window ( Rupiah )
+        foreign_net_ratio: net foreign dibagi Volume selama window
+        avg_value / avg_frequency: rata-rata Value dan Frequency harian selama window
+        trading_days: hari dengan Volume > 0 selama window
+        momentum_N: return Close N hari bursa
+        bid_offer_imbalance: (BidVolume - OfferVolume) / (BidVolume + OfferVolume) pada tanggal tsb
+
+    Args:
+        panel (Panel): Panel hasil build_panel
+        date (int): Tanggal YYYYMMDD, default tanggal terakhir
+        window (int): Jumlah hari bursa untuk flow dan likuiditas
+        momentum (tuple): Periode momentum ( hari bursa )
+        min_value (float): Minimal rata-rata Value harian supaya ikut diranking
+
+    Returns:
+        pd.DataFrame: Satu baris per emiten, metric + rank percentile ( rank_* ) dan score,
+            urut score terbesar
+    """
+    end = panel.row(date) + 1
+    start = max(end - window, 0)
+    lookback = max(end - max(momentum) - 1, 0)
+
+    last_close = np.asarray(panel.field('Close')[end - 1]) # NaN jika emiten tidak ada di tanggal ini
+    close = panel.field('Close')[lookback:end]
+    close = forward_fill(np.where(close > 0, close, np.nan))
+    recent = close[start - lookback:]
+    volume = np.asarray(panel.field('Volume')[start:end])
+    net = np.asarray(panel.field('ForeignBuy')[start:end]) - np.asarray(panel.field('ForeignSell')[start:end])
+    bid, offer = panel.field('BidVolume')[end - 1], panel.field('OfferVolume')[end - 1]
+    flow = net * recent
+    no_foreign = np.isnan(net).all(axis=0) # nansum kolom kosong = 0, emiten tanpa data asing harus NaN
+
+    with np.errstate(divide='ignore', invalid='ignore'), warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning) # nanmean kolom yang kosong semua -> NaN
+        metrics = {
+            "close": last_close,
+            "foreign_net_value": np.where(np.isnan(flow).all(axis=0), np.nan, np.nansum(flow, axis=0)),
+            "foreign_net_ratio": np.where(no_foreign, np.nan, np.nansum(net, axis=0) / np.nansum(volume, axis=0)),
+            "avg_value": np.nanmean(panel.field('Value')[start:end], axis=0),
+            "avg_frequency": np.nanmean(panel.field('Frequency')[start:end], axis=0),
+            "trading_days": (volume > 0).sum(axis=0),
+            **{f"momentum_{days}": close[-1] / close[-1 - days] - 1 if len(close) > days else np.full(close.shape[1], np.nan) for days in momentum},
+            "bid_offer_imbalance": (bid - offer) / (bid + offer),
+        }
+    result = pd.DataFrame(metrics, index=pd.Index(panel.tickers, name='ticker'))
+    result = result[result['close'].notna() & (result['avg_value'] >= min_value)]
+    ranked = [name for name in RANKED if name in result]
+    ranks = result[ranked].rank(pct=True)
+    result[[f"rank_{name}" for name in ranked]] = ranks.to_numpy()
+    result['score'] = ranks.mean(axis=1)
+    return result.sort_values('score', ascending=False)
+
+if __name__ == '__main__':
+    # python -m controller.screening.cross_section [ringkasan_harian.csv]
+    import sys
+    import time
+    started = time.perf_counter()
+    panel = Panel('data/panel') if os.path.exists(os.path.join('data/panel', META_FILE)) else build_panel('data/packed', 'data/panel')
+    if len(sys.argv) > 1:
+        print(f"[✅] {panel.update(pd.read_csv(sys.argv[1], dtype={'StockCode': str}))} tanggal ditambahkan")
+    loaded = time.perf_counter()
+    result = screen(panel, min_value=1e9)
+    print(result.head(20))
+    print(f"[✅] {len(result)} emiten, panel {loaded - started:.3f} detik, screening {time.perf_counter() - loaded:.3f} detik")
@@ -0,0 +1,29 @@
+import importlib.util
+import sys
+import os
+
+# Modul Crypto dipakai langsung ( bukan salinan ) supaya aturan committed / dirty, dtype dan
+# format partisi KlineStore selalu sama. Dimuat dari path file karena kedua project sama-sama
+# punya package controller / benchmark dan tidak bisa ditaruh bersama di sys.path.
+CRYPTO_ROOT = os.environ.get('CRYPTO_ROOT', os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', 'Crypto'))
+
+def load_crypto_module(name: str, path: str):
+    """
+    Memuat satu file modul Crypto ( tanpa dependency ke package Crypto lain ) dengan nama
+    modul sendiri, sekali per process.
+
+    Args:
+        name (str): Nama modul di sys.modules, contoh 'crypto_kline_store'
+        path (str): Path file relatif terhadap CRYPTO_ROOT, contoh 'helper/kline_store.py'
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, os.path.join(CRYPTO_ROOT, path))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+_kline_store = load_crypto_module('crypto_kline_store', 'helper/kline_store.py')
+KlineStore = _kline_store.KlineStore
+KLINE_DTYPE = _kline_store.KLINE_DTYPE
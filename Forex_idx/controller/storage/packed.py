@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+import json
+import os
+
+PACKED_COLUMNS = {
+    'Date': np.int64,
+    'Previous': np.float64,
+    'OpenPrice': np.float64,
+    'High': np.float64,
+    'Low': np.float64,
+    'Close': np.float64,
+    'Volume': np.float64,
+    'Change': np.float64,
+    'Value': np.float64,
+    'Frequency': np.float64,
+    'Offer': np.float64,
+    'OfferVolume': np.float64,
+    'Bid': np.float64,
+    'BidVolume': np.float64,
+    'ForeignSell': np.float64,
+    'ForeignBuy': np.float64,
+}
+INDEX_FILE = 'index.json'
+
+def pack_universe(raw_dir: str = 'data/raw', out_dir: str = 'data/packed') -> dict:
+    """
+    Mengubah semua CSV emiten menjadi satu file .npy per column ( column-major ).
+
+    Data semua emiten disambung berurutan, posisi tiap emiten dicatat di index.json
+    sebagai [offset, length] sehingga bisa dibuka sebagai slice memmap tanpa parsing.
+
+    Args:
+        raw_dir (str): Folder CSV per emiten
+        out_dir (str): Folder tujuan hasil pack
+
+    Returns:
+        dict: Index emiten -> [offset, length]
+    """
+    frames = {}
+    for file in sorted(os.listdir(raw_dir)):
+        if not file.endswith('.csv'):
+            continue
+        df = pd.read_csv(os.path.join(raw_dir, file), usecols=list(PACKED_COLUMNS))
+        frames[os.path.splitext(file)[0]] = df.sort_values('Date')
+
+    os.makedirs(out_dir, exist_ok=True)
+    index, offset = {}, 0
+    for ticker, df in frames.items():
+        index[ticker] = [offset, len(df)]
+        offset += len(df)
+
+    for column, dtype in PACKED_COLUMNS.items():
+        path = os.path.join(out_dir, column + '.npy')
+        array = np.lib.format.open_memmap(path + '.tmp', mode='w+', dtype=dtype, shape=(offset,))
+        for ticker, df in frames.items():
+            start, length = index[ticker]
+            array[start:start + length] = df[column].to_numpy(dtype=dtype)
+        array.flush()
+        del array
+        os.replace(path + '.tmp', path)
+
+    path = os.path.join(out_dir, INDEX_FILE)
+    with open(path + '.tmp', 'w') as file:
+        json.dump({"rows": offset, "columns": list(PACKED_COLUMNS), "tickers": index}, file)
+    os.replace(path + '.tmp', path) # loader tidak pernah membaca index setengah tertulis
+    return index
+
+class PackedUniverse:
+    """
+    Loader hasil pack_universe. Semua column dibuka dengan mmap_mode='r', sehingga
+    beberapa proses worker memakai page memory yang sama dari OS.
+
+    Args:
+        dir (str): Folder hasil pack_universe
+    """
+    def __init__(self, dir: str = 'data/packed'):
+        self.dir = dir
+        with open(os.path.join(dir, INDEX_FILE)) as file:
+            meta = json.load(file)
+        self.rows = meta['rows']
+        self.columns = meta['columns']
+        self.index = meta['tickers']
+        self.arrays = {}
+
+    @property
+    def tickers(self) -> list:
+        return list(self.index)
+
+    def column(self, name: str) -> np.ndarray:
+        """Column untuk seluruh universe ( cross-section ), berupa memmap read-only."""
+        if name not in self.arrays:
+            self.arrays[name] = np.load(os.path.join(self.dir, name + '.npy'), mmap_mode='r')
+        return self.arrays[name]
+
+    def ticker(self, ticker: str, columns: list = None) -> dict:
+        """
+        Data satu emiten sebagai view memmap ( zero-copy ).
+
+        Args:
+            ticker (str): Kode emiten, contoh 'ANTM'
+            columns (list): Column yang dibutuhkan, default semua column
+
+        Returns:
+            dict: Nama column -> np.ndarray
+        """
+        start, length = self.index[ticker]
+        return {name: self.column(name)[start:start + length] for name in (columns or self.columns)}
+
+    def frame(self, ticker: str, columns: list = None) -> pd.DataFrame:
+        return pd.DataFrame(self.ticker(ticker, columns))
+
+if __name__ == '__main__':
+    index = pack_universe(raw_dir='data/raw', out_dir='data/packed')
+    print(f"[✅] {len(index)} emiten berhasil di-pack")
@@ -0,0 +1,5 @@
+import sys
+import os
+
+# modul diimport dari root Forex_idx ( controller.* ), sama seperti saat dijalankan langsung
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,53 @@
+from controller.storage.crypto_store import KlineStore, KLINE_DTYPE
+from controller.runner.parallel import read_kline_store, kline_store_source
+from controller.chart.fast_chart import kline_range
+import numpy as np
+import os
+
+MINUTE = 60_000
+FEB_2024 = 1706745600000 # 2024-02-01 00:00 UTC
+
+def make_records(start: int, count: int) -> np.ndarray:
+    records = np.zeros(count, dtype=KLINE_DTYPE)
+    records['open_time'] = start + np.arange(count, dtype=np.int64) * MINUTE
+    records['close_time'] = records['open_time'] + MINUTE - 1
+    records['close'] = np.arange(count, dtype=np.float64)
+    records['open'] = records['close']
+    records['high'] = records['close'] + 1
+    records['low'] = records['close'] - 1
+    return records
+
+def write_store(root: str) -> np.ndarray:
+    """Store dengan partisi dirty ( late append ) dan tail yang belum committed."""
+    records = make_records(FEB_2024 - 10 * MINUTE, 40) # melewati batas bulan
+    store = KlineStore(root)
+    store.append('X', records[15:30])
+    store.append('X', records[:20]) # partisi 2024-01 dan 2024-02 dirty
+    store.append('Y', records[:5])
+    with open(os.path.join(root, 'X', '2024-02.bin'), 'ab') as file: # writer lain yang indexnya belum tersimpan
+        file.write(records[30:].tobytes())
+    return records
+
+def test_read_kline_store_matches_kline_store(tmp_path):
+    root = str(tmp_path)
+    write_store(root)
+    expected = KlineStore(root)
+    for start, end in [(None, None), (FEB_2024 - 3 * MINUTE, FEB_2024 + 5 * MINUTE), (FEB_2024, None), (None, FEB_2024 - 1)]:
+        assert np.array_equal(read_kline_store(root, 'X', start, end), expected.read('X', start, end))
+    assert len(read_kline_store(root, 'X')) == 30 # tail uncommitted tidak ikut terbaca
+
+    data = kline_range(root, 'X', FEB_2024 - 3 * MINUTE, FEB_2024 + 5 * MINUTE)
+    records = expected.read('X', FEB_2024 - 3 * MINUTE, FEB_2024 + 5 * MINUTE)
+    assert np.array_equal(data['time'], records['open_time'])
+    assert np.array_equal(data['close'], records['close'])
+
+def test_kline_store_source_matches_kline_store(tmp_path):
+    root = str(tmp_path)
+    write_store(root)
+    expected = KlineStore(root)
+    data, index = kline_store_source(root, columns=['open_time', 'close'])
+    assert list(index) == ['X', 'Y']
+    for symbol, (start, length) in index.items():
+        records = expected.read(symbol)
+        assert np.array_equal(data['open_time'][start:start + length], records['open_time'])
+        assert np.array_equal(data['close'][start:start + length], records['close'])